@@ -1,38 +1,40 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from pydantic import ValidationError
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.auth_context import get_auth_context, decode_token
 from app.core.config import settings
 from app.models.user import User
 from app.crud import crud_user
 from app.db.mongodb import get_database
+from app.core.principal_cache import principal_cache
+from app.db.user_loader import UserLoader
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login/access-token")
 
 async def get_current_user(
+    request: Request,
     db: AsyncIOMotorDatabase = Depends(get_database),
     token: str = Depends(oauth2_scheme)
 ) -> User:
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-            )
-    except (JWTError, ValidationError):
+    # Token was already decoded by AuthContextMiddleware
+    auth = get_auth_context(request.scope)
+    if auth.token != token:
+        auth = decode_token(token)
+    email = auth.subject
+    if not auth.valid or email is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+    cached = principal_cache.get(email)
+    if cached is not None:
+        return cached
     user = await crud_user.get_user_by_email(db, email=email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return User(**user.model_dump())
+    current_user = User(**user.model_dump())
+    principal_cache.set(email, current_user)
+    return current_user
 
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
@@ -52,3 +54,8 @@ class RoleChecker:
                 detail="Not enough privileges"
             )
         return user
+
+async def get_user_loader(db: AsyncIOMotorDatabase = Depends(get_database)) -> UserLoader:
+    # FastAPI caches dependencies per request, so every use within a request shares one loader.
+    # async so it runs on the event loop rather than taking a threadpool hop like a plain def.
+    return UserLoader(db)
@@ -0,0 +1,73 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.db import versions
+from app.db.mongodb import get_database
+
+
+@dataclass(frozen=True)
+class Validator:
+    etag: str
+    headers: dict
+    not_modified: bool
+
+    def not_modified_error(self) -> HTTPException:
+        return HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
+
+
+class ConditionalGet:
+    """
+    Strong ETag + Cache-Control for public reads, derived from the version stamp
+    of `collection` (app.db.versions) and the request's path and query. When the
+    client's If-None-Match is current, answers 304 before the endpoint queries.
+
+    `path_param` switches to the stamp of a single document, keyed by that path
+    parameter (e.g. blog/{slug}). With `raise_not_modified=False` the endpoint
+    gets the Validator and decides, for work a 304 must still do.
+    """
+
+    def __init__(self, collection: str, path_param: Optional[str] = None, raise_not_modified: bool = True):
+        self.collection = collection
+        self.path_param = path_param
+        self.raise_not_modified = raise_not_modified
+
+    async def __call__(
+        self,
+        request: Request,
+        response: Response,
+        db: AsyncIOMotorDatabase = Depends(get_database),
+    ) -> Validator:
+        key = self.collection
+        if self.path_param:
+            key = versions.document_key(self.collection, request.path_params[self.path_param])
+        version = await versions.get(db, key)
+
+        query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+        digest = hashlib.blake2b(f"{request.url.path}?{query}".encode(), digest_size=8).hexdigest()
+        etag = f'"{self.collection}-{version}-{digest}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}, must-revalidate",
+        }
+        response.headers.update(headers)
+
+        validator = Validator(etag, headers, if_none_match(request.headers.get("if-none-match"), etag))
+        if validator.not_modified and self.raise_not_modified:
+            raise validator.not_modified_error()
+        return validator
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches `etag` (weak comparison, as RFC 9110 specifies for it).
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, Query
+
+
+@dataclass(frozen=True)
+class FieldSet:
+    """
+    Fields a client asked for. `projection` is None when the full document is wanted.
+    """
+    names: Optional[frozenset[str]]
+    projection: Optional[dict]
+
+    @property
+    def is_full(self) -> bool:
+        return self.projection is None
+
+    def __contains__(self, name: str) -> bool:
+        return self.names is None or name in self.names
+
+
+class FieldSelector:
+    """
+    `fields` query parameter for list endpoints, pushed down to Mongo as a projection.
+
+    fields=title,slug   only those fields (plus `required`)
+    fields=*            the full documents
+    (omitted)           the endpoint's lean `default` set
+
+    `computed` maps virtual fields to projection expressions evaluated by Mongo
+    (e.g. an array size), so they can replace shipping the underlying field.
+    """
+
+    def __init__(
+        self,
+        allowed: Iterable[str],
+        default: Iterable[str],
+        required: Iterable[str] = (),
+        computed: Optional[dict] = None,
+        aliases: Optional[dict] = None,
+    ):
+        self.computed = computed or {}
+        self.allowed = frozenset(allowed) | frozenset(self.computed)
+        self.default = frozenset(default)
+        self.required = frozenset(required)
+        self.aliases = aliases or {}
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return, or * for full documents"
+        ),
+    ) -> FieldSet:
+        if fields is not None and fields.strip() == "*":
+            return FieldSet(names=None, projection=None)
+
+        if fields is None:
+            names = self.default
+        else:
+            names = frozenset(f.strip() for f in fields.split(",") if f.strip())
+            unknown = names - self.allowed
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+                )
+
+        names = names | self.required
+        projection = {}
+        for name in names:
+            if name in self.computed:
+                projection[name] = self.computed[name]
+            else:
+                projection[self.aliases.get(name, name)] = 1
+        return FieldSet(names=names, projection=projection)
@@ -0,0 +1,33 @@
+import math
+from typing import Any, Optional
+
+from fastapi import Response
+
+# List endpoints that return a bare JSON array send their keyset cursor here
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def page_response(
+    items: list[Any],
+    total: Optional[int],
+    page: int,
+    size: int,
+    next_cursor: Optional[str] = None,
+) -> dict:
+    """
+    Envelope shared by paginated endpoints. `total` and `pages` are None when
+    the client opted out of totals (include_total=false).
+    """
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": (math.ceil(total / size) if total else 0) if total is not None else None,
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,33 @@
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class TypedResponse:
+    """
+    Fast response path for a route's response_model.
+
+    The TypeAdapter is built once at import. Trusted Mongo documents (or models
+    already built from them) are validated a single time and encoded straight to
+    JSON bytes by pydantic-core, and the Response is returned as-is, so FastAPI
+    neither re-validates against response_model nor re-serializes. Keep
+    response_model on the route for the OpenAPI schema.
+    """
+
+    def __init__(self, type_: Any, **dump_options):
+        self.adapter = TypeAdapter(type_)
+        self.dump_options = {"by_alias": True, **dump_options}
+
+    def __call__(self, content: Any, response: Optional[Response] = None) -> Response:
+        """
+        `response` is the route's injected Response: headers set on it (ETag,
+        X-Next-Cursor, ...) are carried over, as FastAPI does for returned values.
+        """
+        body = self.adapter.dump_json(self.adapter.validate_python(content), **self.dump_options)
+        rendered = Response(content=body, media_type="application/json")
+        if response is not None:
+            rendered.headers.raw.extend(
+                (key, value) for key, value in response.headers.raw if key != b"content-length"
+            )
+        return rendered
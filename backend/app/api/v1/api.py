@@ -17,6 +17,7 @@ from app.api.v1.endpoints import (
     projects,
     newsletter,
     team,
+    audit_logs,
 )
 
 api_router = APIRouter()
@@ -37,3 +38,4 @@ api_router.include_router(research_areas.router, prefix="/research-areas", tags=
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
 api_router.include_router(newsletter.router, prefix="/newsletter", tags=["newsletter"])
 api_router.include_router(team.router, prefix="/team", tags=["team"])
+api_router.include_router(audit_logs.router, prefix="/audit-logs", tags=["audit-logs"])
@@ -0,0 +1,63 @@
+from typing import Any, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.api import deps
+from app.api.deps import get_database
+from app.models.activity_log import ActivityLogFilter, ActivityLogPage
+from app.models.user import User, UserRole, ROLE_WEIGHTS
+from app.crud import crud_activity_log
+from app.db.pagination import InvalidCursor
+
+router = APIRouter()
+
+def get_filters(
+    user_email: Optional[str] = None,
+    impersonator_email: Optional[str] = None,
+    method: Optional[str] = None,
+    status_code: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> ActivityLogFilter:
+    return ActivityLogFilter(
+        user_email=user_email,
+        impersonator_email=impersonator_email,
+        method=method,
+        status_code=status_code,
+        since=since,
+        until=until,
+    )
+
+@router.get("/", response_model=ActivityLogPage)
+async def read_activity_logs(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    filters: ActivityLogFilter = Depends(get_filters),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: User = Depends(deps.RoleChecker(required_weight=ROLE_WEIGHTS[UserRole.ADMIN])),
+) -> Any:
+    """
+    Search audit entries, newest first. Admin only.
+    Pass `next_cursor` from the previous page as `cursor` to continue.
+    """
+    try:
+        items, next_cursor = await crud_activity_log.get_page(db, filters, cursor=cursor, limit=limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/export")
+async def export_activity_logs(
+    filters: ActivityLogFilter = Depends(get_filters),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: User = Depends(deps.RoleChecker(required_weight=ROLE_WEIGHTS[UserRole.ADMIN])),
+) -> Any:
+    """
+    Stream every matching audit entry as NDJSON. Admin only.
+    """
+    async def generate():
+        async for entry in crud_activity_log.iter_entries(db, filters):
+            yield entry.model_dump_json(by_alias=True) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
@@ -4,8 +4,7 @@ import random
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+import httpx
 
 from app.core import security
 from app.core.config import settings
@@ -15,6 +14,7 @@ from app.models.verification import VerificationCreate
 from app.db.mongodb import get_database
 from app.api import deps
 from app.utils.email import send_email
+from app.services.google_auth import google_verifier
 
 router = APIRouter()
 
@@ -131,12 +131,12 @@ async def login_google(
     db: AsyncIOMotorDatabase = Depends(get_database)
 ) -> Any:
     try:
-        id_info = id_token.verify_oauth2_token(
-            token, google_requests.Request(), settings.GOOGLE_CLIENT_ID
-        )
+        id_info = await google_verifier.verify(token)
         email = id_info['email']
-    except ValueError:
+    except (ValueError, KeyError):
         raise HTTPException(status_code=400, detail="Invalid Google Token")
+    except httpx.HTTPError:
+        raise HTTPException(status_code=503, detail="Could not reach Google to verify token")
 
     user = await crud_user.get_user_by_email(db, email=email)
     if not user:
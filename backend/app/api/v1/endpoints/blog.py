@@ -1,65 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from bson import ObjectId
 
 from app.api import deps
+from app.api.fields import FieldSelector, FieldSet
 from app.db.mongodb import get_database
-from app.models.blog import BlogPost, BlogPostCreate, BlogPostUpdate
+from app.db.user_loader import UserLoader
+from app.models.blog import BlogPost, BlogPostCreate, BlogPostUpdate, BlogPostSummary
 from app.crud import crud_blog
 from app.models.user import User, UserRole, ROLE_WEIGHTS
+from app.api.pagination import set_next_cursor
+from app.db.pagination import InvalidCursor
+from app.core.response_cache import response_cache
+from app.api.etag import ConditionalGet, Validator
+from app.services.image_pipeline import AVATAR_SIZE, variant_url
 
 router = APIRouter()
 
-async def enrich_blog_post(post: BlogPost, db: AsyncIOMotorDatabase) -> dict:
-    """Enrich blog post with author details"""
-    post_dict = post.model_dump()
+# Listings skip `content` (the bulk of every post) and ship its word count instead
+blog_list_fields = FieldSelector(
+    allowed=BlogPost.model_fields,
+    default=set(BlogPost.model_fields) - {"content"} | {"word_count"},
+    required={"author_id"},
+    computed={
+        "word_count": {"$size": {"$split": [{"$trim": {"input": {"$ifNull": ["$content", ""]}}}, " "]}},
+    },
+    aliases={"id": "_id"},
+)
+
+async def enrich_blog_post(post: BlogPost | BlogPostSummary, users: UserLoader) -> dict:
+    """Enrich blog post with author details (crud_blog.author_changed keeps ETags in step with them)"""
+    post_dict = post.model_dump(exclude_unset=isinstance(post, BlogPostSummary))
     if post.author_id:
-        try:
-            author = await db["users"].find_one({"_id": ObjectId(post.author_id)})
-            if author:
-                post_dict["author_name"] = author.get("full_name") or author.get("email")
-                post_dict["author_avatar"] = author.get("avatar_url")
-        except:
-            pass
+        author = await users.load(post.author_id)
+        if author:
+            post_dict["author_name"] = author.get("full_name") or author.get("email")
+            post_dict["author_avatar"] = variant_url(
+                author.get("profile_image"), author.get("profile_image_variants"), AVATAR_SIZE
+            ) or author.get("avatar_url")
             
     if "author_name" not in post_dict:
         post_dict["author_name"] = "Unknown Author"
         
     return post_dict
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=List[dict], dependencies=[Depends(ConditionalGet("blog_posts"))])
+@response_cache.cached("blog_posts")
 async def read_blog_posts(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
     category: Optional[str] = None,
     tag: Optional[str] = None,
     search: Optional[str] = None,
+    fields: FieldSet = Depends(blog_list_fields),
+    users: UserLoader = Depends(deps.get_user_loader),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Get all published blog posts. Public access.
+    Omits `content` unless requested via `fields` (`fields=*` for full posts).
+    The next page's cursor is sent in the X-Next-Cursor header.
     """
-    posts, total = await crud_blog.get_blog_posts(
-        db, skip=skip, limit=limit, category=category, tag=tag, search=search, published_only=True
-    )
+    try:
+        posts, _, next_cursor = await crud_blog.get_blog_posts(
+            db, skip=skip, limit=limit, cursor=cursor, category=category, tag=tag, search=search,
+            published_only=True, projection=fields.projection, with_total=False
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    set_next_cursor(response, next_cursor)
     
-    # Enrich with author info
-    enriched_posts = []
-    for post in posts:
-        enriched_posts.append(await enrich_blog_post(post, db))
-        
-    return enriched_posts
+    # Enrich with author info (one batched users query for the whole page)
+    return await asyncio.gather(*(enrich_blog_post(post, users) for post in posts))
+
+# Detail pages revalidate against the post's own version stamp
+blog_post_validator = ConditionalGet("blog_posts", path_param="slug", raise_not_modified=False)
 
 @router.get("/{slug}", response_model=dict)
 async def read_blog_post(
     slug: str,
+    validator: Validator = Depends(blog_post_validator),
+    users: UserLoader = Depends(deps.get_user_loader),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Get a specific blog post by slug. Public access.
-    Increments view count.
+    Increments view count, also when answering 304 Not Modified
+    (the view count itself is not part of the ETag).
     """
+    if validator.not_modified:
+        await crud_blog.increment_views(db, slug)
+        raise validator.not_modified_error()
+
     post = await crud_blog.get_blog_post(db, slug)
     if not post:
         raise HTTPException(status_code=404, detail="Blog post not found")
@@ -67,12 +102,14 @@ async def read_blog_post(
     # Increment views asynchronously (fire and forget sort of)
     # Increment views asynchronously (fire and forget sort of)
     await crud_blog.increment_views(db, slug)
-    return await enrich_blog_post(post, db)
+    return await enrich_blog_post(post, users)
 
 @router.get("/my/posts", response_model=List[BlogPost])
 async def read_my_blog_posts(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
@@ -86,9 +123,14 @@ async def read_my_blog_posts(
              detail="Not authorized"
          )
          
-    posts, total = await crud_blog.get_blog_posts(
-        db, skip=skip, limit=limit, author_id=str(current_user.id), published_only=False
-    )
+    try:
+        posts, _, next_cursor = await crud_blog.get_blog_posts(
+            db, skip=skip, limit=limit, cursor=cursor, author_id=str(current_user.id), published_only=False,
+            with_total=False
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    set_next_cursor(response, next_cursor)
     return posts
 
 @router.post("/", response_model=BlogPost)
@@ -5,6 +5,7 @@ from app.api import deps
 from app.db.mongodb import get_database
 from app.models.user import User, UserRole, ROLE_WEIGHTS
 from app.services.s3 import s3_service
+from app.core.principal_cache import principal_cache
 import uuid
 import os
 
@@ -46,6 +47,7 @@ async def list_bucket_files(
             {"_id": ObjectId(current_user.id)},
             {"$set": {"storage_used": total_size}}
         )
+        principal_cache.invalidate(email=current_user.email)
         
     return {
         "files": files,
@@ -97,6 +99,7 @@ async def upload_bucket_file(
             {"_id": ObjectId(current_user.id)},
             {"$set": {"storage_used": new_usage}}
         )
+        principal_cache.invalidate(email=current_user.email)
         
         return {"url": url, "filename": filename}
         
@@ -134,5 +137,6 @@ async def delete_bucket_file(
         {"_id": ObjectId(current_user.id)},
         {"$set": {"storage_used": new_usage}}
     )
+    principal_cache.invalidate(email=current_user.email)
     
     return {"status": "success", "freed_bytes": str(size_to_free)}
@@ -1,12 +1,24 @@
-from typing import List, Any, Dict
-from fastapi import APIRouter, Depends, HTTPException, Body, Query, UploadFile, File, Form
+import logging
+from typing import List, Any, Dict, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Body, Query, UploadFile, File, Form, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.api import deps
 from app.api.deps import get_database, get_current_user
-from app.models.community import CommunityPost, CommunityPostCreate, CommunityPostPagination
+from app.api.pagination import page_response
+from app.api.responses import TypedResponse
+from app.core.config import settings
+from app.models.community import (
+    CommunityPost, CommunityPostCreate, CommunityPostCreated, CommunityPostPagination,
+    Comment, CommentPage, FailedUpload, ReactionState, ReplyPage,
+)
+from app.models.notification import NotificationCreate, NotificationType
 from app.models.user import User, UserRole, ROLE_WEIGHTS
-from app.crud import crud_community
-import math
+from app.crud import crud_community, crud_notification
+from app.db.pagination import InvalidCursor
+from app.services import image_pipeline
+from app.services.image_pipeline import StoredImage
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -14,12 +26,17 @@ router = APIRouter()
 # This ensures only researchers and above can access.
 POST_ACCESS_WEIGHT = 50 
 
+comment_page = TypedResponse(CommentPage)
+reply_page = TypedResponse(ReplyPage)
+
 @router.get("/", response_model=CommunityPostPagination)
 async def read_posts(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=50),
-    sort: str = Query("latest", regex="^(latest|popular)$"),
+    sort: str = Query("latest", regex="^(latest|popular|hot)$"),
     filter: str = Query("all", regex="^(all|mine)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces `page`"),
+    include_total: bool = Query(True, description="Set to false to skip counting total/pages"),
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: User = Depends(deps.RoleChecker(required_weight=POST_ACCESS_WEIGHT)),
 ) -> Any:
@@ -30,23 +47,21 @@ async def read_posts(
     
     author_id = str(current_user.id) if filter == "mine" else None
     
-    items, total = await crud_community.get_posts_with_authors(
-        db, 
-        skip=skip, 
-        limit=size, 
-        sort_by=sort, 
-        author_id=author_id
-    )
-    
-    pages = math.ceil(total / size) if total > 0 else 0
+    try:
+        items, total, next_cursor = await crud_community.get_posts_with_authors(
+            db, 
+            skip=skip, 
+            limit=size, 
+            sort_by=sort, 
+            author_id=author_id,
+            cursor=cursor,
+            with_total=include_total,
+            viewer_id=str(current_user.id)
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     
-    return {
-        "items": items,
-        "total": total,
-        "page": page,
-        "size": size,
-        "pages": pages
-    }
+    return page_response(items, total, page, size, next_cursor)
 
 @router.get("/{post_id}", response_model=CommunityPost)
 async def read_post(
@@ -55,65 +70,137 @@ async def read_post(
     current_user: User = Depends(deps.RoleChecker(required_weight=POST_ACCESS_WEIGHT)),
 ) -> Any:
     """
-    Get a specific post with comments.
+    Get a specific post. Its comments are paged by /{post_id}/comments.
     """
     post = await crud_community.get_post_with_author(db, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    print(f"DEBUG COMMENTS for {post_id}: {post.get('comments')}")
     return post
 
-@router.post("/", response_model=CommunityPost)
+@router.get("/{post_id}/comments", response_model=CommentPage)
+async def read_comments(
+    response: Response,
+    post_id: str,
+    size: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: User = Depends(deps.RoleChecker(required_weight=POST_ACCESS_WEIGHT)),
+) -> Any:
+    """
+    Top-level comments of a post, newest first, each with the first replies of
+    its thread nested (oldest first). Threads with more carry replies_cursor
+    for /{post_id}/comments/{comment_id}/replies.
+    """
+    if not await crud_community.post_exists(db, post_id):
+        raise HTTPException(status_code=404, detail="Post not found")
+    try:
+        items, next_cursor = await crud_community.get_comment_page(db, post_id, cursor=cursor, limit=size)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return comment_page({"items": items, "next_cursor": next_cursor}, response)
+
+@router.get("/{post_id}/comments/{comment_id}/replies", response_model=ReplyPage)
+async def read_replies(
+    response: Response,
+    post_id: str,
+    comment_id: str,
+    size: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="replies_cursor of the thread, then next_cursor"),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: User = Depends(deps.RoleChecker(required_weight=POST_ACCESS_WEIGHT)),
+) -> Any:
+    """
+    More replies of the thread under a top-level comment, oldest first and flat.
+    """
+    try:
+        page = await crud_community.get_reply_page(db, post_id, comment_id, cursor=cursor, limit=size)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    items, next_cursor = page
+    return reply_page({"items": items, "next_cursor": next_cursor}, response)
+
+async def _image_files(files: List[UploadFile]) -> Tuple[List[Tuple[Optional[str], bytes]], List[FailedUpload]]:
+    """
+    (filename, contents) of the image files, plus failures for anything rejected.
+    Read into memory: the pipeline decodes them whole, and early-response
+    uploads outlive the request's temp files.
+    """
+    images = []
+    rejected = []
+    for file in files or []:
+        if not (file.content_type or "").startswith('image/'):
+            rejected.append(FailedUpload(filename=file.filename, error="Not an image"))
+            continue
+        await file.seek(0)
+        images.append((file.filename, await file.read()))
+    return images, rejected
+
+async def _store_images(images: List[Tuple[Optional[str], bytes]], author_id: str) -> List[StoredImage]:
+    return await image_pipeline.store_images(images, f"community_uploads/{author_id}", settings.S3_UPLOAD_PER_REQUEST)
+
+async def _attach_uploads(db: AsyncIOMotorDatabase, post_id: str, images: List[Tuple[Optional[str], bytes]], author_id: str) -> None:
+    """
+    Early-response mode: upload after the post was returned, attach what
+    landed and tell the author about the rest.
+    """
+    results = await _store_images(images, author_id)
+    stored = [r for r in results if r.ok]
+    await crud_community.attach_images(db, post_id, [r.url for r in stored], [r.variants for r in stored])
+    failed = [r for r in results if not r.ok]
+    if failed:
+        logger.error(f"{len(failed)} image uploads failed for post {post_id}: {[r.error for r in failed]}")
+        await crud_notification.create_notification(db, NotificationCreate(
+            user_id=author_id,
+            title="Image upload failed",
+            message=f"{len(failed)} of {len(results)} images could not be added to your post.",
+            type=NotificationType.WARNING,
+            action_label="View Post",
+            action_url="/dashboard/community",
+        ))
+
+@router.post("/", response_model=CommunityPostCreated)
 async def create_post(
+    background_tasks: BackgroundTasks,
     content: str = Form(...),
     files: List[UploadFile] = File(None),
+    wait_for_uploads: bool = Form(True, description="false returns the post at once and attaches images as they land"),
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: User = Depends(deps.RoleChecker(required_weight=POST_ACCESS_WEIGHT)),
 ) -> Any:
     """
     Create a new post with optional images. Researcher+.
+
+    Images are resized into variants (app.services.image_pipeline) and
+    uploaded concurrently off the event loop. Files that are rejected or
+    fail are listed in `failed_uploads`; the post is created with the rest.
     """
-    image_urls = []
-    
-    # Upload images if present
-    if files:
-        import os
-        import uuid
-        from app.services.s3 import s3_service
-        
-        for file in files:
-            if not file.content_type.startswith('image/'):
-                continue
-                
-            file_extension = os.path.splitext(file.filename)[1]
-            filename = f"{uuid.uuid4()}{file_extension}"
-            object_name = f"community_uploads/{current_user.id}/{filename}"
-            
-            try:
-                await file.seek(0)
-                url = s3_service.upload_file(
-                    file.file, 
-                    object_name, 
-                    content_type=file.content_type
-                )
-                image_urls.append(url)
-            except Exception as e:
-                print(f"Failed to upload image {file.filename}: {e}")
-                # Continue with other files or fail? Failsafe: continue
-                
-    # Create Post Object
-    post_in = CommunityPostCreate(content=content, images=image_urls)
-    
-    return await crud_community.create_post(db, post_in, str(current_user.id))
+    author_id = str(current_user.id)
+    images, failed = await _image_files(files)
 
-@router.post("/{post_id}/like")
+    if wait_for_uploads or not images:
+        results = await _store_images(images, author_id)
+        failed += [FailedUpload(filename=r.filename, error=r.error) for r in results if not r.ok]
+        stored = [r for r in results if r.ok]
+        post_in = CommunityPostCreate(
+            content=content, images=[r.url for r in stored], image_variants=[r.variants for r in stored]
+        )
+        post = await crud_community.create_post(db, post_in, author_id)
+        return {**post, "failed_uploads": failed}
+
+    post = await crud_community.create_post(db, CommunityPostCreate(content=content, images=[]), author_id)
+    background_tasks.add_task(_attach_uploads, db, post["_id"], images, author_id)
+    return {**post, "failed_uploads": failed, "pending_uploads": len(images)}
+
+@router.post("/{post_id}/like", response_model=ReactionState)
 async def like_post(
     post_id: str,
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: User = Depends(deps.RoleChecker(required_weight=POST_ACCESS_WEIGHT)),
 ) -> Any:
     """
-    Toggle like on a post.
+    Toggle like on a post. Returns the new counts and the caller's state.
     """
     post = await crud_community.toggle_like(
         db, 
@@ -125,21 +212,21 @@ async def like_post(
         raise HTTPException(status_code=404, detail="Post not found")
     return post
 
-@router.post("/{post_id}/dislike")
+@router.post("/{post_id}/dislike", response_model=ReactionState)
 async def dislike_post(
     post_id: str,
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: User = Depends(deps.RoleChecker(required_weight=POST_ACCESS_WEIGHT)),
 ) -> Any:
     """
-    Toggle dislike on a post.
+    Toggle dislike on a post. Returns the new counts and the caller's state.
     """
     post = await crud_community.toggle_dislike(db, post_id, str(current_user.id))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     return post
 
-@router.post("/{post_id}/comment")
+@router.post("/{post_id}/comment", response_model=Comment)
 async def comment_post(
     post_id: str,
     content: str = Body(..., embed=True),
@@ -148,9 +235,12 @@ async def comment_post(
     current_user: User = Depends(deps.RoleChecker(required_weight=POST_ACCESS_WEIGHT)),
 ) -> Any:
     """
-    Add a comment to a post.
+    Add a comment (or a reply to `parent_id`) to a post. Returns the new comment.
     """
-    post = await crud_community.add_comment(db, post_id, content, current_user, parent_id)
-    if not post:
+    try:
+        comment = await crud_community.add_comment(db, post_id, content, current_user, parent_id)
+    except crud_community.ParentCommentNotFound:
+        raise HTTPException(status_code=404, detail="Parent comment not found")
+    if not comment:
         raise HTTPException(status_code=404, detail="Post not found")
-    return post
+    return comment
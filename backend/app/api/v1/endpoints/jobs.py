@@ -1,19 +1,29 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.api import deps
 from app.api.deps import get_database, get_current_user
+from app.api.pagination import page_response
 from app.models.job import Job, JobCreate, JobUpdate, JobPagination
 from app.models.user import User, UserRole, ROLE_WEIGHTS
 from app.crud import crud_job
-import math
+from app.db.pagination import InvalidCursor
+from app.core.response_cache import response_cache
+from app.api.etag import ConditionalGet
+from app.api.responses import TypedResponse
 
 router = APIRouter()
 
-@router.get("/", response_model=JobPagination)
+job_page = TypedResponse(JobPagination)
+
+@router.get("/", response_model=JobPagination, dependencies=[Depends(ConditionalGet("jobs"))])
+@response_cache.cached("jobs")
 async def read_jobs(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces `page`"),
+    include_total: bool = Query(True, description="Set to false to skip counting total/pages"),
     search: str = "",
     active_only: bool = False,
     db: AsyncIOMotorDatabase = Depends(get_database),
@@ -22,17 +32,14 @@ async def read_jobs(
     Retrieve jobs with pagination and search.
     """
     skip = (page - 1) * size
-    items, total = await crud_job.get_multi(db, skip=skip, limit=size, search_query=search, active_only=active_only)
-    
-    pages = math.ceil(total / size) if total > 0 else 0
+    try:
+        items, total, next_cursor = await crud_job.get_multi(
+            db, skip=skip, limit=size, cursor=cursor, search_query=search, active_only=active_only, with_total=include_total
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     
-    return {
-        "items": items,
-        "total": total,
-        "page": page,
-        "size": size,
-        "pages": pages
-    }
+    return job_page(page_response(items, total, page, size, next_cursor), response)
 
 @router.post("/", response_model=Job)
 async def create_job(
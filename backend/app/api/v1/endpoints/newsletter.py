@@ -40,30 +40,37 @@ async def subscribe_newsletter(
 
 from app.models.user import User, UserRole, ROLE_WEIGHTS
 from app.api import deps
+from app.api.pagination import page_response
+from app.db.pagination import InvalidCursor, Keyset, paginate
 from bson import ObjectId
+from pymongo import DESCENDING
+from typing import Optional
+
+SUBSCRIBERS_KEYSET = Keyset(("subscribed_at", DESCENDING))
 
 @router.get("/subscribers", response_model=dict)
 async def read_subscribers(
     page: int = 1,
     size: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: User = Depends(deps.RoleChecker(required_weight=ROLE_WEIGHTS[UserRole.ADMIN])),
 ) -> Any:
     """
     Retrieve subscribers with pagination. Admin only.
+    Pass `next_cursor` back as `cursor` to page without skipping.
     """
     skip = (page - 1) * size
-    cursor = db["subscribers"].find().sort("subscribed_at", -1).skip(skip).limit(size)
-    items = await cursor.to_list(length=size)
-    total_count = await db["subscribers"].count_documents({})
+    try:
+        items, total_count, next_cursor = await paginate(
+            db["subscribers"], {}, SUBSCRIBERS_KEYSET, cursor=cursor, skip=skip, limit=size,
+            with_total=include_total
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     
-    return {
-        "items": [Subscriber(**item) for item in items],
-        "total": total_count,
-        "page": page,
-        "size": size,
-        "pages": (total_count + size - 1) // size
-    }
+    return page_response([Subscriber(**item) for item in items], total_count, page, size, next_cursor)
 
 @router.delete("/subscribers/{subscriber_id}", response_model=bool)
 async def delete_subscriber(
@@ -1,5 +1,5 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.api.deps import get_current_user, get_database
 from app.models.user import User
@@ -10,6 +10,8 @@ from enum import Enum
 from app.models.user import UserRole, ROLE_WEIGHTS
 from app.core.email import send_email
 from app.api import deps 
+from app.api.pagination import set_next_cursor
+from app.db.pagination import InvalidCursor
 
 class NotificationTargetType(str, Enum):
     ALL = "all"
@@ -31,17 +33,24 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Notification])
 async def read_notifications(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """
     Retrieve notifications for the current user.
+    The next page's cursor is sent in the X-Next-Cursor header.
     """
-    notifications = await crud_notification.get_notifications_by_user(
-        db, user_id=str(current_user.id), skip=skip, limit=limit
-    )
+    try:
+        notifications, next_cursor = await crud_notification.get_notifications_by_user(
+            db, user_id=str(current_user.id), skip=skip, limit=limit, cursor=cursor
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    set_next_cursor(response, next_cursor)
     return notifications
 
 @router.post("/", response_model=Notification)
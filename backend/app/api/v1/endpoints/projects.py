@@ -1,16 +1,24 @@
 from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.api.deps import get_database
 from app.models.project import Project, ProjectCreate, ProjectUpdate
 from app.models.user import User, UserRole, ROLE_WEIGHTS
 from app.api import deps
+from app.core.response_cache import response_cache
+from app.api.etag import ConditionalGet
+from app.api.responses import TypedResponse
+from app.db.invalidation import invalidate_collection
 from bson import ObjectId
 
 router = APIRouter()
 
-@router.get("/", response_model=List[Project])
+project_list = TypedResponse(List[Project])
+
+@router.get("/", response_model=List[Project], dependencies=[Depends(ConditionalGet("projects"))])
+@response_cache.cached("projects")
 async def read_projects(
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_database),
 ) -> Any:
     """
@@ -18,7 +26,7 @@ async def read_projects(
     """
     cursor = db["projects"].find({"is_active": True}).sort("created_at", -1)
     items = await cursor.to_list(length=100)
-    return [Project(**item) for item in items]
+    return project_list(items, response)
 
 @router.post("/", response_model=Project)
 async def create_project(
@@ -31,6 +39,7 @@ async def create_project(
     """
     item_dict = project.model_dump()
     result = await db["projects"].insert_one(item_dict)
+    await invalidate_collection(db, "projects")
     created_item = await db["projects"].find_one({"_id": result.inserted_id})
     return Project(**created_item)
 
@@ -57,9 +66,9 @@ async def update_project(
         {"_id": oid},
         {"$set": update_data}
     )
-    
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Project not found")
+    await invalidate_collection(db, "projects")
         
     updated_item = await db["projects"].find_one({"_id": oid})
     return Project(**updated_item)
@@ -81,4 +90,5 @@ async def delete_project(
     result = await db["projects"].delete_one({"_id": oid})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Project not found")
+    await invalidate_collection(db, "projects")
     return True
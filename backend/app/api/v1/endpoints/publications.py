@@ -1,19 +1,29 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.api import deps
 from app.api.deps import get_database, get_current_user
+from app.api.pagination import page_response
 from app.models.publication import Publication, PublicationCreate, PublicationUpdate, PublicationPagination
 from app.models.user import User, UserRole, ROLE_WEIGHTS
 from app.crud import crud_publication
-import math
+from app.db.pagination import InvalidCursor
+from app.core.response_cache import response_cache
+from app.api.etag import ConditionalGet
+from app.api.responses import TypedResponse
 
 router = APIRouter()
 
-@router.get("/", response_model=PublicationPagination)
+publication_page = TypedResponse(PublicationPagination)
+
+@router.get("/", response_model=PublicationPagination, dependencies=[Depends(ConditionalGet("publications"))])
+@response_cache.cached("publications")
 async def read_publications(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces `page`"),
+    include_total: bool = Query(True, description="Set to false to skip counting total/pages"),
     search: str = "",
     db: AsyncIOMotorDatabase = Depends(get_database),
 ) -> Any:
@@ -21,17 +31,14 @@ async def read_publications(
     Retrieve publications with pagination and search.
     """
     skip = (page - 1) * size
-    items, total = await crud_publication.get_multi(db, skip=skip, limit=size, search_query=search)
-    
-    pages = math.ceil(total / size) if total > 0 else 0
+    try:
+        items, total, next_cursor = await crud_publication.get_multi(
+            db, skip=skip, limit=size, cursor=cursor, search_query=search, with_total=include_total
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     
-    return {
-        "items": items,
-        "total": total,
-        "page": page,
-        "size": size,
-        "pages": pages
-    }
+    return publication_page(page_response(items, total, page, size, next_cursor), response)
 
 @router.post("/", response_model=Publication)
 async def create_publication(
@@ -1,35 +1,44 @@
-from typing import List, Any
+from typing import List, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Body
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.api.deps import get_database, get_current_user
 from app.models.research_area import ResearchArea, ResearchAreaCreate, ResearchAreaUpdate
 from app.models.user import User, UserRole, ROLE_WEIGHTS
 from app.api import deps
+from app.api.pagination import page_response
+from app.db.pagination import InvalidCursor, Keyset, paginate
+from app.core.response_cache import response_cache
+from app.api.etag import ConditionalGet
+from app.db.invalidation import invalidate_collection
 from bson import ObjectId
+from pymongo import ASCENDING
 
 router = APIRouter()
 
-@router.get("/", response_model=dict)
+AREAS_KEYSET = Keyset(("number", ASCENDING))
+
+@router.get("/", response_model=dict, dependencies=[Depends(ConditionalGet("research_areas"))])
+@response_cache.cached("research_areas")
 async def read_research_areas(
     page: int = 1,
     size: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: AsyncIOMotorDatabase = Depends(get_database),
 ) -> Any:
     """
     Retrieve research areas with pagination.
     """
     skip = (page - 1) * size
-    cursor = db["research_areas"].find().sort("number", 1).skip(skip).limit(size)
-    items = await cursor.to_list(length=size)
-    total_count = await db["research_areas"].count_documents({})
+    try:
+        items, total_count, next_cursor = await paginate(
+            db["research_areas"], {}, AREAS_KEYSET, cursor=cursor, skip=skip, limit=size,
+            with_total=include_total
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     
-    return {
-        "items": [ResearchArea(**item) for item in items],
-        "total": total_count,
-        "page": page,
-        "size": size,
-        "pages": (total_count + size - 1) // size
-    }
+    return page_response([ResearchArea(**item) for item in items], total_count, page, size, next_cursor)
 
 @router.post("/", response_model=ResearchArea)
 async def create_research_area(
@@ -42,6 +51,7 @@ async def create_research_area(
     """
     item_dict = area.model_dump()
     result = await db["research_areas"].insert_one(item_dict)
+    await invalidate_collection(db, "research_areas")
     created_item = await db["research_areas"].find_one({"_id": result.inserted_id})
     return ResearchArea(**created_item)
 
@@ -68,9 +78,9 @@ async def update_research_area(
         {"_id": oid},
         {"$set": update_data}
     )
-    
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Research area not found")
+    await invalidate_collection(db, "research_areas")
         
     updated_item = await db["research_areas"].find_one({"_id": oid})
     return ResearchArea(**updated_item)
@@ -92,4 +102,5 @@ async def delete_research_area(
     result = await db["research_areas"].delete_one({"_id": oid})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Research area not found")
+    await invalidate_collection(db, "research_areas")
     return True
@@ -1,22 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query, UploadFile, File, Response
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 import uuid
 import os
 from datetime import datetime
-from jose import jwt, JWTError
 
 from app.api import deps
+from app.api.fields import FieldSelector, FieldSet
+from app.api.pagination import set_next_cursor
+from app.api.responses import TypedResponse
+from app.db.pagination import InvalidCursor, Keyset, find_page
+from pymongo import DESCENDING
 from app.db.mongodb import get_database
+from app.db.user_loader import UserLoader
 from app.core.config import settings
+from app.core.auth_context import get_auth_context
 from app.models.research_group import (
-    ResearchGroup, ResearchGroupCreate, ResearchGroupUpdate, 
+    ResearchGroup, ResearchGroupCreate, ResearchGroupUpdate, ResearchGroupSummary, ResearchGroupListing,
     GroupMember, GroupMemberDetail, GroupRole, Invitation, InvitationStatus, ChatMessage
 )
 from app.models.user import User, UserRole
 from app.utils.email import send_email
-from app.services.s3 import s3_service
+from app.services import image_pipeline
+from app.services.image_pipeline import AVATAR_SIZE, InvalidImage, variant_url
+from app.crud import crud_research_group
 
 router = APIRouter()
 
@@ -61,39 +69,31 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
-async def enrich_group_data(group: dict, db: AsyncIOMotorDatabase) -> dict:
+async def enrich_group_data(group: dict, users: UserLoader) -> dict:
     """Enrich group member data with user details (name, avatar)"""
     if not group or "members" not in group:
         return group
-        
-    # Deduplicate members by user_id
-    seen_users = set()
-    unique_members = []
-    for m in group["members"]:
-        if m["user_id"] not in seen_users:
-            seen_users.add(m["user_id"])
-            unique_members.append(m)
-            
-    member_ids = [m["user_id"] for m in unique_members]
-    users = await db["users"].find({"_id": {"$in": [ObjectId(uid) for uid in member_ids]}}).to_list(None)
-    user_map = {str(u["_id"]): u for u in users}
-    
-    enriched_members = []
-    for m in unique_members:
-        user = user_map.get(m["user_id"])
-        member_detail = m.copy()
-        if user:
-            member_detail["name"] = user.get("full_name") or user.get("email")
-            # Assuming avatar_url might be added to User model later or exists, 
-            # for now we can simulate or check if it exists
-            member_detail["avatar_url"] = user.get("avatar_url")
-        else:
-            member_detail["name"] = "Unknown User"
-            
-        enriched_members.append(member_detail)
-        
-    group["members"] = enriched_members
-    return group
+    user_map = await users.load_map(m["user_id"] for m in group["members"])
+    return crud_research_group.merge_member_details(group, user_map)
+
+# Listings report how many members a group has rather than the full member list,
+# plus the caller's unread message count and a preview of the newest message
+group_list_fields = FieldSelector(
+    allowed=set(ResearchGroup.model_fields) | {"unread_count"},
+    default={
+        "id", "name", "topic", "description", "image_url", "image_variants", "created_by", "created_at",
+        "member_count", "unread_count", "last_message",
+    },
+    computed={"member_count": {"$size": {"$ifNull": ["$members", []]}}},
+    aliases={"id": "_id"},
+)
+
+# Newest first; a cursor continues with older messages
+MESSAGES_KEYSET = Keyset(("timestamp", DESCENDING))
+
+group_summaries = TypedResponse(List[ResearchGroupSummary], exclude_unset=True)
+group_listing = TypedResponse(List[ResearchGroupListing])
+message_list = TypedResponse(List[ChatMessage])
 
 # --- Routes ---
 
@@ -101,6 +101,7 @@ async def enrich_group_data(group: dict, db: AsyncIOMotorDatabase) -> dict:
 async def create_group(
     group_in: ResearchGroupCreate,
     current_user: User = Depends(deps.get_current_active_user),
+    users: UserLoader = Depends(deps.get_user_loader),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     group_data = group_in.model_dump()
@@ -111,38 +112,41 @@ async def create_group(
     
     result = await db["research_groups"].insert_one(group_data)
     created_group = await db["research_groups"].find_one({"_id": result.inserted_id})
-    created_group = await enrich_group_data(created_group, db)
+    created_group = await enrich_group_data(created_group, users)
     return ResearchGroup(**created_group)
 
-@router.get("/", response_model=List[ResearchGroup])
+@router.get("/", response_model=List[ResearchGroupSummary], response_model_exclude_unset=True)
 async def read_groups(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    fields: FieldSet = Depends(group_list_fields),
     current_user: User = Depends(deps.get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    # Only show groups where user is a member or creator
-    query = {
-        "$or": [
-            {"members.user_id": str(current_user.id)},
-            {"created_by": str(current_user.id)}
-        ]
-    }
-    
-    cursor = db["research_groups"].find(query).skip(skip).limit(limit)
-    groups = await cursor.to_list(length=limit)
-    
-    # Enrich all groups
-    enriched_groups = []
-    for g in groups:
-        enriched_groups.append(await enrich_group_data(g, db))
-        
-    return [ResearchGroup(**g) for g in enriched_groups]
+    """
+    Groups the user belongs to, with the user's unread message count.
+    Members (with name and avatar) are only included when requested via
+    `fields=members` or `fields=*`. Everything comes from a single aggregation.
+    """
+    groups = await crud_research_group.list_groups(
+        db,
+        str(current_user.id),
+        skip=skip,
+        limit=limit,
+        projection=fields.projection,
+        with_members="members" in fields,
+        with_unread="unread_count" in fields,
+    )
+    if fields.is_full:
+        return group_listing(groups, response)
+    return group_summaries(groups, response)
 
 @router.get("/{group_id}", response_model=ResearchGroup)
 async def read_group(
     group_id: str,
     current_user: User = Depends(deps.get_current_active_user),
+    users: UserLoader = Depends(deps.get_user_loader),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     try:
@@ -161,13 +165,14 @@ async def read_group(
     if not is_member and not is_creator:
         raise HTTPException(status_code=403, detail="Not a member")
         
-    return ResearchGroup(**await enrich_group_data(group, db))
+    return ResearchGroup(**await enrich_group_data(group, users))
 
 @router.put("/{group_id}", response_model=ResearchGroup)
 async def update_group(
     group_id: str,
     group_in: ResearchGroupUpdate,
     current_user: User = Depends(deps.get_current_active_user),
+    users: UserLoader = Depends(deps.get_user_loader),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     try:
@@ -188,13 +193,14 @@ async def update_group(
     update_data = {k: v for k, v in group_in.model_dump().items() if v is not None}
     
     if update_data:
-        await db["research_groups"].update_one(
-            {"_id": oid},
-            {"$set": update_data}
-        )
+        update = {"$set": update_data}
+        if "image_url" in update_data:
+            # A hand-set URL has no variants; drop the previous image's
+            update["$unset"] = {"image_variants": ""}
+        await db["research_groups"].update_one({"_id": oid}, update)
         
     updated_group = await db["research_groups"].find_one({"_id": oid})
-    return ResearchGroup(**await enrich_group_data(updated_group, db))
+    return ResearchGroup(**await enrich_group_data(updated_group, users))
 
 @router.put("/{group_id}/members/{user_id}/role", response_model=ResearchGroup)
 async def update_member_role(
@@ -202,6 +208,7 @@ async def update_member_role(
     user_id: str,
     role: GroupRole = Query(...),
     current_user: User = Depends(deps.get_current_active_user),
+    users: UserLoader = Depends(deps.get_user_loader),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     try:
@@ -231,13 +238,14 @@ async def update_member_role(
              raise HTTPException(status_code=404, detail="Member not found in group")
              
     updated_group = await db["research_groups"].find_one({"_id": oid})
-    return ResearchGroup(**await enrich_group_data(updated_group, db))
+    return ResearchGroup(**await enrich_group_data(updated_group, users))
 
 @router.delete("/{group_id}/members/{user_id}", response_model=ResearchGroup)
 async def remove_member(
     group_id: str,
     user_id: str,
     current_user: User = Depends(deps.get_current_active_user),
+    users: UserLoader = Depends(deps.get_user_loader),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     try:
@@ -275,7 +283,7 @@ async def remove_member(
     )
     
     updated_group = await db["research_groups"].find_one({"_id": oid})
-    return ResearchGroup(**await enrich_group_data(updated_group, db))
+    return ResearchGroup(**await enrich_group_data(updated_group, users))
 
 @router.post("/{group_id}/invite", response_model=Invitation)
 async def invite_member(
@@ -347,6 +355,7 @@ async def invite_member(
 async def join_group(
     token: str,
     current_user: User = Depends(deps.get_current_active_user),
+    users: UserLoader = Depends(deps.get_user_loader),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     invite = await db["invitations"].find_one({"token": token, "status": InvitationStatus.PENDING})
@@ -371,7 +380,7 @@ async def join_group(
             {"_id": invite["_id"]},
             {"$set": {"status": InvitationStatus.ACCEPTED}}
         )
-        return ResearchGroup(**await enrich_group_data(group, db))
+        return ResearchGroup(**await enrich_group_data(group, users))
 
     new_member = GroupMember(user_id=str(current_user.id), role=GroupRole.MEMBER).model_dump()
     
@@ -386,14 +395,17 @@ async def join_group(
     )
     
     group = await db["research_groups"].find_one({"_id": oid})
-    return ResearchGroup(**await enrich_group_data(group, db))
+    return ResearchGroup(**await enrich_group_data(group, users))
 
 @router.get("/{group_id}/messages", response_model=List[ChatMessage])
 async def get_messages(
     group_id: str,
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
+    users: UserLoader = Depends(deps.get_user_loader),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     # Permission check for messages
@@ -407,22 +419,24 @@ async def get_messages(
     if not is_member and not is_creator:
         raise HTTPException(status_code=403, detail="Not authorized to view messages")
 
-    cursor = db["chat_messages"].find({"group_id": group_id}).sort("timestamp", -1).skip(skip).limit(limit)
-    messages = await cursor.to_list(length=limit)
+    try:
+        messages, next_cursor = await find_page(
+            db["chat_messages"], {"group_id": group_id}, MESSAGES_KEYSET, cursor=cursor, skip=skip, limit=limit
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Cursor for the next batch of older messages
+    set_next_cursor(response, next_cursor)
     
     # Enrich with avatars
-    user_ids = list(set([m["user_id"] for m in messages]))
-    users = await db["users"].find({"_id": {"$in": [ObjectId(uid) for uid in user_ids]}}).to_list(None)
-    user_map = {str(u["_id"]): u for u in users}
+    user_map = await users.load_map(m["user_id"] for m in messages)
     
-    enriched_messages = []
     for m in messages:
         user = user_map.get(m["user_id"])
         if user and user.get("profile_image"):
-            m["user_avatar"] = user["profile_image"]
-        enriched_messages.append(m)
+            m["user_avatar"] = variant_url(user["profile_image"], user.get("profile_image_variants"), AVATAR_SIZE)
         
-    return [ChatMessage(**m) for m in enriched_messages][::-1]
+    return message_list(messages[::-1], response)
 
 @router.post("/{group_id}/read")
 async def mark_messages_read(
@@ -439,13 +453,8 @@ async def mark_messages_read(
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
         
-    # Update member's last_read_at
-    result = await db["research_groups"].update_one(
-        {"_id": oid, "members.user_id": str(current_user.id)},
-        {"$set": {"members.$.last_read_at": datetime.utcnow()}}
-    )
-    
-    if result.matched_count == 0:
+    # Update member's last_read_at and reset their unread counter
+    if not await crud_research_group.mark_read(db, oid, str(current_user.id)):
         # If not matched, it could be because user is not a member.
         # If user is admin (and group exists), just ignore and return success.
         if current_user.role == UserRole.ADMIN:
@@ -459,27 +468,7 @@ async def get_total_unread_count(
     current_user: User = Depends(deps.get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    # Find all groups user is part of
-    user_id = str(current_user.id)
-    groups = await db["research_groups"].find({"members.user_id": user_id}).to_list(None)
-    
-    total_unread = 0
-    
-    for group in groups:
-        # Find user's last read time
-        member = next((m for m in group["members"] if m["user_id"] == user_id), None)
-        if not member: 
-            continue
-            
-        last_read = member.get("last_read_at") or member.get("joined_at") or datetime.min
-        
-        # Count messages after this time
-        count = await db["chat_messages"].count_documents({
-            "group_id": str(group["_id"]),
-            "timestamp": {"$gt": last_read}
-        })
-        total_unread += count
-        
+    total_unread = await crud_research_group.total_unread(db, str(current_user.id))
     return {"count": total_unread}
 
 @router.websocket("/{group_id}/ws")
@@ -491,10 +480,12 @@ async def websocket_endpoint(
     # Validate token manually
     db = await get_database()
     try:
-        payload = jwt.decode(
-             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        email: str = payload.get("sub")
+        # Token (from the query string) was decoded by AuthContextMiddleware
+        auth = get_auth_context(websocket.scope)
+        if not auth.valid:
+             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+             return
+        email: str = auth.subject
         # Find user
         user_data = await db["users"].find_one({"email": email})
         if not user_data:
@@ -532,12 +523,12 @@ async def websocket_endpoint(
                 group_id=group_id,
                 user_id=str(user.id),
                 user_name=user.full_name or user.email,
-                user_avatar=user.profile_image,
+                user_avatar=variant_url(user.profile_image, user.profile_image_variants, AVATAR_SIZE),
                 content=content,
                 audio_url=audio_url
             )
-            # Save
-            await db["chat_messages"].insert_one(msg.model_dump())
+            # Save, bumping the other members' unread counters
+            await crud_research_group.add_message(db, msg.model_dump())
             
             # Broadcast
             # We want to broadcast the message structure
@@ -556,6 +547,7 @@ async def upload_group_image(
     group_id: str,
     file: UploadFile = File(...),
     current_user: User = Depends(deps.get_current_active_user),
+    users: UserLoader = Depends(deps.get_user_loader),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     try:
@@ -576,15 +568,12 @@ async def upload_group_image(
     if not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="File must be an image")
 
-    # Upload to S3
-    file_extension = os.path.splitext(file.filename)[1]
-    object_name = f"research_groups/{group_id}/{uuid.uuid4()}{file_extension}"
-    
+    # Resize into variants and upload to S3
     try:
-        # Reset file pointer
         await file.seek(0)
-        
-        image_url = s3_service.upload_file(file.file, object_name, file.content_type)
+        image = await image_pipeline.store_image(await file.read(), f"research_groups/{group_id}", file.filename)
+    except InvalidImage as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Group upload error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to upload image: {str(e)}")
@@ -592,8 +581,8 @@ async def upload_group_image(
     # Update group
     await db["research_groups"].update_one(
         {"_id": oid},
-        {"$set": {"image_url": image_url}}
+        {"$set": {"image_url": image.url, "image_variants": image.variants}}
     )
 
     updated_group = await db["research_groups"].find_one({"_id": oid})
-    return ResearchGroup(**await enrich_group_data(updated_group, db))
+    return ResearchGroup(**await enrich_group_data(updated_group, users))
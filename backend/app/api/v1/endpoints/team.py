@@ -1,5 +1,5 @@
 from typing import Any, List
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 
@@ -7,11 +7,19 @@ from app.api import deps
 from app.api.deps import get_database
 from app.models.user import User, UserRole, ROLE_WEIGHTS
 from app.models.team import TeamMember, TeamMemberCreate, TeamMemberUpdate
+from app.core.response_cache import response_cache
+from app.api.etag import ConditionalGet
+from app.api.responses import TypedResponse
+from app.db.invalidation import invalidate_collection
 
 router = APIRouter()
 
-@router.get("/", response_model=List[TeamMember])
+team_list = TypedResponse(List[TeamMember])
+
+@router.get("/", response_model=List[TeamMember], dependencies=[Depends(ConditionalGet("team_members"))])
+@response_cache.cached("team_members")
 async def read_team_members(
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_database),
     skip: int = 0,
     limit: int = 100,
@@ -24,7 +32,7 @@ async def read_team_members(
     members = await cursor.to_list(length=limit)
     
     # Map _id to id
-    return [{**m, "_id": str(m["_id"])} for m in members]
+    return team_list([{**m, "_id": str(m["_id"])} for m in members], response)
 
 @router.post("/", response_model=TeamMember)
 async def create_team_member(
@@ -38,6 +46,7 @@ async def create_team_member(
     """
     member_dict = member_in.model_dump()
     result = await db["team_members"].insert_one(member_dict)
+    await invalidate_collection(db, "team_members")
     
     created_member = await db["team_members"].find_one({"_id": result.inserted_id})
     return {**created_member, "_id": str(created_member["_id"])}
@@ -68,9 +77,9 @@ async def update_team_member(
         {"_id": oid},
         {"$set": update_data}
     )
-    
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Team member not found")
+    await invalidate_collection(db, "team_members")
         
     updated_member = await db["team_members"].find_one({"_id": oid})
     return {**updated_member, "_id": str(updated_member["_id"])}
@@ -91,8 +100,8 @@ async def delete_team_member(
         raise HTTPException(status_code=400, detail="Invalid ID")
 
     result = await db["team_members"].delete_one({"_id": oid})
-    
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Team member not found")
+    await invalidate_collection(db, "team_members")
         
     return True
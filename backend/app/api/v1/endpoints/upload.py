@@ -6,6 +6,10 @@ from typing import Dict, Any
 from app.models.user import User
 from app.api import deps
 from app.services.s3 import s3_service
+from app.services import image_pipeline
+from app.services.image_pipeline import InvalidImage
+from app.core.principal_cache import principal_cache
+from app.crud import crud_blog
 from app.db.mongodb import get_database
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
@@ -53,35 +57,30 @@ async def upload_profile_picture(
     if not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="File must be an image")
     
-    # Generate organized object name: profile_pictures/<user_id>/<uuid>.<ext>
-    file_extension = os.path.splitext(file.filename)[1]
-    filename = f"{uuid.uuid4()}{file_extension}"
-    object_name = f"profile_pictures/{current_user.id}/{filename}"
-    
     try:
-        # Read file content safely
         # Ensure we are at the beginning of the file (though for a fresh upload it should be)
         await file.seek(0)
         
-        # Upload to S3
-        url = s3_service.upload_file(
-            file.file, 
-            object_name, 
-            content_type=file.content_type
-        )
+        # Resize into variants and upload to S3: profile_pictures/<user_id>/<image_id>/...
+        image = await image_pipeline.store_image(await file.read(), f"profile_pictures/{current_user.id}", file.filename)
+        url = image.url
         
         # Update User Profile in DB
         result = await db["users"].update_one(
             {"_id": ObjectId(current_user.id)},
-            {"$set": {"profile_image": url}}
+            {"$set": {"profile_image": url, "profile_image_variants": image.variants}}
         )
+        principal_cache.invalidate(email=current_user.email)
+        await crud_blog.author_changed(db, str(current_user.id))
         
         if result.modified_count == 0 and result.matched_count == 0:
              # This should ideally not happen if current_user exists
              pass
 
-        return {"url": url}
+        return {"url": url, **{f"url_{size}": variant for size, variant in image.variants.items()}}
 
+    except InvalidImage as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Upload error: {e}")
         raise HTTPException(status_code=500, detail=f"Could not upload file: {str(e)}")
@@ -4,25 +4,38 @@ from fastapi.encoders import jsonable_encoder
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.api import deps
+from app.api.fields import FieldSelector, FieldSet
 from app.core.config import settings
-from app.models.user import User, UserCreate, UserUpdate, UserRole, ROLE_WEIGHTS
+from app.models.user import User, UserCreate, UserUpdate, UserRole, UserSummary, ROLE_WEIGHTS
 from app.crud import crud_user
 from app.db.mongodb import get_database
 
 router = APIRouter()
 
-@router.get("/", response_model=List[User])
+user_list_fields = FieldSelector(
+    allowed=User.model_fields,
+    default={"id", "email", "full_name", "role", "is_active", "profile_image", "profile_image_variants", "storage_used", "last_active_at"},
+    aliases={"id": "_id"},
+)
+
+@router.get("/", response_model=List[UserSummary], response_model_exclude_unset=True)
 async def read_users(
     db: AsyncIOMotorDatabase = Depends(get_database),
     skip: int = 0,
     limit: int = 100,
+    fields: FieldSet = Depends(user_list_fields),
     current_user: User = Depends(deps.RoleChecker(required_weight=ROLE_WEIGHTS[UserRole.ADMIN])),
 ) -> Any:
     """
     Retrieve users. Admin only.
+    Returns the fields the admin table needs unless `fields` asks for others (`fields=*` for all).
     """
-    users_cursor = db["users"].find().skip(skip).limit(limit)
+    # A projection is always applied so password hashes never leave the database
+    projection = fields.projection or {"hashed_password": 0}
+    users_cursor = db["users"].find({}, projection).skip(skip).limit(limit)
     users = await users_cursor.to_list(length=limit)
+    if fields.is_full:
+        return [User(**u).model_dump(by_alias=True) for u in users]
     return users
 
 @router.post("/", response_model=User)
@@ -198,7 +211,7 @@ async def get_live_users(
     
     cursor = db["users"].find(
         {"last_active_at": {"$gte": threshold}},
-        {"_id": 1, "email": 1, "full_name": 1, "role": 1, "last_active_at": 1, "profile_image": 1}
+        {"_id": 1, "email": 1, "full_name": 1, "role": 1, "last_active_at": 1, "profile_image": 1, "profile_image_variants": 1}
     )
     
     users = await cursor.to_list(length=100)
@@ -211,6 +224,7 @@ async def get_live_users(
         "role": u["role"],
         "last_active": u["last_active_at"],
         "profile_image": u.get("profile_image"),
+        "profile_image_variants": u.get("profile_image_variants"),
         "status": "online"
     } for u in users]
 
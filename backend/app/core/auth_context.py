@@ -0,0 +1,69 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from jose import jwt, JWTError
+from starlette.datastructures import Headers, QueryParams
+from starlette.types import Scope
+
+from app.core.config import settings
+
+SCOPE_KEY = "auth"
+
+# decodes: tokens actually verified; reused: lookups served from the request scope
+auth_stats = {"decodes": 0, "reused": 0}
+
+
+@dataclass
+class AuthContext:
+    """
+    Bearer token of a request, decoded once and shared by everything that needs it.
+    """
+    token: Optional[str] = None
+    payload: dict = field(default_factory=dict)
+    valid: bool = False
+
+    @property
+    def subject(self) -> Optional[str]:
+        return self.payload.get("sub")
+
+    @property
+    def impersonator(self) -> Optional[str]:
+        return self.payload.get("impersonator")
+
+
+def extract_token(scope: Scope) -> Optional[str]:
+    """
+    Bearer token from the Authorization header, or the `token` query
+    parameter for WebSockets (browsers cannot set headers on them).
+    """
+    auth_header = Headers(scope=scope).get("authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_header.split(" ", 1)[1]
+    if scope["type"] == "websocket":
+        return QueryParams(scope.get("query_string", b"")).get("token")
+    return None
+
+
+def decode_token(token: Optional[str]) -> AuthContext:
+    if not token:
+        return AuthContext()
+    auth_stats["decodes"] += 1
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return AuthContext(token=token)
+    return AuthContext(token=token, payload=payload, valid=True)
+
+
+def get_auth_context(scope: Scope) -> AuthContext:
+    """
+    Return the request's AuthContext, decoding the token on first use.
+    """
+    state = scope.setdefault("state", {})
+    context = state.get(SCOPE_KEY)
+    if context is not None:
+        auth_stats["reused"] += 1
+        return context
+    context = decode_token(extract_token(scope))
+    state[SCOPE_KEY] = context
+    return context
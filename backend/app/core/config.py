@@ -12,11 +12,21 @@ class Settings(BaseSettings):
         "https://deephealthlab.com",
     ]
     MONGODB_URL: str
+    MONGODB_APPLY_INDEXES: bool = True  # create/update indexes from app.db.indexes at startup
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 10  # opened eagerly at startup
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = 300000
+    MONGODB_COMPRESSORS: str = "zlib"  # e.g. "zstd,snappy,zlib"; zstd/snappy need zstandard/python-snappy
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_CONNECT_TIMEOUT_MS: int = 10000
+    MONGODB_SOCKET_TIMEOUT_MS: Optional[int] = 30000
+    MONGODB_READ_PREFERENCE: str = "primary"
     SECRET_KEY: str = "changeme_secret_key"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080 # 7 days
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v1/certs"
     
     # Email Settings
     MAIL_USERNAME: str = ""
@@ -39,6 +49,58 @@ class Settings(BaseSettings):
     SPACES_BUCKET_NAME: Optional[str] = None
     SPACES_REGION_NAME: Optional[str] = None
     SPACES_ENDPOINT_URL: Optional[str] = None
+    S3_UPLOAD_WORKERS: int = 16  # threads (and connections) for uploads, shared by all requests
+    S3_UPLOAD_PER_REQUEST: int = 4  # concurrent uploads a single request may run
+
+    # Image derivatives (app.services.image_pipeline)
+    IMAGE_PIPELINE_WORKERS: int = 2  # processes decoding/encoding images
+    IMAGE_WEBP_QUALITY: int = 80
+    IMAGE_MAX_PIXELS: int = 50_000_000  # larger uploads are rejected instead of decoded
+
+    # Principal cache (deps.get_current_user)
+    PRINCIPAL_CACHE_SIZE: int = 2048
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Password hashing (Argon2id, run on a dedicated worker pool)
+    PASSWORD_HASH_WORKERS: int = 4
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+
+    # Audit log writer (batched inserts into activity_logs)
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_LOG_RETENTION_DAYS: int = 365  # 0 keeps entries forever
+    AUDIT_LOG_TIMESERIES: bool = False  # only applies when the collection is first created
+
+    # Cached totals for paginated listings (app.db.pagination.count_cache)
+    COUNT_CACHE_SIZE: int = 1024
+    COUNT_CACHE_TTL_SECONDS: int = 60  # bounds staleness from writes made by other workers
+
+    # Cached public listings (app.core.response_cache); 0 disables
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 300  # bounds staleness from other workers and view counts
+
+    # Browser/CDN caching of public reads (app.api.etag); 0 revalidates every time
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 0
+
+    # Community "hot" feed ranking (crud_community.hot_score)
+    HOT_RANK_DECAY_HOURS: float = 12.5  # lower sinks older posts faster; 10x the points offsets this much age
+    HOT_RANK_COMMENT_WEIGHT: float = 2.0  # a comment counts as this many likes
+
+    # Coalesced like/comment notifications (app.services.engagement_notifications)
+    ENGAGEMENT_NOTIFY_WINDOW_SECONDS: int = 3600  # events on a post within one window share a notification
+    ENGAGEMENT_NOTIFY_FLUSH_SECONDS: float = 10.0  # how long events are buffered before the write
+    ENGAGEMENT_NOTIFY_MAX_PENDING: int = 5000  # buffered (recipient, post, kind) groups before an early flush
+    ENGAGEMENT_NOTIFY_NAMES_SHOWN: int = 3  # latest actor names kept for the message
+    ENGAGEMENT_NOTIFY_IDS_TRACKED: int = 500  # actor ids kept per notification to de-duplicate repeat actors
+
+    # Change-event bus (app.services.change_events); needs a replica set, idle otherwise
+    CHANGE_EVENTS_ENABLED: bool = True
+    CHANGE_EVENTS_CONSUMER: str = "api"  # resume-token key, shared by the API's workers
+    CHANGE_EVENTS_COLLECTIONS: str = ""  # comma-separated; empty watches every collection
+    CHANGE_EVENTS_TOKEN_SAVE_SECONDS: float = 5.0
     model_config = SettingsConfigDict(env_file=".env")
 
 settings = Settings()
@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from app.core.config import settings
+from app.models.user import User
+
+
+class PrincipalCache:
+    """
+    Bounded LRU + TTL cache of authenticated principals, keyed by token subject (email).
+    Saves the `users` lookup that get_current_user would otherwise do on every request.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, User]]" = OrderedDict()
+        self._ids: dict[str, str] = {}  # user_id -> email, for invalidation by id
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, email: str) -> Optional[User]:
+        if self.max_size <= 0:
+            self.misses += 1
+            return None
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                self._drop(email)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return user
+
+    def set(self, email: str, user: User) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[email] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(email)
+            if user.id:
+                self._ids[str(user.id)] = email
+            while len(self._entries) > self.max_size:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._ids.pop(str(evicted.id), None)
+
+    def invalidate(self, email: Optional[str] = None, user_id: Optional[str] = None) -> None:
+        with self._lock:
+            if user_id is not None and email is None:
+                email = self._ids.get(str(user_id))
+            if email is not None:
+                self._drop(email)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._ids.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def _drop(self, email: str) -> None:
+        entry = self._entries.pop(email, None)
+        if entry is not None:
+            self._ids.pop(str(entry[1].id), None)
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
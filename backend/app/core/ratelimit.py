@@ -1,4 +1,68 @@
+"""
+The app's slowapi Limiter, and the slowapi internals RateLimitMiddleware relies on.
+
+slowapi only ships a BaseHTTPMiddleware (SlowAPIMiddleware), so the pure ASGI
+app.middleware.ratelimit reuses its route matching, limit check and header
+injection. Those are private to slowapi and written against 0.1.10, which
+requirements.txt pins. They are only reached through the functions below, and
+checked here at import, so an incompatible upgrade fails at startup instead of
+on every request.
+"""
+from typing import Callable, Iterable, Optional, Tuple
+
 from slowapi import Limiter
+from slowapi.middleware import async_check_limits
 from slowapi.util import get_remote_address
+from starlette.applications import Starlette
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import BaseRoute, Match
+from starlette.types import Scope
 
 limiter = Limiter(key_func=get_remote_address)
+
+_LIMITER_INTERNALS = ("_auto_check", "_check_request_limit", "_exempt_routes", "_route_limits", "_inject_asgi_headers")
+_missing = [name for name in _LIMITER_INTERNALS if not hasattr(limiter, name)]
+if _missing:
+    raise RuntimeError(f"Unsupported slowapi version, Limiter has no {', '.join(_missing)}; install slowapi==0.1.10")
+
+
+def route_handler(routes: Iterable[BaseRoute], scope: Scope) -> Optional[Callable]:
+    """
+    The endpoint of the route that fully matches the request, as slowapi resolves it.
+    """
+    handler = None
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL and hasattr(route, "endpoint"):
+            handler = route.endpoint
+    return handler
+
+
+def is_exempt(limiter: Limiter, handler: Optional[Callable]) -> bool:
+    """
+    True when the default limits don't apply: no route matched, the route is
+    @limiter.exempt, or its own @limiter.limit decorator does the checking.
+    """
+    if handler is None:
+        return True
+    name = f"{handler.__module__}.{handler.__name__}"
+    return name in limiter._exempt_routes or name in limiter._route_limits
+
+
+async def check_limits(
+    limiter: Limiter, request: Request, handler: Callable, app: Starlette
+) -> Tuple[Optional[Response], bool]:
+    """
+    Count the request against the default limits. Returns the 429 response
+    when a limit is exceeded, and whether rate-limit headers should be added.
+    """
+    return await async_check_limits(limiter, request, handler, app)
+
+
+def inject_headers(limiter: Limiter, headers: MutableHeaders, request: Request) -> None:
+    """
+    Add the X-RateLimit-* headers for the limit `request` was checked against.
+    """
+    limiter._inject_asgi_headers(headers, request.state.view_rate_limit)
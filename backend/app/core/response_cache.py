@@ -0,0 +1,131 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+
+class CachedResponse:
+    __slots__ = ("expires_at", "tags", "status", "headers", "body")
+
+    def __init__(self, expires_at: float, tags: tuple[str, ...], status: int, headers: list, body: bytes):
+        self.expires_at = expires_at
+        self.tags = tags
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+
+class ResponseCache:
+    """
+    In-process cache of serialized responses for public GET routes, keyed by
+    path and query string and bounded by total bytes (LRU). Each entry is
+    tagged with the collections it was built from; writes to a collection
+    invalidate its entries, and the TTL bounds staleness from other workers.
+
+    Routes opt in with the `cached` decorator; ResponseCacheMiddleware serves them.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        # Bumped on every invalidation so a response that raced a write is not stored
+        self.version = 0
+        self._lock = Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def cached(self, *tags: str) -> Callable:
+        """
+        Mark a GET endpoint as cacheable. `tags` name the collections its response
+        is built from, so writes to any of them invalidate it.
+        """
+        def decorator(func: Callable) -> Callable:
+            func.__response_cache_tags__ = tags
+            return func
+        return decorator
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        # Misses are counted by set(), once the route is known to be cacheable
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, tags: tuple[str, ...], version: int,
+            status: int, headers: list, body: bytes) -> None:
+        """
+        Store a response built while the cache was at `version`.
+        """
+        self.misses += 1
+        entry = CachedResponse(time.monotonic() + self.ttl_seconds, tags, status, headers, body)
+        # A single response larger than a quarter of the budget would evict too much
+        if entry.size > self.max_bytes // 4:
+            return
+        with self._lock:
+            if self.version != version:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self.bytes += entry.size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            self.version += 1
+            stale = [key for key, entry in self._entries.items() if set(entry.tags) & set(tags)]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,86 @@
+from typing import AsyncIterator, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DESCENDING
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from app.core.config import settings
+from app.db.pagination import Keyset, find_page
+from app.models.activity_log import ActivityLog, ActivityLogFilter
+
+COLLECTION = "activity_logs"
+KEYSET = Keyset(("timestamp", DESCENDING))
+
+
+async def ensure_collection(db: AsyncIOMotorDatabase) -> None:
+    """
+    Prepare activity_logs before indexes are applied (see app.db.indexes).
+    Creates it as a time-series collection when configured, and drops the
+    retention TTL index when retention is turned off.
+    """
+    ttl = settings.AUDIT_LOG_RETENTION_DAYS * 86400
+
+    if settings.AUDIT_LOG_TIMESERIES:
+        options = {"timeseries": {"timeField": "timestamp", "metaField": "user_email", "granularity": "seconds"}}
+        if ttl:
+            options["expireAfterSeconds"] = ttl
+        try:
+            await db.create_collection(COLLECTION, **options)
+        except CollectionInvalid:
+            pass  # already exists
+        return
+
+    if not ttl:
+        try:
+            await db[COLLECTION].drop_index("timestamp_1")
+        except OperationFailure:
+            pass
+
+
+def build_query(filters: ActivityLogFilter) -> dict:
+    query = {}
+    if filters.user_email:
+        query["user_email"] = filters.user_email
+    if filters.impersonator_email:
+        query["is_impersonated"] = True
+        query["impersonator_email"] = filters.impersonator_email
+    if filters.method:
+        query["method"] = filters.method.upper()
+    if filters.status_code is not None:
+        query["status_code"] = filters.status_code
+    if filters.since or filters.until:
+        query["timestamp"] = {}
+        if filters.since:
+            query["timestamp"]["$gte"] = filters.since
+        if filters.until:
+            query["timestamp"]["$lt"] = filters.until
+    return query
+
+
+async def get_page(
+    db: AsyncIOMotorDatabase,
+    filters: ActivityLogFilter,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> Tuple[List[ActivityLog], Optional[str]]:
+    # Keyset: everything strictly after the last (timestamp, _id) seen, newest first
+    docs, next_cursor = await find_page(
+        db[COLLECTION], build_query(filters), KEYSET, cursor=cursor, limit=limit
+    )
+    return [ActivityLog(**d) for d in docs], next_cursor
+
+
+async def iter_entries(
+    db: AsyncIOMotorDatabase,
+    filters: ActivityLogFilter,
+    batch_size: int = 500,
+) -> AsyncIterator[ActivityLog]:
+    """
+    Walk every matching entry, newest first, one keyset page at a time.
+    """
+    cursor = None
+    while True:
+        items, cursor = await get_page(db, filters, cursor=cursor, limit=batch_size)
+        for item in items:
+            yield item
+        if not cursor:
+            return
@@ -1,10 +1,15 @@
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
-from pymongo import ReturnDocument
+from pymongo import ReturnDocument, DESCENDING
 
-from app.models.blog import BlogPost, BlogPostCreate, BlogPostUpdate, BlogPostInDB
+from app.db.pagination import Keyset, paginate
+from app.db.invalidation import invalidate_collection
+
+from app.models.blog import BlogPost, BlogPostCreate, BlogPostUpdate, BlogPostInDB, BlogPostSummary
+
+KEYSET = Keyset(("created_at", DESCENDING))
 
 async def create_blog_post(db: AsyncIOMotorDatabase, post_in: BlogPostCreate, author_id: str) -> BlogPost:
     post_data = post_in.model_dump()
@@ -16,6 +21,7 @@ async def create_blog_post(db: AsyncIOMotorDatabase, post_in: BlogPostCreate, au
         post_data["published_at"] = datetime.utcnow()
     
     result = await db["blog_posts"].insert_one(post_data)
+    await invalidate_collection(db, "blog_posts", post_data["slug"])
     created_post = await db["blog_posts"].find_one({"_id": result.inserted_id})
     return BlogPost(**created_post)
 
@@ -39,12 +45,21 @@ async def get_blog_posts(
     db: AsyncIOMotorDatabase, 
     skip: int = 0, 
     limit: int = 10, 
+    cursor: Optional[str] = None,
     category: Optional[str] = None, 
     tag: Optional[str] = None,
     author_id: Optional[str] = None,
     search: Optional[str] = None,
-    published_only: bool = True
-) -> Tuple[List[BlogPost], int]:
+    published_only: bool = True,
+    projection: Optional[dict] = None,
+    with_total: bool = True
+) -> Tuple[Union[List[BlogPost], List[BlogPostSummary]], Optional[int], Optional[str]]:
+    """
+    With a `projection` only those fields are read from MongoDB and the posts
+    come back as BlogPostSummary; without one, as full BlogPost documents.
+    Also returns the total (None unless `with_total`) and the cursor for the
+    next page (see app.db.pagination).
+    """
     query = {}
     if published_only:
         query["is_published"] = True
@@ -61,11 +76,13 @@ async def get_blog_posts(
             {"tag": {"$regex": search, "$options": "i"}}
         ]
         
-    cursor = db["blog_posts"].find(query).sort("created_at", -1).skip(skip).limit(limit)
-    posts = await cursor.to_list(length=limit)
-    total = await db["blog_posts"].count_documents(query)
+    posts, total, next_cursor = await paginate(
+        db["blog_posts"], query, KEYSET, cursor=cursor, skip=skip, limit=limit,
+        projection=projection, with_total=with_total
+    )
     
-    return [BlogPost(**post) for post in posts], total
+    model = BlogPostSummary if projection is not None else BlogPost
+    return [model(**post) for post in posts], total, next_cursor
 
 async def update_blog_post(
     db: AsyncIOMotorDatabase, 
@@ -98,10 +115,11 @@ async def update_blog_post(
         {"$set": update_data},
         return_document=ReturnDocument.AFTER
     )
-    
-    if updated_post:
-        return BlogPost(**updated_post)
-    return None
+    if not updated_post:
+        return None
+    # A changed slug moves the post, so both URLs get a new validator
+    await invalidate_collection(db, "blog_posts", *{slug, update_data.get("slug", slug)})
+    return BlogPost(**updated_post)
 
 async def increment_views(db: AsyncIOMotorDatabase, slug: str):
     await db["blog_posts"].update_one(
@@ -111,4 +129,17 @@ async def increment_views(db: AsyncIOMotorDatabase, slug: str):
 
 async def delete_blog_post(db: AsyncIOMotorDatabase, slug: str) -> bool:
     result = await db["blog_posts"].delete_one({"slug": slug})
-    return result.deleted_count > 0
+    if result.deleted_count == 0:
+        return False
+    await invalidate_collection(db, "blog_posts", slug)
+    return True
+
+async def author_changed(db: AsyncIOMotorDatabase, user_id: str) -> None:
+    """
+    Listings and post pages embed the author's name and avatar, so a change to
+    those (or the author's removal) has to reach cached responses and ETags.
+    """
+    slugs = await db["blog_posts"].distinct("slug", {"author_id": user_id})
+    if not slugs:
+        return
+    await invalidate_collection(db, "blog_posts", *slugs)
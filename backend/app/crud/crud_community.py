@@ -1,31 +1,113 @@
+import asyncio
 from typing import List, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, ReplaceOne, ReturnDocument
+from app.core.config import settings
+from app.db.pagination import Keyset, count, count_cache, find_page, next_cursor, page_query
 from app.models.community import CommunityPost, CommunityPostCreate, Comment
 from app.models.user import User
 
+KEYSETS = {
+    "latest": Keyset(("created_at", DESCENDING)),
+    "popular": Keyset(("likes_count", DESCENDING), ("created_at", DESCENDING)),
+    "hot": Keyset(("hot_score", DESCENDING), ("created_at", DESCENDING)),
+}
+
+# Scores count time from here; any fixed instant works, a recent one keeps them small
+HOT_RANK_EPOCH = datetime(2024, 1, 1)
+
+def hot_score() -> dict:
+    """
+    Aggregation expression for a post's rank,
+    log10(max(likes + w * comments, 1)) + (created_at - epoch) / decay.
+    Age enters only through created_at, so a score never changes unless the
+    post's engagement does: posts rescored on engagement and posts untouched
+    for days stay comparable, a like always raises a score, and no periodic
+    sweep is needed for decay. A post needs ten times the points to rank with
+    one HOT_RANK_DECAY_HOURS newer.
+    """
+    points = {"$add": [
+        {"$ifNull": ["$likes_count", 0]},
+        {"$multiply": [settings.HOT_RANK_COMMENT_WEIGHT, {"$ifNull": ["$comments_count", 0]}]},
+    ]}
+    # Date minus date is milliseconds
+    age_term = {"$divide": [
+        {"$subtract": [{"$ifNull": ["$created_at", "$$NOW"]}, HOT_RANK_EPOCH]},
+        settings.HOT_RANK_DECAY_HOURS * 3600 * 1000,
+    ]}
+    return {"$add": [{"$log10": {"$max": [points, 1]}}, age_term]}
+
+def initial_hot_score(created_at: datetime) -> float:
+    """
+    hot_score() of a post with no engagement yet, for inserts.
+    """
+    return (created_at - HOT_RANK_EPOCH).total_seconds() / (settings.HOT_RANK_DECAY_HOURS * 3600)
+
+async def recompute_hot_scores(db: AsyncIOMotorDatabase) -> int:
+    """
+    Rescore every post, e.g. after changing HOT_RANK_DECAY_HOURS or
+    HOT_RANK_COMMENT_WEIGHT. Returns the number of posts changed.
+    """
+    result = await db["community_posts"].update_many({}, [{"$set": {"hot_score": hot_score()}}])
+    return result.modified_count
+
+# Comments are documents of their own, keyed to the post by post_id. Replies also
+# carry root_id, the top-level comment of their thread, so a page of threads is
+# two indexed queries however deep the replies nest.
+COMMENTS_COLLECTION = "community_comments"
+COMMENT_KEYSET = Keyset(("created_at", DESCENDING))
+# Replies of a thread, oldest first; a page of threads carries the first few of each
+REPLY_KEYSET = Keyset(("created_at", ASCENDING))
+REPLIES_PER_THREAD = 5
+
+
+class ParentCommentNotFound(ValueError):
+    """parent_id does not name a comment on the same post."""
+
 async def create_post(db: AsyncIOMotorDatabase, post: CommunityPostCreate, author_id: str) -> CommunityPost:
     post_data = post.model_dump()
     post_data["author_id"] = author_id
     post_data["created_at"] = datetime.utcnow()
     post_data["likes"] = []
     post_data["dislikes"] = []
-    post_data["comments"] = []
+    post_data["likes_count"] = 0
+    post_data["dislikes_count"] = 0
+    post_data["comments_count"] = 0
+    post_data["hot_score"] = initial_hot_score(post_data["created_at"])
     
     result = await db["community_posts"].insert_one(post_data)
+    count_cache.invalidate("community_posts")
     # created_post = await db["community_posts"].find_one({"_id": result.inserted_id})
     # return CommunityPost(**created_post)
     return await get_post_with_author(db, str(result.inserted_id))
 
+async def attach_images(db: AsyncIOMotorDatabase, post_id: str, urls: List[str], variants: List[dict]) -> bool:
+    """
+    Append images (and their size variants, index-aligned) uploaded after the post was created.
+    """
+    if not urls:
+        return False
+    result = await db["community_posts"].update_one(
+        {"_id": ObjectId(post_id)},
+        {"$push": {"images": {"$each": urls}, "image_variants": {"$each": variants}}},
+    )
+    return result.modified_count > 0
+
 async def get_posts_with_authors(
     db: AsyncIOMotorDatabase, 
     skip: int = 0, 
     limit: int = 10,
     sort_by: str = "latest", # latest, popular
-    author_id: Optional[str] = None # For "My Posts"
-) -> Tuple[List[dict], int]:
+    author_id: Optional[str] = None, # For "My Posts"
+    cursor: Optional[str] = None,
+    with_total: bool = True,
+    viewer_id: Optional[str] = None # liked/disliked are this user's reactions
+) -> Tuple[List[dict], Optional[int], Optional[str]]:
     
     pipeline = []
+    keyset = KEYSETS[sort_by]
     
     # Filtering
     match_stage = {}
@@ -35,20 +117,12 @@ async def get_posts_with_authors(
     if match_stage:
         pipeline.append({"$match": match_stage})
 
-    # Sorting
-    if sort_by == "popular":
-        # Sort by length of likes array
-        pipeline.append({
-            "$addFields": {
-                "likes_count": {"$size": "$likes"}
-            }
-        })
-        pipeline.append({"$sort": {"likes_count": -1, "created_at": -1}})
-    else:
-        pipeline.append({"$sort": {"created_at": -1}})
-
-    # Pagination
-    pipeline.append({"$skip": skip})
+    # Pagination: continue after the cursor when given, otherwise page by skip
+    if cursor:
+        pipeline.append({"$match": page_query({}, keyset, cursor)})
+    pipeline.append({"$sort": dict(keyset.sort)})
+    if skip and not cursor:
+        pipeline.append({"$skip": skip})
     pipeline.append({"$limit": limit})
 
     # Joins
@@ -71,145 +145,311 @@ async def get_posts_with_authors(
             "preserveNullAndEmptyArrays": True
         }
     })
-    pipeline.append({
-        "$addFields": {
-            "comments_count": {"$size": "$comments"}
-        }
-    })
-    
     pipeline.append({
         "$project": {
             "_id": 1,
             "content": 1,
             "author_id": 1,
             "created_at": 1,
-            "likes": 1,
-            "dislikes": 1,
+            # Counts and the viewer's own reaction instead of the user_id arrays
+            "likes_count": 1,
+            "dislikes_count": 1,
+            "liked": {"$in": [viewer_id, {"$ifNull": ["$likes", []]}]},
+            "disliked": {"$in": [viewer_id, {"$ifNull": ["$dislikes", []]}]},
             "comments_count": 1,
+            "hot_score": 1,
             "images": 1,
+            "image_variants": 1,
             "author_name": "$author_info.full_name",
             "author_email": "$author_info.email"
         }
     })
     
-    posts = await db["community_posts"].aggregate(pipeline).to_list(length=limit)
+    page = db["community_posts"].aggregate(pipeline).to_list(length=limit)
     
-    # Count total for this filter
-    total_query = {}
-    if author_id:
-        total_query["author_id"] = author_id
-    total = await db["community_posts"].count_documents(total_query)
+    # Count total for this filter, concurrently with the page
+    if with_total:
+        posts, total = await asyncio.gather(page, count(db["community_posts"], match_stage))
+    else:
+        posts, total = await page, None
+    cursor_out = next_cursor(posts, keyset, limit)
     
     # Convert _id to string
     for p in posts:
         p["_id"] = str(p["_id"])
         
-    return posts, total
+    return posts, total, cursor_out
 
-from app.crud import crud_notification
-from app.models.notification import NotificationCreate, NotificationType
+from app.services.engagement_notifications import engagement_notifications
 
-async def toggle_like(db: AsyncIOMotorDatabase, post_id: str, user_id: str, user_name: str = "Someone") -> Optional[dict]:
+REACTIONS = {"like": ("likes", "dislikes"), "dislike": ("dislikes", "likes")}
+
+def _reaction_update(user_id: str, field: str, opposite: str) -> list:
+    """
+    Pipeline update that toggles `user_id` in `field` and takes it out of
+    `opposite`, then recomputes both counters and the hot score, all in one
+    atomic write.
+    """
+    current = {"$ifNull": [f"${field}", []]}
+    had = {"$in": [user_id, current]}
+
+    def without(array: str) -> dict:
+        return {"$filter": {"input": {"$ifNull": [array, []]}, "cond": {"$ne": ["$$this", user_id]}}}
+
+    return [
+        {"$set": {
+            field: {"$cond": [had, without(f"${field}"), {"$concatArrays": [current, [user_id]]}]},
+            opposite: without(f"${opposite}"),
+        }},
+        {"$set": {
+            "likes_count": {"$size": "$likes"},
+            "dislikes_count": {"$size": "$dislikes"},
+        }},
+        {"$set": {"hot_score": hot_score()}},
+    ]
+
+async def toggle_reaction(db: AsyncIOMotorDatabase, post_id: str, user_id: str, reaction: str) -> Optional[dict]:
+    """
+    Toggle the caller's like or dislike in a single round trip. Returns the
+    post's new counts and the caller's state, or None when the post doesn't exist.
+    """
     try:
         oid = ObjectId(post_id)
     except:
         return None
-        
-    post = await db["community_posts"].find_one({"_id": oid})
-    if not post:
-        return None
-        
-    keyword = "$addToSet"
-    if user_id in post.get("likes", []):
-        keyword = "$pull" # Check if already liked, then unlike
-    
-    # If liking, remove dislike
-    if keyword == "$addToSet":
-        await db["community_posts"].update_one({"_id": oid}, {"$pull": {"dislikes": user_id}})
-        
-        # Create Notification (if not liking own post)
-        if post["author_id"] != user_id:
-            notification = NotificationCreate(
-                user_id=post["author_id"],
-                title="New Like",
-                message=f"{user_name} liked your post.",
-                type=NotificationType.SUCCESS,
-                action_label="View Post",
-                action_url=f"/dashboard/community" # Could be deep link if implemented
-            )
-            await crud_notification.create_notification(db, notification)
 
-    await db["community_posts"].update_one(
-        {"_id": oid}, 
-        {keyword: {"likes": user_id}}
+    field, opposite = REACTIONS[reaction]
+    post = await db["community_posts"].find_one_and_update(
+        {"_id": oid},
+        _reaction_update(user_id, field, opposite),
+        projection={
+            "author_id": 1,
+            "likes_count": 1,
+            "dislikes_count": 1,
+            "liked": {"$in": [user_id, "$likes"]},
+            "disliked": {"$in": [user_id, "$dislikes"]},
+        },
+        return_document=ReturnDocument.AFTER,
     )
-    
-    return await get_post_with_author(db, post_id)
-
-async def toggle_dislike(db: AsyncIOMotorDatabase, post_id: str, user_id: str) -> Optional[dict]:
-    try:
-        oid = ObjectId(post_id)
-    except:
+    if post is None:
         return None
+    post["_id"] = str(post["_id"])
+    return post
 
-    post = await db["community_posts"].find_one({"_id": oid})
-    if not post:
+async def toggle_like(db: AsyncIOMotorDatabase, post_id: str, user_id: str, user_name: str = "Someone") -> Optional[dict]:
+    post = await toggle_reaction(db, post_id, user_id, "like")
+    if post is None:
         return None
 
-    keyword = "$addToSet"
-    if user_id in post.get("dislikes", []):
-        keyword = "$pull"
+    # Coalesced per post into one "N people liked your post" notification
+    if post["liked"]:
+        engagement_notifications.record(post["author_id"], post_id, "like", user_id, user_name)
 
-    # If disliking, remove like
-    if keyword == "$addToSet":
-        await db["community_posts"].update_one({"_id": oid}, {"$pull": {"likes": user_id}})
-        
-    await db["community_posts"].update_one(
-        {"_id": oid},
-        {keyword: {"dislikes": user_id}}
-    )
+    return post
 
-    return await get_post_with_author(db, post_id)
+async def toggle_dislike(db: AsyncIOMotorDatabase, post_id: str, user_id: str) -> Optional[dict]:
+    return await toggle_reaction(db, post_id, user_id, "dislike")
+
+async def backfill_reaction_counts(db: AsyncIOMotorDatabase) -> int:
+    """
+    (Re)compute likes_count/dislikes_count from the arrays on every post.
+    Returns the number of posts changed.
+    """
+    result = await db["community_posts"].update_many({}, [
+        {"$set": {
+            "likes_count": {"$size": {"$ifNull": ["$likes", []]}},
+            "dislikes_count": {"$size": {"$ifNull": ["$dislikes", []]}},
+        }},
+    ])
+    return result.modified_count
 
 async def add_comment(db: AsyncIOMotorDatabase, post_id: str, content: str, user: User, parent_id: Optional[str] = None) -> Optional[dict]:
+    """
+    Store a comment (or a reply to `parent_id`) and bump the post's comments_count.
+    Returns the new comment, None when the post doesn't exist, and raises
+    ParentCommentNotFound for a reply to a comment that isn't on this post.
+    """
     try:
         oid = ObjectId(post_id)
     except:
         return None
     
     # Get post to notify author
-    post = await db["community_posts"].find_one({"_id": oid})
+    post = await db["community_posts"].find_one({"_id": oid}, {"author_id": 1})
     if not post:
         return None
 
+    root_id = None
+    if parent_id:
+        parent = None
+        if ObjectId.is_valid(parent_id):
+            parent = await db[COMMENTS_COLLECTION].find_one(
+                {"_id": ObjectId(parent_id), "post_id": post_id}, {"root_id": 1}
+            )
+        if not parent:
+            raise ParentCommentNotFound(parent_id)
+        root_id = parent.get("root_id") or parent_id
+
     comment = Comment(
         content=content,
         author_id=str(user.id),
         author_name=user.full_name or user.email,
         parent_id=parent_id
     )
+    doc = comment_document(comment.model_dump(), post_id, root_id)
+    await db[COMMENTS_COLLECTION].insert_one(doc)
+    await db["community_posts"].update_one({"_id": oid}, [
+        {"$set": {"comments_count": {"$add": [{"$ifNull": ["$comments_count", 0]}, 1]}}},
+        {"$set": {"hot_score": hot_score()}},
+    ])
     
-    result = await db["community_posts"].update_one(
-        {"_id": oid},
-        {"$push": {"comments": comment.model_dump()}}
+    engagement_notifications.record(post["author_id"], post_id, "comment", str(user.id), user.full_name or "Someone")
+
+    return comment.model_dump()
+
+def comment_document(comment: dict, post_id: str, root_id: Optional[str]) -> dict:
+    """
+    Storage shape of a Comment: `id` becomes the ObjectId `_id`.
+    """
+    doc = {k: v for k, v in comment.items() if k != "id"}
+    doc["_id"] = ObjectId(comment["id"]) if ObjectId.is_valid(comment.get("id")) else ObjectId()
+    doc["post_id"] = post_id
+    doc["root_id"] = root_id
+    return doc
+
+def _comment_out(doc: dict) -> dict:
+    return {
+        "id": str(doc["_id"]),
+        "content": doc["content"],
+        "author_id": doc["author_id"],
+        "author_name": doc["author_name"],
+        "created_at": doc["created_at"],
+        "parent_id": doc.get("parent_id"),
+        "replies": [],
+    }
+
+def build_threads(roots: List[dict], replies: List[dict]) -> List[dict]:
+    """
+    Nest `replies` (oldest first) under their parents in one pass over each list.
+    A reply whose parent is gone hangs off its thread's top-level comment.
+    """
+    nodes = {}
+    threads = []
+    for doc in roots:
+        node = nodes[str(doc["_id"])] = _comment_out(doc)
+        threads.append(node)
+    reply_nodes = [(doc, _comment_out(doc)) for doc in replies]
+    for doc, node in reply_nodes:
+        nodes[node["id"]] = node
+    for doc, node in reply_nodes:
+        parent = nodes.get(doc.get("parent_id")) or nodes.get(doc.get("root_id"))
+        if parent is not None:
+            parent["replies"].append(node)
+    return threads
+
+async def get_comment_page(
+    db: AsyncIOMotorDatabase,
+    post_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    replies_per_thread: int = REPLIES_PER_THREAD,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    One page of top-level comments, newest first. Each carries the first
+    `replies_per_thread` replies of its thread nested (oldest first), the
+    thread's replies_count, and replies_cursor for get_reply_page when there
+    are more. Raises InvalidCursor for a malformed cursor.
+    """
+    roots, cursor_out = await find_page(
+        db[COMMENTS_COLLECTION], {"post_id": post_id, "parent_id": None}, COMMENT_KEYSET, cursor, limit=limit
     )
-    
-    if result.matched_count == 0:
+    if not roots:
+        return [], cursor_out
+    root_ids = [str(doc["_id"]) for doc in roots]
+    counts, *first_replies = await asyncio.gather(
+        db[COMMENTS_COLLECTION].aggregate([
+            {"$match": {"root_id": {"$in": root_ids}}},
+            {"$group": {"_id": "$root_id", "n": {"$sum": 1}}},
+        ]).to_list(length=None),
+        *(
+            find_page(db[COMMENTS_COLLECTION], {"root_id": root_id}, REPLY_KEYSET, limit=replies_per_thread)
+            for root_id in root_ids
+        ),
+    )
+    counts = {c["_id"]: c["n"] for c in counts}
+    threads = build_threads(roots, [doc for docs, _ in first_replies for doc in docs])
+    for thread, (_, replies_cursor) in zip(threads, first_replies):
+        thread["replies_count"] = counts.get(thread["id"], 0)
+        thread["replies_cursor"] = replies_cursor if thread["replies_count"] > replies_per_thread else None
+    return threads, cursor_out
+
+async def get_reply_page(
+    db: AsyncIOMotorDatabase,
+    post_id: str,
+    comment_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> Optional[Tuple[List[dict], Optional[str]]]:
+    """
+    The next replies of the thread under top-level comment `comment_id`,
+    oldest first and flat (each names its parent_id). None when there is no
+    such comment on the post. Raises InvalidCursor for a malformed cursor.
+    """
+    if not ObjectId.is_valid(comment_id) or not await db[COMMENTS_COLLECTION].find_one(
+        {"_id": ObjectId(comment_id), "post_id": post_id, "parent_id": None}, {"_id": 1}
+    ):
         return None
-    
-    # Create Notification for Post Author (if not own post)
-    if post["author_id"] != str(user.id):
-        notification = NotificationCreate(
-            user_id=post["author_id"],
-            title="New Comment",
-            message=f"{user.full_name or 'Someone'} commented on your post.",
-            type=NotificationType.INFO,
-            action_label="View Comment",
-            action_url=f"/dashboard/community"
-        )
-        await crud_notification.create_notification(db, notification)
+    replies, cursor_out = await find_page(
+        db[COMMENTS_COLLECTION], {"root_id": comment_id}, REPLY_KEYSET, cursor, limit=limit
+    )
+    return [{k: v for k, v in _comment_out(doc).items() if k != "replies"} for doc in replies], cursor_out
 
-    return await get_post_with_author(db, post_id)
+async def post_exists(db: AsyncIOMotorDatabase, post_id: str) -> bool:
+    return ObjectId.is_valid(post_id) and await db["community_posts"].find_one(
+        {"_id": ObjectId(post_id)}, {"_id": 1}
+    ) is not None
+
+async def migrate_embedded_comments(db: AsyncIOMotorDatabase, batch_size: int = 100) -> Tuple[int, int]:
+    """
+    Move comments embedded in community_posts.comments into community_comments,
+    keeping their ids so parent_id links still resolve, then set comments_count
+    and drop the array. Safe to re-run. Returns (posts, comments) migrated.
+    """
+    posts = 0
+    moved = 0
+    cursor = db["community_posts"].find({"comments": {"$exists": True}}, {"comments": 1}).batch_size(batch_size)
+    async for post in cursor:
+        post_id = str(post["_id"])
+        comments = [c for c in post.get("comments") or [] if c.get("id")]
+        parents = {c["id"]: c.get("parent_id") for c in comments}
+        # Replies to comments that no longer exist were shown as top-level; keep them there
+        for c in comments:
+            if c.get("parent_id") not in parents:
+                c["parent_id"] = parents[c["id"]] = None
+
+        def root_of(comment_id: str) -> Optional[str]:
+            seen = set()
+            root = None
+            parent = parents.get(comment_id)
+            while parent and parent in parents and parent not in seen:
+                seen.add(parent)
+                root, parent = parent, parents[parent]
+            return root
+
+        ops = [
+            ReplaceOne({"_id": doc["_id"]}, doc, upsert=True)
+            for doc in (comment_document(c, post_id, root_of(c["id"])) for c in comments)
+        ]
+        if ops:
+            await db[COMMENTS_COLLECTION].bulk_write(ops, ordered=False)
+        total = await db[COMMENTS_COLLECTION].count_documents({"post_id": post_id})
+        await db["community_posts"].update_one(
+            {"_id": post["_id"]},
+            {"$set": {"comments_count": total}, "$unset": {"comments": ""}},
+        )
+        posts += 1
+        moved += len(ops)
+    return posts, moved
 
 async def get_post_with_author(db: AsyncIOMotorDatabase, post_id: str) -> Optional[dict]:
     try:
@@ -245,9 +485,12 @@ async def get_post_with_author(db: AsyncIOMotorDatabase, post_id: str) -> Option
                 "author_id": 1,
                 "created_at": 1,
                 "likes": 1,
+                "likes_count": 1,
                 "dislikes": 1,
-                "comments": 1,
+                "dislikes_count": 1,
+                "comments_count": 1,
                 "images": 1,
+                "image_variants": 1,
                 "author_name": "$author_info.full_name",
                 "author_email": "$author_info.email"
             }
@@ -257,8 +500,6 @@ async def get_post_with_author(db: AsyncIOMotorDatabase, post_id: str) -> Option
     posts = await db["community_posts"].aggregate(pipeline).to_list(length=1)
     if posts:
         posts[0]["_id"] = str(posts[0]["_id"])
-        # Ensure comments_count is present even for single post
-        posts[0]["comments_count"] = len(posts[0].get("comments", []))
         return posts[0]
     return None
 
@@ -1,11 +1,20 @@
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import TypeAdapter
 from bson import ObjectId
+from pymongo import DESCENDING
+from app.db.pagination import Keyset, paginate
+from app.db.invalidation import invalidate_collection
 from app.models.job import Job, JobCreate, JobUpdate
 
+KEYSET = Keyset(("created_at", DESCENDING))
+# Listings validate a whole page in one pass
+JOB_LIST = TypeAdapter(List[Job])
+
 async def create_job(db: AsyncIOMotorDatabase, job: JobCreate) -> Job:
     job_data = job.model_dump()
     result = await db["jobs"].insert_one(job_data)
+    await invalidate_collection(db, "jobs")
     created_job = await db["jobs"].find_one({"_id": result.inserted_id})
     return Job(**created_job)
 
@@ -23,9 +32,11 @@ async def get_multi(
     db: AsyncIOMotorDatabase, 
     skip: int = 0, 
     limit: int = 100,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
     search_query: str = "",
     active_only: bool = False
-) -> tuple[List[Job], int]:
+) -> tuple[List[Job], Optional[int], Optional[str]]:
     query = {}
     
     if search_query:
@@ -34,11 +45,10 @@ async def get_multi(
     if active_only:
         query["is_active"] = True
         
-    cursor = db["jobs"].find(query).sort("created_at", -1).skip(skip).limit(limit)
-    total_count = await db["jobs"].count_documents(query)
-    
-    jobs_list = await cursor.to_list(length=limit)
-    return [Job(**j) for j in jobs_list], total_count
+    jobs_list, total_count, next_cursor = await paginate(
+        db["jobs"], query, KEYSET, cursor=cursor, skip=skip, limit=limit, with_total=with_total
+    )
+    return JOB_LIST.validate_python(jobs_list), total_count, next_cursor
 
 async def update_job(db: AsyncIOMotorDatabase, job_id: str, job_in: JobUpdate) -> Optional[Job]:
     try:
@@ -52,9 +62,9 @@ async def update_job(db: AsyncIOMotorDatabase, job_id: str, job_in: JobUpdate) -
         {"_id": oid},
         {"$set": update_data}
     )
-    
-    if result.modified_count == 0 and result.matched_count == 0:
+    if result.matched_count == 0:
         return None
+    await invalidate_collection(db, "jobs")
         
     updated_job = await db["jobs"].find_one({"_id": oid})
     return Job(**updated_job)
@@ -65,4 +75,7 @@ async def delete_job(db: AsyncIOMotorDatabase, job_id: str) -> bool:
     except:
         return False
     result = await db["jobs"].delete_one({"_id": oid})
-    return result.deleted_count > 0
+    if result.deleted_count == 0:
+        return False
+    await invalidate_collection(db, "jobs")
+    return True
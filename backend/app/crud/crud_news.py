@@ -1,11 +1,20 @@
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import TypeAdapter
 from bson import ObjectId
+from pymongo import DESCENDING
+from app.db.pagination import Keyset, paginate
+from app.db.invalidation import invalidate_collection
 from app.models.news import News, NewsCreate
 
+KEYSET = Keyset(("date", DESCENDING))
+# Listings validate a whole page in one pass
+NEWS_LIST = TypeAdapter(List[News])
+
 async def create_news(db: AsyncIOMotorDatabase, news: NewsCreate) -> News:
     news_dict = news.model_dump()
     result = await db["news"].insert_one(news_dict)
+    await invalidate_collection(db, "news")
     created_news = await db["news"].find_one({"_id": result.inserted_id})
     return News(**created_news)
 
@@ -13,18 +22,19 @@ async def get_multi(
     db: AsyncIOMotorDatabase, 
     skip: int = 0, 
     limit: int = 100,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
     search_query: str = ""
-) -> tuple[List[News], int]:
+) -> tuple[List[News], Optional[int], Optional[str]]:
     query = {"is_published": True}
     
     if search_query:
         query["title"] = {"$regex": search_query, "$options": "i"}
         
-    cursor = db["news"].find(query).sort("date", -1).skip(skip).limit(limit)
-    total_count = await db["news"].count_documents(query)
-    
-    news_list = await cursor.to_list(length=limit)
-    return [News(**n) for n in news_list], total_count
+    news_list, total_count, next_cursor = await paginate(
+        db["news"], query, KEYSET, cursor=cursor, skip=skip, limit=limit, with_total=with_total
+    )
+    return NEWS_LIST.validate_python(news_list), total_count, next_cursor
 
 async def update_news(db: AsyncIOMotorDatabase, news_id: str, news_in: NewsCreate) -> Optional[News]:
     try:
@@ -38,9 +48,9 @@ async def update_news(db: AsyncIOMotorDatabase, news_id: str, news_in: NewsCreat
         {"_id": oid},
         {"$set": update_data}
     )
-    
-    if result.modified_count == 0 and result.matched_count == 0:
+    if result.matched_count == 0:
         return None
+    await invalidate_collection(db, "news")
         
     updated_news = await db["news"].find_one({"_id": oid})
     return News(**updated_news)
@@ -51,4 +61,7 @@ async def delete_news(db: AsyncIOMotorDatabase, news_id: str) -> bool:
     except:
         return False
     result = await db["news"].delete_one({"_id": oid})
-    return result.deleted_count > 0
+    if result.deleted_count == 0:
+        return False
+    await invalidate_collection(db, "news")
+    return True
@@ -1,27 +1,108 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
-from app.models.notification import Notification, NotificationCreate, NotificationUpdate
+from pymongo import DESCENDING, UpdateOne
+from app.db.pagination import Keyset, find_page
+from app.models.notification import Notification, NotificationCreate, NotificationUpdate, NotificationType
+
+KEYSET = Keyset(("created_at", DESCENDING))
+
+# Coalesced engagement notifications: kind -> (verb, title, type, action label)
+ENGAGEMENT_KINDS = {
+    "like": ("liked your post", "New Like", NotificationType.SUCCESS, "View Post"),
+    "comment": ("commented on your post", "New Comment", NotificationType.INFO, "View Comment"),
+}
 
 async def create_notification(db: AsyncIOMotorDatabase, notification: NotificationCreate) -> Notification:
     notification_dict = notification.model_dump()
     notification_dict["created_at"] = datetime.utcnow()
     
-    result = await db["notifications"].insert_one(notification_dict)
-    
-    created_notification = await db["notifications"].find_one({"_id": result.inserted_id})
-    return Notification(**created_notification)
+    # insert_one sets _id on the dict; nothing to read back
+    await db["notifications"].insert_one(notification_dict)
+    return Notification(**notification_dict)
+
+def engagement_upsert(
+    user_id: str,
+    post_id: str,
+    kind: str,
+    actors: Dict[str, str],
+    window: int,
+    at: datetime,
+    names_shown: int,
+    ids_tracked: int,
+) -> UpdateOne:
+    """
+    Upsert of the `kind` notification for `post_id` in time bucket `window`,
+    folding in `actors` (actor id -> name, oldest first). actor_count grows by
+    the actors not already in actor_ids, so a like/unlike/like counts once;
+    actor_ids keeps the latest `ids_tracked` (past that, a returning actor
+    can be counted again) and `actors` the latest `names_shown` {id, name}.
+    Each write marks it unread and moves it to the top of the inbox.
+    """
+    _, title, type_, action_label = ENGAGEMENT_KINDS[kind]
+    ids = list(actors)
+    entries = [{"id": actor_id, "name": name} for actor_id, name in actors.items()]
+
+    def without_new(array: str, id_of: str) -> dict:
+        return {"$filter": {"input": {"$ifNull": [array, []]}, "cond": {"$not": {"$in": [id_of, ids]}}}}
+
+    return UpdateOne(
+        {"user_id": user_id, "group_key": f"{kind}:{post_id}", "window": window},
+        [
+            # One stage: every expression below reads the document as it was before the write
+            {"$set": {
+                "actor_count": {"$add": [{"$ifNull": ["$actor_count", 0]}, {"$size": {"$filter": {
+                    "input": ids, "cond": {"$not": {"$in": ["$$this", {"$ifNull": ["$actor_ids", []]}]}},
+                }}}]},
+                "actor_ids": {"$slice": [{"$concatArrays": [without_new("$actor_ids", "$$this"), ids]}, -ids_tracked]},
+                "actors": {"$slice": [{"$concatArrays": [without_new("$actors", "$$this.id"), entries]}, -names_shown]},
+                "kind": kind,
+                "post_id": post_id,
+                "title": title,
+                "type": type_.value,
+                "action_label": action_label,
+                "action_url": "/dashboard/community",
+                "is_read": False,
+                "created_at": at,
+            }},
+        ],
+        upsert=True,
+    )
+
+def engagement_message(notification: dict) -> dict:
+    """
+    Fill in title and message of a coalesced notification from its actors:
+    "Ana liked your post.", "Ana, Bo and 3 others liked your post."
+    """
+    kind = notification.get("kind")
+    if kind not in ENGAGEMENT_KINDS:
+        return notification
+    verb, title, _, _ = ENGAGEMENT_KINDS[kind]
+    names = [actor["name"] for actor in reversed(notification.get("actors") or [])] or ["Someone"]
+    count = max(notification.get("actor_count") or 1, len(names))
+    others = count - len(names)
+    if others:
+        who = f"{', '.join(names)} and {others} {'other' if others == 1 else 'others'}"
+    elif len(names) > 1:
+        who = f"{', '.join(names[:-1])} and {names[-1]}"
+    else:
+        who = names[0]
+    notification["message"] = f"{who} {verb}."
+    notification["title"] = title if count == 1 else f"{title}s"
+    return notification
 
 async def get_notifications_by_user(
     db: AsyncIOMotorDatabase, 
     user_id: str, 
     skip: int = 0, 
-    limit: int = 100
-) -> List[Notification]:
-    cursor = db["notifications"].find({"user_id": user_id}).sort("created_at", -1).skip(skip).limit(limit)
-    notifications = await cursor.to_list(length=limit)
-    return [Notification(**n) for n in notifications]
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[Notification], Optional[str]]:
+    notifications, next_cursor = await find_page(
+        db["notifications"], {"user_id": user_id}, KEYSET, cursor=cursor, skip=skip, limit=limit
+    )
+    return [Notification(**engagement_message(n)) for n in notifications], next_cursor
 
 async def mark_notification_read(db: AsyncIOMotorDatabase, notification_id: str, user_id: str) -> Optional[Notification]:
     try:
@@ -36,7 +117,7 @@ async def mark_notification_read(db: AsyncIOMotorDatabase, notification_id: str,
     )
     
     if result:
-        return Notification(**result)
+        return Notification(**engagement_message(result))
     return None
 
 async def mark_all_notifications_read(db: AsyncIOMotorDatabase, user_id: str) -> bool:
@@ -1,11 +1,20 @@
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import TypeAdapter
 from bson import ObjectId
+from pymongo import DESCENDING
+from app.db.pagination import Keyset, paginate
+from app.db.invalidation import invalidate_collection
 from app.models.publication import Publication, PublicationCreate, PublicationUpdate
 
+KEYSET = Keyset(("date", DESCENDING))
+# Listings validate a whole page in one pass
+PUBLICATION_LIST = TypeAdapter(List[Publication])
+
 async def create_publication(db: AsyncIOMotorDatabase, publication: PublicationCreate) -> Publication:
     pub_data = publication.model_dump()
     result = await db["publications"].insert_one(pub_data)
+    await invalidate_collection(db, "publications")
     created_pub = await db["publications"].find_one({"_id": result.inserted_id})
     return Publication(**created_pub)
 
@@ -23,18 +32,19 @@ async def get_multi(
     db: AsyncIOMotorDatabase, 
     skip: int = 0, 
     limit: int = 100,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
     search_query: str = ""
-) -> tuple[List[Publication], int]:
+) -> tuple[List[Publication], Optional[int], Optional[str]]:
     query = {}
     
     if search_query:
         query["title"] = {"$regex": search_query, "$options": "i"}
         
-    cursor = db["publications"].find(query).sort("date", -1).skip(skip).limit(limit)
-    total_count = await db["publications"].count_documents(query)
-    
-    pubs_list = await cursor.to_list(length=limit)
-    return [Publication(**p) for p in pubs_list], total_count
+    pubs_list, total_count, next_cursor = await paginate(
+        db["publications"], query, KEYSET, cursor=cursor, skip=skip, limit=limit, with_total=with_total
+    )
+    return PUBLICATION_LIST.validate_python(pubs_list), total_count, next_cursor
 
 async def update_publication(db: AsyncIOMotorDatabase, pub_id: str, pub_in: PublicationUpdate) -> Optional[Publication]:
     try:
@@ -48,9 +58,10 @@ async def update_publication(db: AsyncIOMotorDatabase, pub_id: str, pub_in: Publ
         {"_id": oid},
         {"$set": update_data}
     )
-    
-    if result.modified_count == 0 and result.matched_count == 0:
+    if result.matched_count == 0:
         return None
+    # title feeds the listing search filter
+    await invalidate_collection(db, "publications")
         
     updated_pub = await db["publications"].find_one({"_id": oid})
     return Publication(**updated_pub)
@@ -61,4 +72,7 @@ async def delete_publication(db: AsyncIOMotorDatabase, pub_id: str) -> bool:
     except:
         return False
     result = await db["publications"].delete_one({"_id": oid})
-    return result.deleted_count > 0
+    if result.deleted_count == 0:
+        return False
+    await invalidate_collection(db, "publications")
+    return True
@@ -0,0 +1,225 @@
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DESCENDING
+
+from app.db.user_loader import USER_PROJECTION
+from app.services.image_pipeline import AVATAR_SIZE, variant_url
+from app.models.research_group import LastMessage
+
+COLLECTION = "research_groups"
+MESSAGES_COLLECTION = "chat_messages"
+LAST_MESSAGE_PREVIEW_LENGTH = 200
+
+
+def member_query(user_id: str) -> dict:
+    # Groups a user sees: the ones they belong to or created
+    return {"$or": [{"members.user_id": user_id}, {"created_by": user_id}]}
+
+
+def merge_member_details(group: dict, user_map: dict[str, dict]) -> dict:
+    """
+    Replace `members` with deduplicated members carrying name and avatar from `user_map` (user_id -> user).
+    """
+    seen_users = set()
+    enriched_members = []
+    for m in group.get("members", []):
+        if m["user_id"] in seen_users:
+            continue
+        seen_users.add(m["user_id"])
+        user = user_map.get(m["user_id"])
+        member_detail = m.copy()
+        if user:
+            member_detail["name"] = user.get("full_name") or user.get("email")
+            member_detail["avatar_url"] = (
+                variant_url(user.get("profile_image"), user.get("profile_image_variants"), AVATAR_SIZE)
+                or user.get("avatar_url")
+            )
+        else:
+            member_detail["name"] = "Unknown User"
+        enriched_members.append(member_detail)
+    group["members"] = enriched_members
+    return group
+
+
+def _unread_stages(user_id: str) -> list[dict]:
+    """
+    Adds `unread_count`: the caller's maintained counter (0 when they are not a member).
+    """
+    return [
+        {"$addFields": {"_me": {"$first": {"$filter": {
+            "input": {"$ifNull": ["$members", []]},
+            "cond": {"$eq": ["$$this.user_id", user_id]},
+        }}}}},
+        {"$addFields": {"unread_count": {"$ifNull": ["$_me.unread_count", 0]}}},
+    ]
+
+
+def _member_user_stages() -> list[dict]:
+    """
+    Adds `_member_users`: the users referenced by `members`, fetched by _id in the same round trip.
+    """
+    return [
+        {"$addFields": {"_member_oids": {"$map": {
+            "input": {"$ifNull": ["$members.user_id", []]},
+            "in": {"$convert": {"input": "$$this", "to": "objectId", "onError": None, "onNull": None}},
+        }}}},
+        {"$lookup": {
+            "from": "users",
+            "localField": "_member_oids",
+            "foreignField": "_id",
+            "pipeline": [{"$project": USER_PROJECTION}],
+            "as": "_member_users",
+        }},
+    ]
+
+
+_HELPER_FIELDS = ("_me", "_member_oids", "_member_users")
+
+
+async def list_groups(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+    skip: int = 0,
+    limit: int = 100,
+    projection: Optional[dict] = None,
+    with_members: bool = False,
+    with_unread: bool = False,
+) -> List[dict]:
+    """
+    The user's groups in one aggregation: optionally with member name/avatar
+    and the user's unread message count. `projection` as for find(); None
+    returns whole documents.
+    """
+    pipeline = [
+        {"$match": member_query(user_id)},
+        {"$sort": {"_id": 1}},
+    ]
+    if skip:
+        pipeline.append({"$skip": skip})
+    pipeline.append({"$limit": limit})
+    if with_unread:
+        pipeline += _unread_stages(user_id)
+    if with_members:
+        pipeline += _member_user_stages()
+
+    if projection is None:
+        pipeline.append({"$project": {field: 0 for field in _HELPER_FIELDS if field != "_member_users"}})
+    else:
+        keep = {"_member_users": 1} if with_members else {}
+        pipeline.append({"$project": {**projection, **keep}})
+
+    groups = await db[COLLECTION].aggregate(pipeline).to_list(length=limit)
+    if with_members:
+        for group in groups:
+            user_map = {str(u["_id"]): u for u in group.pop("_member_users", [])}
+            merge_member_details(group, user_map)
+    return groups
+
+
+async def total_unread(db: AsyncIOMotorDatabase, user_id: str) -> int:
+    """
+    Unread messages across every group the user is a member of, summed from their counters.
+    """
+    pipeline = [
+        {"$match": {"members.user_id": user_id}},
+        {"$unwind": "$members"},
+        {"$match": {"members.user_id": user_id}},
+        # A member listed twice in a group holds the same counter twice; count it once
+        {"$group": {"_id": "$_id", "count": {"$max": "$members.unread_count"}}},
+        {"$group": {"_id": None, "count": {"$sum": "$count"}}},
+    ]
+    result = await db[COLLECTION].aggregate(pipeline).to_list(length=1)
+    return result[0]["count"] if result else 0
+
+
+def _last_message(message: dict) -> dict:
+    return LastMessage(
+        timestamp=message["timestamp"],
+        id=message.get("_id"),
+        user_id=message["user_id"],
+        user_name=message["user_name"],
+        content=message.get("content", "")[:LAST_MESSAGE_PREVIEW_LENGTH],
+        has_audio=bool(message.get("audio_url")),
+    ).model_dump()
+
+
+async def add_message(db: AsyncIOMotorDatabase, message: dict) -> dict:
+    """
+    Store a chat message, then in one atomic update of the group bump every other
+    member's unread counter and refresh `last_message`.
+    """
+    result = await db[MESSAGES_COLLECTION].insert_one(message)
+    message["_id"] = result.inserted_id
+    await db[COLLECTION].update_one(
+        {"_id": ObjectId(message["group_id"])},
+        {
+            "$inc": {"members.$[other].unread_count": 1},
+            # LastMessage puts timestamp first, so $max keeps the newest message
+            # when two senders' updates land out of order
+            "$max": {"last_message": _last_message(message)},
+        },
+        array_filters=[{"other.user_id": {"$ne": message["user_id"]}}],
+    )
+    return message
+
+
+async def mark_read(db: AsyncIOMotorDatabase, group_id: ObjectId, user_id: str) -> bool:
+    """
+    Reset the member's unread counter, on every entry if they are listed more
+    than once. False when they are not a member of the group.
+    """
+    result = await db[COLLECTION].update_one(
+        {"_id": group_id, "members.user_id": user_id},
+        {"$set": {"members.$[me].last_read_at": datetime.utcnow(), "members.$[me].unread_count": 0}},
+        array_filters=[{"me.user_id": user_id}],
+    )
+    return result.matched_count > 0
+
+
+async def reconcile_counters(
+    db: AsyncIOMotorDatabase, group_id: Optional[ObjectId] = None, missing_only: bool = False
+) -> int:
+    """
+    Rebuild unread counters and `last_message` from chat_messages, for one group
+    or all of them (`missing_only`: the groups with a member that has no counter
+    yet). Returns the number of groups whose stored values changed.
+    Counts are taken against each member's last_read_at, so messages arriving
+    while this runs may be counted twice until the member next reads.
+    """
+    query = {"_id": group_id} if group_id else {}
+    if missing_only:
+        query["members"] = {"$elemMatch": {"unread_count": {"$exists": False}}}
+    changed = 0
+    async for group in db[COLLECTION].find(query, {"members": 1, "last_message": 1}):
+        gid = str(group["_id"])
+        members = group.get("members", [])
+        counts = await asyncio.gather(*(
+            db[MESSAGES_COLLECTION].count_documents({
+                "group_id": gid,
+                "user_id": {"$ne": m["user_id"]},
+                "timestamp": {"$gt": m.get("last_read_at") or m.get("joined_at") or datetime.min},
+            })
+            for m in members
+        ))
+        latest = await db[MESSAGES_COLLECTION].find_one({"group_id": gid}, sort=[("timestamp", DESCENDING), ("_id", DESCENDING)])
+        last_message = _last_message(latest) if latest else None
+
+        updates = {
+            f"members.{i}.unread_count": count
+            for i, (m, count) in enumerate(zip(members, counts))
+            if m.get("unread_count") != count
+        }
+        if group.get("last_message") != last_message:
+            updates["last_message"] = last_message
+        if not updates:
+            continue
+        # Positional paths are only valid while the member list is unchanged
+        guard = {"_id": group["_id"], "members": {"$size": len(members)}}
+        if members:
+            guard["members.user_id"] = {"$all": [m["user_id"] for m in members]}
+        await db[COLLECTION].update_one(guard, {"$set": updates})
+        changed += 1
+    return changed
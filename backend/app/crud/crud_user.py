@@ -2,7 +2,9 @@ from typing import Optional
 from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core.principal_cache import principal_cache
+from app.crud import crud_blog
 from app.models.user import UserCreate, UserInDB, UserRole, ROLE_WEIGHTS
 
 async def get_user_by_email(db: AsyncIOMotorDatabase, email: str) -> Optional[UserInDB]:
@@ -12,7 +14,7 @@ async def get_user_by_email(db: AsyncIOMotorDatabase, email: str) -> Optional[Us
     return None
 
 async def create_user(db: AsyncIOMotorDatabase, user: UserCreate) -> UserInDB:
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     user_in_db = UserInDB(
         **user.model_dump(exclude={"password"}),
         hashed_password=hashed_password,
@@ -27,9 +29,7 @@ async def authenticate(db: AsyncIOMotorDatabase, email: str, password: str) -> O
     user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
-        return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
@@ -64,6 +64,7 @@ async def update_user_role(db: AsyncIOMotorDatabase, user_id: str, role: str) ->
     )
     
     if result:
+        principal_cache.invalidate(email=result["email"])
         return UserInDB(**result)
     return None
 
@@ -80,6 +81,7 @@ async def update_user_status(db: AsyncIOMotorDatabase, user_id: str, is_active:
     )
     
     if result:
+        principal_cache.invalidate(email=result["email"])
         return UserInDB(**result)
     return None
 
@@ -90,4 +92,9 @@ async def delete_user(db: AsyncIOMotorDatabase, user_id: str) -> bool:
         return False
         
     result = await db["users"].delete_one({"_id": oid})
-    return result.deleted_count > 0
+    principal_cache.invalidate(user_id=user_id)
+    if result.deleted_count == 0:
+        return False
+    # Their posts now show "Unknown Author"
+    await crud_blog.author_changed(db, user_id)
+    return True
@@ -0,0 +1,226 @@
+"""
+Declarative registry of the MongoDB indexes the API relies on.
+
+Applied idempotently by main.lifespan at startup, or by hand:
+
+    python -m app.db.indexes           # create/update every index
+    python -m app.db.indexes --report  # show which index each query path relies on
+"""
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    keys: list[tuple[str, int]]
+    unique: bool = False
+    expire_after_seconds: Optional[int] = None
+    partial_filter: Optional[dict] = None
+    used_by: tuple[str, ...] = field(default=())
+
+    @property
+    def name(self) -> str:
+        # Same naming MongoDB uses by default, so existing auto-named indexes match
+        return "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+    def options(self) -> dict:
+        options = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        if self.partial_filter:
+            options["partialFilterExpression"] = self.partial_filter
+        return options
+
+
+def _activity_log_indexes() -> list[IndexSpec]:
+    if settings.AUDIT_LOG_TIMESERIES:
+        # Time-series collections only take secondary indexes on the meta and time
+        # fields, and expire through the collection option (see crud_activity_log).
+        return [
+            IndexSpec("activity_logs", [("user_email", ASCENDING), ("timestamp", DESCENDING)],
+                      used_by=("crud_activity_log.get_page",)),
+        ]
+    specs = [
+        IndexSpec("activity_logs", [("timestamp", DESCENDING), ("_id", DESCENDING)],
+                  used_by=("crud_activity_log.get_page",)),
+        IndexSpec("activity_logs", [("user_email", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+                  used_by=("crud_activity_log.get_page",)),
+        IndexSpec("activity_logs", [("impersonator_email", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+                  partial_filter={"is_impersonated": True},
+                  used_by=("crud_activity_log.get_page",)),
+    ]
+    if settings.AUDIT_LOG_RETENTION_DAYS:
+        specs.append(IndexSpec("activity_logs", [("timestamp", ASCENDING)],
+                               expire_after_seconds=settings.AUDIT_LOG_RETENTION_DAYS * 86400,
+                               used_by=("retention",)))
+    return specs
+
+
+INDEXES: list[IndexSpec] = [
+    # List endpoints page by keyset (app.db.pagination), so their sort indexes end in _id
+    # users
+    IndexSpec("users", [("email", ASCENDING)], unique=True, used_by=(
+        "crud_user.get_user_by_email", "crud_user.authenticate", "deps.get_current_user",
+        "research_groups.invite_member", "research_groups.websocket_endpoint",
+        "notifications.send_admin_notification",
+    )),
+    IndexSpec("users", [("last_active_at", DESCENDING)], used_by=("users.get_live_users",)),
+    # verifications: OTPs removed by MongoDB once expires_at passes
+    IndexSpec("verifications", [("email", ASCENDING)], unique=True, used_by=(
+        "auth.send_otp", "auth.signup",
+    )),
+    IndexSpec("verifications", [("expires_at", ASCENDING)], expire_after_seconds=0, used_by=("retention",)),
+    # research groups and chat
+    IndexSpec("research_groups", [("members.user_id", ASCENDING)], used_by=(
+        "crud_research_group.list_groups", "crud_research_group.total_unread",
+    )),
+    IndexSpec("research_groups", [("created_by", ASCENDING)], used_by=("crud_research_group.list_groups",)),
+    IndexSpec("chat_messages", [("group_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "research_groups.get_messages", "crud_research_group.reconcile_counters",
+    )),
+    IndexSpec("invitations", [("token", ASCENDING)], unique=True, used_by=("research_groups.join_group",)),
+    # notifications
+    IndexSpec("notifications", [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_notification.get_notifications_by_user",
+    )),
+    IndexSpec("notifications", [("user_id", ASCENDING), ("is_read", ASCENDING)], used_by=(
+        "crud_notification.mark_all_notifications_read",
+    )),
+    # one coalesced like/comment notification per post and time window; unique so concurrent upserts can't fork it
+    IndexSpec("notifications", [("user_id", ASCENDING), ("group_key", ASCENDING), ("window", ASCENDING)], unique=True,
+              partial_filter={"group_key": {"$exists": True}}, used_by=("engagement_notifications.flush",)),
+    # blog
+    IndexSpec("blog_posts", [("slug", ASCENDING)], unique=True, used_by=(
+        "crud_blog.get_blog_post", "crud_blog.update_blog_post",
+        "crud_blog.increment_views", "crud_blog.delete_blog_post",
+    )),
+    IndexSpec("blog_posts", [("is_published", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_blog.get_blog_posts",
+    )),
+    IndexSpec("blog_posts", [("author_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_blog.get_blog_posts (author_id)",
+    )),
+    # community
+    IndexSpec("community_posts", [("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_community.get_posts_with_authors",
+    )),
+    IndexSpec("community_posts", [("author_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_community.get_posts_with_authors (author_id)",
+    )),
+    IndexSpec("community_posts", [("likes_count", DESCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_community.get_posts_with_authors (popular)",
+    )),
+    IndexSpec("community_posts", [("author_id", ASCENDING), ("likes_count", DESCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_community.get_posts_with_authors (author_id, popular)",
+    )),
+    IndexSpec("community_posts", [("hot_score", DESCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_community.get_posts_with_authors (hot)",
+    )),
+    IndexSpec("community_posts", [("author_id", ASCENDING), ("hot_score", DESCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_community.get_posts_with_authors (author_id, hot)",
+    )),
+    IndexSpec("community_comments", [("post_id", ASCENDING), ("parent_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_community.get_comment_page",
+    )),
+    IndexSpec("community_comments", [("root_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], used_by=(
+        "crud_community.get_comment_page (replies)",
+    )),
+    # newsletter
+    IndexSpec("subscribers", [("email", ASCENDING)], unique=True, used_by=(
+        "newsletter.subscribe_newsletter", "newsletter.unsubscribe",
+    )),
+    IndexSpec("subscribers", [("subscribed_at", DESCENDING), ("_id", DESCENDING)], used_by=("newsletter.read_subscribers",)),
+    # public site listings
+    IndexSpec("news", [("is_published", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)], used_by=("crud_news.get_multi",)),
+    IndexSpec("publications", [("date", DESCENDING), ("_id", DESCENDING)], used_by=("crud_publication.get_multi",)),
+    IndexSpec("jobs", [("created_at", DESCENDING), ("_id", DESCENDING)], used_by=("crud_job.get_multi",)),
+    IndexSpec("jobs", [("is_active", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], used_by=(
+        "crud_job.get_multi (active_only)",
+    )),
+    IndexSpec("projects", [("is_active", ASCENDING), ("created_at", DESCENDING)], used_by=("projects.read_projects",)),
+    IndexSpec("team_members", [("designation_weight", DESCENDING)], used_by=("team.read_team_members",)),
+    IndexSpec("research_areas", [("number", ASCENDING)], used_by=("research_areas.read_research_areas",)),
+] + _activity_log_indexes()
+
+
+async def apply_indexes(db: AsyncIOMotorDatabase, specs: list[IndexSpec] = INDEXES) -> dict[str, list[str]]:
+    """
+    Create every registered index. Existing identical indexes are a no-op; a TTL
+    whose period changed is updated in place. Failures (e.g. duplicate data under
+    a new unique index) are logged and reported instead of stopping startup.
+    """
+    report = {"applied": [], "failed": []}
+    for spec in specs:
+        label = f"{spec.collection}.{spec.name}"
+        try:
+            await db[spec.collection].create_index(spec.keys, **spec.options())
+        except OperationFailure as e:
+            if spec.expire_after_seconds is not None and e.code == 85:  # IndexOptionsConflict
+                try:
+                    await db.command("collMod", spec.collection, index={
+                        "name": spec.name, "expireAfterSeconds": spec.expire_after_seconds,
+                    })
+                except OperationFailure as e:
+                    # e.g. the same keys already indexed under another name
+                    logger.error(f"Could not update TTL of index {label}: {e}")
+                    report["failed"].append(label)
+                    continue
+            else:
+                logger.error(f"Could not create index {label}: {e}")
+                report["failed"].append(label)
+                continue
+        report["applied"].append(label)
+    return report
+
+
+def index_usage(specs: list[IndexSpec] = INDEXES) -> dict[str, list[str]]:
+    """
+    Map each query path to the indexes it relies on.
+    """
+    usage: dict[str, list[str]] = {}
+    for spec in specs:
+        for caller in spec.used_by:
+            usage.setdefault(caller, []).append(f"{spec.collection}.{spec.name}")
+    return dict(sorted(usage.items()))
+
+
+async def _main(report_only: bool) -> None:
+    if report_only:
+        for caller, indexes in index_usage().items():
+            print(f"{caller:<55} {', '.join(indexes)}")
+        return
+
+    from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_database
+    from app.crud import crud_activity_log
+
+    await connect_to_mongo()
+    try:
+        db = await get_database()
+        await crud_activity_log.ensure_collection(db)
+        result = await apply_indexes(db)
+        print(f"Applied {len(result['applied'])} indexes")
+        for label in result["failed"]:
+            print(f"FAILED: {label}")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply or report MongoDB indexes")
+    parser.add_argument("--report", action="store_true", help="print which index each query path relies on")
+    args = parser.parse_args()
+    asyncio.run(_main(args.report))
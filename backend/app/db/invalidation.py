@@ -0,0 +1,23 @@
+"""
+What a write to a listed collection has to refresh.
+
+This worker's cached totals (count_cache) and responses (response_cache) are
+dropped, and the collection's version stamp, which every worker's ETags are
+built from, is bumped. Cached entries on other workers expire by their TTL.
+"""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.response_cache import response_cache
+from app.db import versions
+from app.db.pagination import count_cache
+
+
+async def invalidate_collection(db: AsyncIOMotorDatabase, collection: str, *documents: str) -> None:
+    """
+    Call after a write that changed what `collection` lists. `documents` are the
+    keys of documents also served on their own URL (e.g. blog slugs), whose
+    validators change too.
+    """
+    count_cache.invalidate(collection)
+    response_cache.invalidate(collection)
+    await versions.bump(db, collection, *(versions.document_key(collection, key) for key in documents))
@@ -0,0 +1,71 @@
+"""
+One-off maintenance tasks for denormalized data, run by hand:
+
+    python -m app.db.maintenance reconcile-unread [--group ID]  # rebuild chat unread counters (startup fills in missing ones)
+    python -m app.db.maintenance migrate-comments               # move embedded post comments to community_comments
+    python -m app.db.maintenance backfill-reaction-counts       # recompute community likes_count/dislikes_count
+    python -m app.db.maintenance recompute-hot                  # rescore the community hot feed after changing its settings
+"""
+import argparse
+import asyncio
+from typing import Optional
+
+from bson import ObjectId
+
+
+async def reconcile_unread(db, group_id: Optional[str]) -> None:
+    from app.crud import crud_research_group
+
+    changed = await crud_research_group.reconcile_counters(db, ObjectId(group_id) if group_id else None)
+    print(f"Reconciled unread counters: {changed} groups updated")
+
+
+async def migrate_comments(db) -> None:
+    from app.crud import crud_community
+
+    posts, comments = await crud_community.migrate_embedded_comments(db)
+    print(f"Migrated {comments} comments from {posts} posts")
+
+
+async def backfill_reaction_counts(db) -> None:
+    from app.crud import crud_community
+
+    changed = await crud_community.backfill_reaction_counts(db)
+    print(f"Backfilled reaction counts: {changed} posts updated")
+
+
+async def recompute_hot(db) -> None:
+    from app.crud import crud_community
+
+    changed = await crud_community.recompute_hot_scores(db)
+    print(f"Recomputed hot scores: {changed} posts updated")
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_database
+
+    await connect_to_mongo()
+    try:
+        db = await get_database()
+        if args.task == "reconcile-unread":
+            await reconcile_unread(db, args.group)
+        elif args.task == "migrate-comments":
+            await migrate_comments(db)
+        elif args.task == "backfill-reaction-counts":
+            await backfill_reaction_counts(db)
+        elif args.task == "recompute-hot":
+            await recompute_hot(db)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintenance tasks for denormalized data")
+    tasks = parser.add_subparsers(dest="task", required=True)
+    reconcile = tasks.add_parser("reconcile-unread", help="rebuild chat unread counters and last-message previews")
+    reconcile.add_argument("--group", help="only this group id")
+    tasks.add_parser("migrate-comments", help="move comments embedded in community posts into community_comments")
+    tasks.add_parser("backfill-reaction-counts", help="recompute likes_count/dislikes_count on community posts")
+    tasks.add_parser("recompute-hot", help="rescore community posts for the hot feed")
+    args = parser.parse_args()
+    asyncio.run(_main(args))
@@ -1,22 +1,110 @@
+import asyncio
+import logging
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
 from app.core.config import settings
 import certifi
 
+logger = logging.getLogger(__name__)
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters, aggregated over every server the client talks to."""
+
+    def __init__(self):
+        self.open = 0
+        self.in_use = 0
+        self.created = 0
+        self.closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.pool_clears = 0
+
+    def connection_created(self, event):
+        self.open += 1
+        self.created += 1
+
+    def connection_closed(self, event):
+        self.open -= 1
+        self.closed += 1
+
+    def connection_checked_out(self, event):
+        self.in_use += 1
+        self.checkouts += 1
+
+    def connection_checked_in(self, event):
+        self.in_use -= 1
+
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+
+    def pool_cleared(self, event):
+        self.pool_clears += 1
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+
 class MongoDB:
     client: AsyncIOMotorClient = None
+    pool_stats: PoolStats = PoolStats()
 
 db = MongoDB()
 
 async def get_database():
     return db.client.get_database("research_lab")
 
-async def connect_to_mongo():
-    db.client = AsyncIOMotorClient(
-        settings.MONGODB_URL,
-        tlsCAFile=certifi.where()
-    )
+def client_options() -> dict:
+    options = {
+        "tlsCAFile": certifi.where(),
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS,
+        "readPreference": settings.MONGODB_READ_PREFERENCE,
+        "event_listeners": [db.pool_stats],
+    }
+    if settings.MONGODB_COMPRESSORS:
+        options["compressors"] = settings.MONGODB_COMPRESSORS
+    return options
+
+async def warm_up_pool():
+    """
+    Resolve SRV/DNS, finish the TLS handshake and open minPoolSize connections
+    now, instead of on the first requests after a deploy.
+    """
+    pings = max(1, settings.MONGODB_MIN_POOL_SIZE)
+    await asyncio.gather(*(db.client.admin.command("ping") for _ in range(pings)))
+
+async def connect_to_mongo() -> bool:
+    db.client = AsyncIOMotorClient(settings.MONGODB_URL, **client_options())
+    try:
+        await warm_up_pool()
+    except Exception as e:
+        # Keep starting up; the driver retries and /health reports the pool state
+        logger.error(f"MongoDB warm-up failed: {e}")
+        return False
     print("Connected to MongoDB")
+    return True
 
 async def close_mongo_connection():
     db.client.close()
     print("Closed MongoDB connection")
+
+def pool_info() -> dict:
+    stats = db.pool_stats
+    return {
+        "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGODB_MIN_POOL_SIZE,
+        "open": stats.open,
+        "in_use": stats.in_use,
+        "idle": stats.open - stats.in_use,
+        "created": stats.created,
+        "closed": stats.closed,
+        "checkouts": stats.checkouts,
+        "checkout_failures": stats.checkout_failures,
+        "pool_clears": stats.pool_clears,
+    }
@@ -0,0 +1,240 @@
+"""
+Keyset (cursor) pagination.
+
+Instead of `.skip(n)`, which makes MongoDB walk and discard n documents, a page
+continues from the sort key of the last document the client saw. Every page then
+costs the same index seek, however deep it is. Cursors are opaque to clients.
+
+Totals are fetched alongside the page (see `paginate`): unfiltered ones from
+collection metadata, filtered ones from `count_cache`. Code that inserts, deletes
+or changes filtered fields of a listed collection calls
+app.db.invalidation.invalidate_collection(), which drops its cached counts.
+"""
+import asyncio
+import base64
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional
+
+from bson import json_util
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DESCENDING
+
+from app.core.config import settings
+
+
+class InvalidCursor(ValueError):
+    """A cursor that is malformed or was issued for a different sort order."""
+
+
+class Keyset:
+    """
+    A sort order usable for keyset pagination. `_id` is appended as the final
+    tie-breaker (in the direction of the last key) so every position is unique.
+    """
+
+    def __init__(self, *keys: tuple[str, int]):
+        keys = list(keys)
+        if not keys or keys[-1][0] != "_id":
+            keys.append(("_id", keys[-1][1] if keys else DESCENDING))
+        self.sort = keys
+        self.fields = [field for field, _ in keys]
+
+    def encode(self, doc: dict) -> str:
+        raw = json_util.dumps({"k": self.fields, "v": [doc.get(field) for field in self.fields]})
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode(self, cursor: str) -> list[Any]:
+        try:
+            data = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except Exception:
+            raise InvalidCursor("Invalid cursor")
+        # A cursor issued for another sort order cannot be continued
+        if not isinstance(data, dict) or data.get("k") != self.fields:
+            raise InvalidCursor("Invalid cursor")
+        values = data.get("v")
+        # One scalar per sort key; a document value would be read as a query operator
+        if not isinstance(values, list) or len(values) != len(self.fields) or any(isinstance(v, dict) for v in values):
+            raise InvalidCursor("Invalid cursor")
+        return values
+
+    def after(self, cursor: str) -> dict:
+        """
+        Filter for everything strictly after the cursor position in this sort order.
+        """
+        values = self.decode(cursor)
+        branches = []
+        for i, (field, direction) in enumerate(self.sort):
+            beyond = _beyond(field, values[i], direction)
+            if beyond is None:
+                continue
+            equal = {self.fields[j]: values[j] for j in range(i)}
+            branches.append({"$and": [equal, beyond]} if equal else beyond)
+        return {"$or": branches} if branches else {"_id": {"$exists": False}}
+
+    def projection(self, projection: Optional[dict]) -> Optional[dict]:
+        """
+        Make sure an inclusion projection still returns the sort keys the next cursor is built from.
+        """
+        if not projection or not any(v == 1 for v in projection.values()):
+            return projection
+        return {**projection, **{field: 1 for field in self.fields if field not in projection}}
+
+
+def _beyond(field: str, value: Any, direction: int) -> Optional[dict]:
+    # null/missing sorts before every other value, and range operators never
+    # match it, so it needs its own branch
+    if direction == DESCENDING:
+        if value is None:
+            return None
+        return {"$or": [{field: {"$lt": value}}, {field: None}]}
+    if value is None:
+        return {field: {"$ne": None}}
+    return {field: {"$gt": value}}
+
+
+def page_query(query: dict, keyset: Keyset, cursor: Optional[str]) -> dict:
+    if not cursor:
+        return query
+    after = keyset.after(cursor)
+    return {"$and": [query, after]} if query else after
+
+
+def next_cursor(docs: list[dict], keyset: Keyset, limit: int) -> Optional[str]:
+    """
+    Cursor for the page after `docs`, or None when this was the last page.
+    """
+    if not docs or len(docs) < limit:
+        return None
+    return keyset.encode(docs[-1])
+
+
+async def find_page(
+    collection: AsyncIOMotorCollection,
+    query: dict,
+    keyset: Keyset,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    projection: Optional[dict] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    One page of `query` in keyset order. With a `cursor` the page continues from
+    it and `skip` is ignored; without one, `skip` keeps classic page/size working.
+    Raises InvalidCursor for a malformed cursor.
+    """
+    find = collection.find(page_query(query, keyset, cursor), keyset.projection(projection)).sort(keyset.sort)
+    if skip and not cursor:
+        find = find.skip(skip)
+    docs = await find.limit(limit).to_list(length=limit)
+    return docs, next_cursor(docs, keyset, limit)
+
+
+class CountCache:
+    """
+    Bounded LRU + TTL cache of filtered `count_documents` results, keyed by
+    collection and query. Writes to a collection invalidate its entries; the
+    TTL bounds staleness from writes made by other workers.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple[str, str], tuple[float, int]]" = OrderedDict()
+        # Bumped on every invalidation so a count that raced a write is not stored
+        self._generations: dict[str, int] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, collection: str, query: dict) -> tuple[str, str]:
+        return collection, json_util.dumps(query, sort_keys=True)
+
+    def generation(self, collection: str) -> int:
+        return self._generations.get(collection, 0)
+
+    def get(self, key: tuple[str, str]) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: tuple[str, str], count: int, generation: int) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if self.generation(key[0]) != generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, count)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, collection: str) -> None:
+        with self._lock:
+            self._generations[collection] = self.generation(collection) + 1
+            for key in [k for k in self._entries if k[0] == collection]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+count_cache = CountCache(
+    max_size=settings.COUNT_CACHE_SIZE,
+    ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS,
+)
+
+
+async def count(collection: AsyncIOMotorCollection, query: dict) -> int:
+    """
+    Total for a listing. Unfiltered totals come from collection metadata
+    (estimated_document_count); filtered ones are cached until the next write.
+    """
+    if not query:
+        return await collection.estimated_document_count()
+    key = count_cache.key(collection.name, query)
+    cached = count_cache.get(key)
+    if cached is not None:
+        return cached
+    generation = count_cache.generation(collection.name)
+    total = await collection.count_documents(query)
+    count_cache.set(key, total, generation)
+    return total
+
+
+async def paginate(
+    collection: AsyncIOMotorCollection,
+    query: dict,
+    keyset: Keyset,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    projection: Optional[dict] = None,
+    with_total: bool = True,
+) -> tuple[list[dict], Optional[int], Optional[str]]:
+    """
+    find_page plus the total, fetched concurrently. The total is None when not requested.
+    """
+    if not with_total:
+        docs, next_page = await find_page(collection, query, keyset, cursor, skip, limit, projection)
+        return docs, None, next_page
+    (docs, next_page), total = await asyncio.gather(
+        find_page(collection, query, keyset, cursor, skip, limit, projection),
+        count(collection, query),
+    )
+    return docs, total, next_page
@@ -0,0 +1,105 @@
+import asyncio
+from typing import Iterable, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+# Fields enrichment needs (names and avatars); never password hashes
+USER_PROJECTION = {"full_name": 1, "email": 1, "profile_image": 1, "profile_image_variants": 1, "avatar_url": 1}
+
+# batches: `users` queries issued; keys: ids fetched by them; memoized: loads served without a query
+loader_stats = {"batches": 0, "keys": 0, "memoized": 0}
+
+
+class UserLoader:
+    """
+    Batches and memoises user lookups for the duration of one request.
+
+    Every load() made in the same event-loop tick (e.g. from enrichment coroutines
+    run with asyncio.gather) is answered by a single `users` query with `$in`, and
+    an id already loaded during the request is never fetched again. Get one per
+    request with deps.get_user_loader.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, projection: dict = USER_PROJECTION):
+        self.db = db
+        self.projection = projection
+        self._results: dict[str, asyncio.Future] = {}
+        self._pending: list[str] = []
+        # The loop only keeps weak references to tasks; in-flight fetches live here
+        self._fetches: set[asyncio.Task] = set()
+
+    def load(self, user_id) -> "asyncio.Future[Optional[dict]]":
+        """
+        The user document (lean projection) for `user_id`, or None if there is no such user.
+        """
+        key = str(user_id)
+        future = self._results.get(key)
+        if future is not None:
+            loader_stats["memoized"] += 1
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._results[key] = future
+        if not self._pending:
+            # Let the other coroutines of this tick queue their ids first
+            loop.call_soon(self._dispatch)
+        self._pending.append(key)
+        return future
+
+    async def load_many(self, user_ids: Iterable) -> list[Optional[dict]]:
+        return list(await asyncio.gather(*(self.load(user_id) for user_id in user_ids)))
+
+    async def load_map(self, user_ids: Iterable) -> dict[str, dict]:
+        """
+        {user_id: user} for the ids that exist.
+        """
+        keys = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        users = await self.load_many(keys)
+        return {key: user for key, user in zip(keys, users) if user is not None}
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._fetch(keys))
+        self._fetches.add(task)
+        task.add_done_callback(lambda done: self._fetched(done, keys))
+
+    def _fetched(self, task: asyncio.Task, keys: list[str]) -> None:
+        self._fetches.discard(task)
+        # _fetch settles every future itself; this covers it being cancelled or failing unexpectedly
+        error = asyncio.CancelledError() if task.cancelled() else task.exception()
+        if error is None:
+            return
+        for key in keys:
+            future = self._results.pop(key, None)
+            if future is not None and not future.done():
+                future.set_exception(error)
+
+    async def _fetch(self, keys: list[str]) -> None:
+        oids = []
+        for key in keys:
+            try:
+                oids.append(ObjectId(key))
+            except (InvalidId, TypeError):
+                pass
+        try:
+            users = []
+            if oids:
+                loader_stats["batches"] += 1
+                loader_stats["keys"] += len(oids)
+                users = await self.db["users"].find({"_id": {"$in": oids}}, self.projection).to_list(None)
+        except Exception as e:
+            for key in keys:
+                if not self._results[key].done():
+                    self._results[key].set_exception(e)
+                # Let a later load retry instead of replaying the failure
+                self._results.pop(key, None)
+            return
+
+        by_id = {str(user["_id"]): user for user in users}
+        for key in keys:
+            future = self._results[key]
+            if not future.done():
+                future.set_result(by_id.get(key))
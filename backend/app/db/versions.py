@@ -0,0 +1,25 @@
+"""
+Version stamps for HTTP validators (ETags).
+
+Every write path bumps the stamp of the collection it changed (and, for
+documents served on their own URL, the document's stamp). Reads compare the
+client's ETag against the current stamp with a single _id lookup, instead of
+running the query. Stamps live in MongoDB so every worker agrees on them.
+"""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+COLLECTION = "versions"
+
+
+def document_key(collection: str, key: str) -> str:
+    return f"{collection}:{key}"
+
+
+async def bump(db: AsyncIOMotorDatabase, *keys: str) -> None:
+    for key in keys:
+        await db[COLLECTION].update_one({"_id": key}, {"$inc": {"v": 1}}, upsert=True)
+
+
+async def get(db: AsyncIOMotorDatabase, key: str) -> int:
+    doc = await db[COLLECTION].find_one({"_id": key})
+    return doc["v"] if doc else 0
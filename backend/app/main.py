@@ -1,21 +1,70 @@
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.api.v1.api import api_router
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.middleware.response_cache import CACHE_STATUS_HEADER
 from app.core.config import settings
-from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_database, pool_info
+from app.crud import crud_activity_log, crud_research_group
+from app.db.indexes import apply_indexes
+from app.core.security import shutdown_password_hasher
+from app.services.google_auth import google_verifier
+from app.services.audit_sink import audit_sink
+from app.services.change_events import change_events
+from app.services.engagement_notifications import engagement_notifications
+from app.services.s3 import shutdown_uploads
+from app.services.image_pipeline import shutdown_image_pipeline
+from app.core.response_cache import response_cache
+from app.db.pagination import count_cache
+
+logger = logging.getLogger(__name__)
+
+async def backfill_unread_counters(db) -> None:
+    """
+    Give groups from before unread counters were maintained their counters, so
+    their members don't see 0 unread. A single query once every member has one.
+    """
+    try:
+        changed = await crud_research_group.reconcile_counters(db, missing_only=True)
+        if changed:
+            logger.info(f"Backfilled unread counters on {changed} research groups")
+    except Exception as e:
+        logger.error(f"Backfilling unread counters failed: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Connect to MongoDB
-    await connect_to_mongo()
+    connected = await connect_to_mongo()
+    if connected:
+        db = await get_database()
+        if settings.MONGODB_APPLY_INDEXES:
+            await crud_activity_log.ensure_collection(db)
+            await apply_indexes(db)
+        await backfill_unread_counters(db)
+    audit_sink.start()
+    engagement_notifications.start()
+    if connected and settings.CHANGE_EVENTS_ENABLED:
+        change_events.start()
     yield
-    # Shutdown: Close connection
+    # Shutdown: Flush pending audit entries and notifications, save the change stream position, then close connection
+    await audit_sink.stop()
+    await engagement_notifications.stop()
+    await change_events.stop()
     await close_mongo_connection()
+    shutdown_password_hasher()
+    shutdown_uploads()
+    shutdown_image_pipeline()
+    await google_verifier.close()
 
 app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
+# Innermost: cached public responses, wrapped by CORS so they never carry another request's origin headers
+from app.middleware.response_cache import ResponseCacheMiddleware
+app.add_middleware(ResponseCacheMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -23,26 +72,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, CACHE_STATUS_HEADER],
 )
 
 from app.middleware.audit import AuditMiddleware
 app.add_middleware(AuditMiddleware)
 
-from slowapi.middleware import SlowAPIMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from app.core.ratelimit import limiter
+from app.middleware.ratelimit import RateLimitMiddleware
 
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(RateLimitMiddleware)
+
+# Outermost: decode the bearer token once for every middleware and dependency below
+from app.middleware.auth_context import AuthContextMiddleware
+app.add_middleware(AuthContextMiddleware)
 
 # Include Router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+from app.core.principal_cache import principal_cache
+from app.core.auth_context import auth_stats
+from app.db.user_loader import loader_stats
+
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "principal_cache": principal_cache.stats(),
+        "count_cache": count_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "auth_context": auth_stats,
+        "user_loader": loader_stats,
+        "audit_sink": audit_sink.stats(),
+        "change_events": change_events.stats(),
+        "engagement_notifications": engagement_notifications.stats(),
+        "mongodb_pool": pool_info(),
+    }
 
 from fastapi.staticfiles import StaticFiles
 import os
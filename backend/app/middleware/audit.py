@@ -1,41 +1,61 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request
-from app.api.deps import get_current_user, oauth2_scheme
-from app.core.config import settings
-from app.db.mongodb import get_database
-from jose import jwt
+import logging
 from datetime import datetime
+from starlette.datastructures import URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.auth_context import get_auth_context
+from app.services.audit_sink import audit_sink
 
-class AuditMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
+logger = logging.getLogger(__name__)
+
+AUDITED_METHODS = {"POST", "PUT", "DELETE", "PATCH"}
+
+class AuditMiddleware:
+    """
+    Records state-changing requests in activity_logs.
+
+    Pure ASGI: the response status is read from the http.response.start message,
+    so request and response bodies are never buffered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         # Only log state-changing methods
-        if request.method in ["POST", "PUT", "DELETE", "PATCH"]:
-            try:
-                # Manual token extraction since we are in middleware
-                auth_header = request.headers.get("Authorization")
-                if auth_header and auth_header.startswith("Bearer "):
-                    token = auth_header.split(" ")[1]
-                    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-                    email = payload.get("sub")
-                    
-                    impersonator = payload.get("impersonator") # Extract impersonator email if present
-                    
-                    if email:
-                        db = await get_database()
-                        log_entry = {
-                            "timestamp": datetime.utcnow(),
-                            "method": request.method,
-                            "url": str(request.url),
-                            "user_email": email,
-                            "status_code": response.status_code,
-                            "is_impersonated": bool(impersonator),
-                            "impersonator_email": impersonator
-                        }
-                        await db["activity_logs"].insert_one(log_entry)
-            except Exception as e:
-                # Don't fail request if logging fails
-                print(f"Audit log failed: {e}")
+        if scope["type"] != "http" or scope["method"] not in AUDITED_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        try:
+            # Token decoded once per request by AuthContextMiddleware
+            auth = get_auth_context(scope)
+            if auth.valid:
+                email = auth.subject
+                
+                impersonator = auth.impersonator # Extract impersonator email if present
                 
-        return response
+                if email:
+                    log_entry = {
+                        "timestamp": datetime.utcnow(),
+                        "method": scope["method"],
+                        "url": str(URL(scope=scope)),
+                        "user_email": email,
+                        "status_code": status_code,
+                        "is_impersonated": bool(impersonator),
+                        "impersonator_email": impersonator
+                    }
+                    # Written in batches by the audit sink, off the request path
+                    audit_sink.enqueue(log_entry)
+        except Exception as e:
+            # Don't fail request if logging fails
+            logger.error(f"Audit log failed: {e}")
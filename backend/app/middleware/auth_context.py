@@ -0,0 +1,18 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.auth_context import SCOPE_KEY, decode_token, extract_token
+
+
+class AuthContextMiddleware:
+    """
+    Decodes the request's bearer token once and stores it in scope["state"]
+    so the audit log, the auth dependencies and WebSocket handlers share it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] in ("http", "websocket"):
+            scope.setdefault("state", {})[SCOPE_KEY] = decode_token(extract_token(scope))
+        await self.app(scope, receive, send)
@@ -0,0 +1,51 @@
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.ratelimit import check_limits, inject_headers, is_exempt, route_handler
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI replacement for slowapi's SlowAPIMiddleware.
+
+    Applies the limiter's default limits to routes without their own @limiter.limit
+    decorator. Rate-limit headers are added to the http.response.start message, and
+    body messages are passed through untouched so streaming responses stay streamed.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        app = scope["app"]
+        limiter = app.state.limiter
+        if not limiter.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        handler = route_handler(app.routes, scope)
+        if is_exempt(limiter, handler):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive=receive)
+        error_response, add_headers = await check_limits(limiter, request, handler, app)
+        if error_response is not None:
+            await error_response(scope, receive, send)
+            return
+
+        if not add_headers:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                inject_headers(limiter, headers, request)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
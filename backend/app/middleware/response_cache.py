@@ -0,0 +1,77 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.etag import if_none_match
+from app.core.response_cache import response_cache
+
+CACHE_STATUS_HEADER = "X-Cache"
+_CACHE_STATUS = CACHE_STATUS_HEADER.lower().encode()
+# Sent with a 304 in place of the cached body
+_VALIDATOR_HEADERS = {b"etag", b"cache-control"}
+
+
+class ResponseCacheMiddleware:
+    """
+    Serves GET routes marked with @response_cache.cached from memory.
+
+    On a miss the response passes through untouched while its start message and
+    body are recorded; once routing has resolved the endpoint, a complete 200
+    response from a cached route is stored as bytes, so a hit skips the
+    database, validation and serialization entirely, and a cached ETag the
+    client already holds is answered with 304. Sits inside CORS so cached
+    headers never carry a particular origin.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not response_cache.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        key = f"{scope['path']}?{_normalized_query(scope['query_string'])}"
+        entry = response_cache.get(key)
+        if entry is not None:
+            etag = next((v.decode("latin-1") for k, v in entry.headers if k == b"etag"), None)
+            if etag and if_none_match(Headers(scope=scope).get("if-none-match"), etag):
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [(k, v) for k, v in entry.headers if k in _VALIDATOR_HEADERS] + [(_CACHE_STATUS, b"HIT")],
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": entry.headers + [(_CACHE_STATUS, b"HIT")],
+            })
+            await send({"type": "http.response.body", "body": entry.body})
+            return
+
+        version = response_cache.version
+        tags = None
+        start: dict = {}
+        chunks: list[bytes] = []
+
+        async def send_and_record(message: Message):
+            nonlocal tags
+            if message["type"] == "http.response.start":
+                # The router has set the endpoint by the time a response starts
+                tags = getattr(scope.get("endpoint"), "__response_cache_tags__", None)
+                if tags is not None:
+                    start.update(message)
+                    message["headers"] = list(message.get("headers", [])) + [(_CACHE_STATUS, b"MISS")]
+            elif message["type"] == "http.response.body" and tags is not None:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False) and start["status"] == 200:
+                    response_cache.set(key, tags, version, 200, list(start.get("headers", [])), b"".join(chunks))
+            await send(message)
+
+        await self.app(scope, receive, send_and_record)
+
+
+def _normalized_query(query_string: bytes) -> str:
+    # ?size=10&page=2 and ?page=2&size=10 are the same response
+    return "&".join(sorted(query_string.decode("latin-1").split("&"))) if query_string else ""
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+from app.models.item import PyObjectId
+
+class ActivityLog(BaseModel):
+    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    timestamp: datetime
+    method: str
+    url: str
+    user_email: str
+    status_code: Optional[int] = None
+    is_impersonated: bool = False
+    impersonator_email: Optional[str] = None
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+
+class ActivityLogFilter(BaseModel):
+    user_email: Optional[str] = None
+    impersonator_email: Optional[str] = None
+    method: Optional[str] = None
+    status_code: Optional[int] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+class ActivityLogPage(BaseModel):
+    items: List[ActivityLog]
+    next_cursor: Optional[str] = None
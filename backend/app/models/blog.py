@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field, BeforeValidator
 from typing import Optional, List
 from datetime import datetime
 from typing_extensions import Annotated
-from app.models.item import PyObjectId
+from app.models.item import PyObjectId, partial_model
 
 class BlogPostBase(BaseModel):
     title: str
@@ -46,3 +46,7 @@ class BlogPost(BlogPostInDBBase):
 
 class BlogPostInDB(BlogPostInDBBase):
     pass
+
+class BlogPostSummary(partial_model(BlogPost)):
+    """Listing view of a post: only the projected fields are set."""
+    word_count: Optional[int] = None
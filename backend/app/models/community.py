@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from bson import ObjectId
 from app.models.item import PyObjectId
@@ -12,9 +12,24 @@ class Comment(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     parent_id: Optional[str] = None
 
+class CommentThread(Comment):
+    replies: List["CommentThread"] = [] # Oldest first
+    # Top-level comments only: replies in the whole thread, and where the nested ones stop
+    replies_count: Optional[int] = None
+    replies_cursor: Optional[str] = None # Pass as `cursor` to /{post_id}/comments/{id}/replies
+
+class CommentPage(BaseModel):
+    items: List[CommentThread] # Top-level comments, newest first, with their first replies
+    next_cursor: Optional[str] = None # Pass back as `cursor` for the next page
+
+class ReplyPage(BaseModel):
+    items: List[Comment] # Replies anywhere in the thread, oldest first; nest them by parent_id
+    next_cursor: Optional[str] = None
+
 class CommunityPostBase(BaseModel):
     content: str
     images: List[str] = []
+    image_variants: List[Dict[str, str]] = [] # Per image (same order): size -> WebP URL
 
 class CommunityPostCreate(CommunityPostBase):
     pass
@@ -25,10 +40,13 @@ class CommunityPost(CommunityPostBase):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     likes: List[str] = [] # List of user_ids
     dislikes: List[str] = [] # List of user_ids
-    comments: List[Comment] = []
+    likes_count: int = 0 # Maintained with the arrays by crud_community.toggle_reaction
+    dislikes_count: int = 0
+    comments_count: int = 0 # Comments live in community_comments
+    liked: Optional[bool] = None # The caller's reaction; set on feed items, which omit likes/dislikes
+    disliked: Optional[bool] = None
     
     # Virtual fields for aggregation results
-    comments_count: int = 0
     author_details: Optional[dict] = None 
     author_name: Optional[str] = None
     author_email: Optional[str] = None 
@@ -37,9 +55,29 @@ class CommunityPost(CommunityPostBase):
         populate_by_name = True
         arbitrary_types_allowed = True
 
+class FailedUpload(BaseModel):
+    filename: Optional[str] = None
+    error: str
+
+class CommunityPostCreated(CommunityPost):
+    failed_uploads: List[FailedUpload] = [] # Images that were rejected or didn't upload
+    pending_uploads: int = 0 # Images still uploading (wait_for_uploads=false); attached as they land
+
+class ReactionState(BaseModel):
+    """Answer to a like/dislike toggle: the post's counts and the caller's state."""
+    id: str = Field(alias="_id")
+    likes_count: int
+    dislikes_count: int
+    liked: bool
+    disliked: bool
+
+    class Config:
+        populate_by_name = True
+
 class CommunityPostPagination(BaseModel):
     items: List[dict] # Returning dicts to include joined author data cleanly
-    total: int
+    total: Optional[int] = None # None when requested with include_total=false
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None # Pass back as `cursor` for the next page
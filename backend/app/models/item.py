@@ -1,10 +1,21 @@
-from pydantic import BaseModel, Field, BeforeValidator
+from pydantic import BaseModel, Field, BeforeValidator, create_model
 from typing import Optional, List
 from typing_extensions import Annotated
 
 # Helper to map MongoDB _id to id
 PyObjectId = Annotated[str, BeforeValidator(str)]
 
+def partial_model(model: type[BaseModel]) -> type[BaseModel]:
+    """
+    Copy of `model` with every field optional, for responses built from Mongo
+    projections (sparse fieldsets) where only the requested fields are present.
+    """
+    fields = {
+        name: (Optional[info.annotation], Field(default=None, alias=info.alias))
+        for name, info in model.model_fields.items()
+    }
+    return create_model(f"Partial{model.__name__}", __config__=model.model_config, **fields)
+
 class ItemBase(BaseModel):
     title: str
     description: Optional[str] = None
@@ -32,7 +32,8 @@ class Job(JobBase):
 
 class JobPagination(BaseModel):
     items: List[Job]
-    total: int
+    total: Optional[int] = None # None when requested with include_total=false
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None # Pass back as `cursor` for the next page
@@ -26,7 +26,8 @@ class News(NewsBase):
 
 class NewsPagination(BaseModel):
     items: List[News]
-    total: int
+    total: Optional[int] = None # None when requested with include_total=false
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None # Pass back as `cursor` for the next page
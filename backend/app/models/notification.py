@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 from datetime import datetime
 from app.models.item import PyObjectId
@@ -18,6 +18,10 @@ class NotificationBase(BaseModel):
     action_label: Optional[str] = None
     action_url: Optional[str] = None
 
+class NotificationActor(BaseModel):
+    id: str
+    name: str
+
 class NotificationCreate(NotificationBase):
     user_id: str
 
@@ -28,6 +32,11 @@ class Notification(NotificationBase):
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
     user_id: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Coalesced engagement notifications (crud_notification.engagement_upsert)
+    kind: Optional[str] = None
+    post_id: Optional[str] = None
+    actor_count: Optional[int] = None
+    actors: List[NotificationActor] = [] # Latest few, oldest first
 
     class Config:
         populate_by_name = True
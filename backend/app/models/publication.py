@@ -28,7 +28,8 @@ class Publication(PublicationBase):
 
 class PublicationPagination(BaseModel):
     items: List[Publication]
-    total: int
+    total: Optional[int] = None # None when requested with include_total=false
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None # Pass back as `cursor` for the next page
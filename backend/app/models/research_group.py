@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
-from app.models.item import PyObjectId
+from app.models.item import PyObjectId, partial_model
 from enum import Enum
 
 class GroupRole(str, Enum):
@@ -13,11 +13,23 @@ class GroupMember(BaseModel):
     role: GroupRole = GroupRole.MEMBER
     joined_at: datetime = Field(default_factory=datetime.utcnow)
     last_read_at: datetime = Field(default_factory=datetime.utcnow)
+    # Messages from others since last_read_at, kept by crud_research_group
+    unread_count: int = 0
 
 class GroupMemberDetail(GroupMember):
     name: str
     avatar_url: Optional[str] = None
 
+class LastMessage(BaseModel):
+    """Preview of a group's newest message, denormalized onto the group."""
+    # timestamp first: crud_research_group relies on $max comparing it first
+    timestamp: datetime
+    id: Optional[PyObjectId] = None
+    user_id: str
+    user_name: str
+    content: str
+    has_audio: bool = False
+
 class ResearchGroupBase(BaseModel):
     name: str
     topic: str
@@ -38,6 +50,8 @@ class ResearchGroupInDB(ResearchGroupBase):
     created_by: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
     members: List[GroupMember] = []
+    last_message: Optional[LastMessage] = None
+    image_variants: Optional[Dict[str, str]] = None # size -> WebP URL, set by the upload pipeline
     
     class Config:
         populate_by_name = True
@@ -48,6 +62,15 @@ class ResearchGroup(ResearchGroupInDB):
     members: List[GroupMemberDetail] # Override to include details
     pass
 
+class ResearchGroupListing(ResearchGroup):
+    """Listing view of a whole group (fields=*), with the caller's unread count."""
+    unread_count: Optional[int] = None
+
+class ResearchGroupSummary(partial_model(ResearchGroup)):
+    """Listing view of a group: only the projected fields are set."""
+    member_count: Optional[int] = None
+    unread_count: Optional[int] = None
+
 # Invitation
 class InvitationStatus(str, Enum):
     PENDING = "pending"
@@ -1,8 +1,8 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 from enum import Enum
-from app.models.item import PyObjectId
+from app.models.item import PyObjectId, partial_model
 
 class UserRole(str, Enum):
     ADMIN = "admin"
@@ -38,6 +38,7 @@ class UserUpdate(UserBase):
 
 class UserInDBBase(UserBase):
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    profile_image_variants: Optional[Dict[str, str]] = None  # size -> WebP URL, set by the upload pipeline
     
     @property
     def access_weight(self) -> int:
@@ -52,3 +53,5 @@ class User(UserInDBBase):
 
 class UserInDB(UserInDBBase):
     hashed_password: str
+
+UserSummary = partial_model(User)
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.db.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditSink:
+    """
+    In-process buffer for activity_logs entries.
+
+    Requests enqueue entries without waiting on MongoDB; a background task writes
+    them with insert_many once `batch_size` entries are queued or `flush_interval`
+    seconds have passed. When the queue is full new entries are dropped (and counted)
+    rather than slowing requests down.
+    """
+
+    def __init__(self, max_queue_size: int, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def enqueue(self, entry: dict) -> bool:
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Flush whatever is still queued and stop the writer.
+        """
+        if self._task is not None and not self._task.done():
+            await self._queue.put(_STOP)
+            await self._task
+        self._task = None
+        while not self._queue.empty():
+            await self._write(self._drain(self.batch_size))
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await self._queue.get()
+            if entry is _STOP:
+                return
+            batch = [entry]
+            deadline = loop.time() + self.flush_interval
+            stopping = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            await self._write(batch)
+            if stopping:
+                return
+
+    def _drain(self, limit: int) -> list[dict]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            entry = self._queue.get_nowait()
+            if entry is not _STOP:
+                batch.append(entry)
+        return batch
+
+    async def _write(self, batch: list[dict]) -> None:
+        if not batch:
+            return
+        try:
+            db = await get_database()
+            await db["activity_logs"].insert_many(batch, ordered=False)
+            self.flushed += len(batch)
+        except Exception as e:
+            # Audit logging must never take the API down
+            self.failed += len(batch)
+            logger.error(f"Audit log flush failed ({len(batch)} entries): {e}")
+
+
+audit_sink = AuditSink(
+    max_queue_size=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
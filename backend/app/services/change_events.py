@@ -0,0 +1,309 @@
+"""
+In-process bus for write events, fed by a MongoDB change stream.
+
+One consumer per worker tails the `research_lab` database and hands each
+insert/update/replace/delete to the subscribers registered for that
+collection, so reacting to writes (cache invalidation, chat fan-out, live
+notifications, search indexing) doesn't need hooks in every handler, and
+sees writes made by other workers too.
+
+The last resume token is persisted to `change_stream_tokens` so a restart
+picks up where the previous process stopped. Change streams need a replica
+set; against a standalone server the consumer logs a warning and stays idle.
+
+Watch events locally against a single-node replica set:
+    mongod --replSet rs0 --dbpath /tmp/rs0 --port 27017
+    mongosh --eval 'rs.initiate()'
+    MONGODB_URL="mongodb://localhost:27017/?replicaSet=rs0" python -m app.services.change_events
+
+and check delivery, field lists and resuming against it with
+benchmarks/bench_change_events.py.
+"""
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Iterable, Optional, Union
+
+from bson import Timestamp
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.config import settings
+from app.db.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+TOKENS_COLLECTION = "change_stream_tokens"
+OPERATIONS = ("insert", "update", "replace", "delete")
+# Never published: the bus's own bookkeeping and high-volume logs nobody reacts to
+IGNORED_COLLECTIONS = (TOKENS_COLLECTION, "activity_logs", "versions")
+
+# Server error codes
+NOT_REPLICA_SET = 40573
+CHANGE_STREAM_FATAL = 280
+CHANGE_STREAM_HISTORY_LOST = 286
+
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    collection: str
+    op: str  # insert | update | replace | delete
+    document_id: Any
+    # Top-level fields written: all of them for insert/replace, the $set ones for update
+    changed_fields: tuple[str, ...] = ()
+    removed_fields: tuple[str, ...] = ()
+    cluster_time: Optional[Timestamp] = None
+
+    def only_changed(self, *fields: str) -> bool:
+        """
+        True for an update that touched nothing but `fields` (e.g. a view counter).
+        """
+        return self.op == "update" and not self.removed_fields and set(self.changed_fields) <= set(fields)
+
+
+Handler = Callable[[ChangeEvent], Union[None, Awaitable[None]]]
+
+
+@dataclass
+class _Subscription:
+    handler: Handler
+    collections: Optional[frozenset]
+    ops: Optional[frozenset]
+
+    def wants(self, event: ChangeEvent) -> bool:
+        return (self.collections is None or event.collection in self.collections) and (
+            self.ops is None or event.op in self.ops
+        )
+
+
+class ChangeEventBus:
+    """
+    Tails the database change stream and dispatches ChangeEvents in stream order.
+
+    Handlers run on the consumer task, one event at a time, so they should be
+    quick (update a cache, enqueue work); a handler that raises is logged and
+    skipped without stopping the stream. Delivery is at-least-once across
+    restarts: events after the last saved token are replayed.
+    """
+
+    def __init__(
+        self,
+        consumer: str,
+        collections: Optional[Iterable[str]] = None,
+        token_save_interval: float = 5.0,
+        max_await_ms: int = 1000,
+    ):
+        self.consumer = consumer
+        self.collections = tuple(collections) if collections else None
+        self.token_save_interval = token_save_interval
+        self.max_await_ms = max_await_ms
+        self._subscriptions: list[_Subscription] = []
+        self._task: Optional[asyncio.Task] = None
+        self._token: Optional[dict] = None
+        self._saved_token: Optional[dict] = None
+        self.running = False
+        self.unavailable: Optional[str] = None
+        self.received = 0
+        self.dispatched = 0
+        self.handler_errors = 0
+        self.restarts = 0
+        self.last_event_at: Optional[datetime] = None
+
+    def subscribe(
+        self,
+        handler: Handler,
+        collections: Optional[Iterable[str]] = None,
+        ops: Optional[Iterable[str]] = None,
+    ) -> Callable[[], None]:
+        """
+        Register `handler` (sync or async) for events on `collections` and
+        `ops`, or all of them when omitted. Returns a function that unsubscribes.
+        """
+        subscription = _Subscription(
+            handler,
+            frozenset(collections) if collections else None,
+            frozenset(ops) if ops else None,
+        )
+        self._subscriptions.append(subscription)
+
+        def unsubscribe() -> None:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+        return unsubscribe
+
+    async def publish(self, event: ChangeEvent) -> None:
+        for subscription in list(self._subscriptions):
+            if not subscription.wants(event):
+                continue
+            try:
+                result = subscription.handler(event)
+                if inspect.isawaitable(result):
+                    await result
+                self.dispatched += 1
+            except Exception as e:
+                self.handler_errors += 1
+                logger.error(f"Change event handler {subscription.handler!r} failed on {event.collection}/{event.op}: {e}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self.unavailable = None
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop tailing and persist the last resume token.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self._save_token()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "unavailable": self.unavailable,
+            "subscribers": len(self._subscriptions),
+            "received": self.received,
+            "dispatched": self.dispatched,
+            "handler_errors": self.handler_errors,
+            "restarts": self.restarts,
+            "last_event_at": self.last_event_at.isoformat() if self.last_event_at else None,
+        }
+
+    def pipeline(self) -> list[dict]:
+        """
+        Filter to the watched collections and reduce each change to its field
+        names, so document bodies never travel over the stream.
+        """
+        match: dict = {"operationType": {"$in": list(OPERATIONS)}}
+        if self.collections:
+            match["ns.coll"] = {"$in": [c for c in self.collections if c not in IGNORED_COLLECTIONS]}
+        else:
+            match["ns.coll"] = {"$nin": list(IGNORED_COLLECTIONS)}
+        return [
+            {"$match": match},
+            {"$project": {
+                "operationType": 1,
+                "ns": 1,
+                "documentKey": 1,
+                "clusterTime": 1,
+                "changed": {"$map": {
+                    "input": {"$objectToArray": {
+                        "$ifNull": ["$updateDescription.updatedFields", {"$ifNull": ["$fullDocument", {}]}],
+                    }},
+                    "in": "$$this.k",
+                }},
+                "removed": {"$ifNull": ["$updateDescription.removedFields", []]},
+            }},
+        ]
+
+    async def _run(self) -> None:
+        db = await get_database()
+        if self._token is None:
+            saved = await db[TOKENS_COLLECTION].find_one({"_id": self.consumer})
+            self._token = self._saved_token = saved["token"] if saved else None
+
+        delay = 1.0
+        try:
+            while True:
+                try:
+                    await self._tail(db)
+                    return
+                except OperationFailure as e:
+                    if e.code == NOT_REPLICA_SET:
+                        self.unavailable = "change streams need a replica set"
+                        logger.warning(f"Change event bus disabled: {e}")
+                        return
+                    if e.code in (CHANGE_STREAM_HISTORY_LOST, CHANGE_STREAM_FATAL) and self._token is not None:
+                        # The oplog has moved past the saved token; events in between are lost
+                        logger.warning(f"Change stream cannot resume ({e}); restarting from now")
+                        self._token = None
+                        continue
+                    logger.error(f"Change stream failed: {e}")
+                except PyMongoError as e:
+                    logger.error(f"Change stream interrupted: {e}")
+                self.restarts += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY_SECONDS)
+        finally:
+            self.running = False
+
+    async def _tail(self, db) -> None:
+        async with db.watch(
+            self.pipeline(),
+            resume_after=self._token,
+            max_await_time_ms=self.max_await_ms,
+        ) as stream:
+            self.running = True
+            last_save = time.monotonic()
+            while stream.alive:
+                change = await stream.try_next()
+                if change is not None:
+                    self.received += 1
+                    self.last_event_at = datetime.utcnow()
+                    await self.publish(to_event(change))
+                # Advances on idle batches too, so a quiet stream doesn't resume from far back
+                self._token = stream.resume_token
+                if time.monotonic() - last_save >= self.token_save_interval:
+                    await self._save_token()
+                    last_save = time.monotonic()
+
+    async def _save_token(self) -> None:
+        if self._token is None or self._token == self._saved_token:
+            return
+        try:
+            db = await get_database()
+            await db[TOKENS_COLLECTION].update_one(
+                {"_id": self.consumer},
+                {"$set": {"token": self._token, "updated_at": datetime.utcnow()}},
+                upsert=True,
+            )
+            self._saved_token = self._token
+        except Exception as e:
+            logger.error(f"Saving change stream resume token failed: {e}")
+
+
+def to_event(change: dict) -> ChangeEvent:
+    return ChangeEvent(
+        collection=change["ns"]["coll"],
+        op=change["operationType"],
+        document_id=change.get("documentKey", {}).get("_id"),
+        changed_fields=tuple(change.get("changed") or ()),
+        removed_fields=tuple(change.get("removed") or ()),
+        cluster_time=change.get("clusterTime"),
+    )
+
+
+change_events = ChangeEventBus(
+    consumer=settings.CHANGE_EVENTS_CONSUMER,
+    collections=[c.strip() for c in settings.CHANGE_EVENTS_COLLECTIONS.split(",") if c.strip()],
+    token_save_interval=settings.CHANGE_EVENTS_TOKEN_SAVE_SECONDS,
+)
+
+
+if __name__ == "__main__":
+    from app.db.mongodb import connect_to_mongo, close_mongo_connection
+
+    async def tail() -> None:
+        await connect_to_mongo()
+        # A separate consumer name so tailing never moves the API's saved position
+        bus = ChangeEventBus(consumer=f"{settings.CHANGE_EVENTS_CONSUMER}-cli", collections=change_events.collections)
+        bus.subscribe(print)
+        bus.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await bus.stop()
+            await close_mongo_connection()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(tail())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.crud.crud_notification import engagement_upsert
+from app.db.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+Group = Tuple[str, str, str]  # (recipient user_id, post_id, kind)
+
+
+class EngagementNotifier:
+    """
+    Coalesces like/comment notifications for a post author.
+
+    Requests record events in memory; every `flush_interval` seconds (or once
+    `max_pending` groups are buffered) each (recipient, post, kind) group is
+    written as one upsert into the notification for its `window`-second time
+    bucket, which carries the actor count and the latest names. A post liked
+    a hundred times in a flush interval costs one write, and its author sees
+    one "Ana, Bo and 98 others liked your post." instead of a hundred entries.
+
+    Events buffered when the process dies are lost; these are courtesy
+    notifications, so that is traded for not writing on every like.
+    """
+
+    def __init__(self, window: int, flush_interval: float, max_pending: int, names_shown: int, ids_tracked: int):
+        self.window = window
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.names_shown = names_shown
+        self.ids_tracked = ids_tracked
+        self._pending: Dict[Group, Dict[str, str]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self.recorded = 0
+        self.writes = 0
+        self.failed = 0
+
+    def record(self, user_id: str, post_id: str, kind: str, actor_id: str, actor_name: str) -> None:
+        """
+        Buffer one event. Self-engagement is ignored.
+        """
+        if user_id == actor_id:
+            return
+        actors = self._pending.setdefault((user_id, post_id, kind), {})
+        # Re-inserting moves a repeat actor to the end, so the latest names win
+        actors.pop(actor_id, None)
+        actors[actor_id] = actor_name
+        self.recorded += 1
+        if len(self._pending) >= self.max_pending:
+            self._wake.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the writer and flush whatever is still buffered.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "writes": self.writes,
+            "failed": self.failed,
+            "window_seconds": self.window,
+        }
+
+    async def flush(self) -> int:
+        """
+        Write every buffered group. Returns the number of upserts sent.
+        """
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        now = datetime.utcnow()
+        bucket = int(time.time() // self.window)
+        operations = [
+            engagement_upsert(user_id, post_id, kind, actors, bucket, now, self.names_shown, self.ids_tracked)
+            for (user_id, post_id, kind), actors in pending.items()
+        ]
+        try:
+            db = await get_database()
+            try:
+                await db["notifications"].bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                # Another worker upserted the same group first; the retry updates its document
+                retry = [operations[err["index"]] for err in e.details.get("writeErrors", []) if err.get("code") == DUPLICATE_KEY]
+                if len(retry) < len(e.details.get("writeErrors", [])):
+                    raise
+                await db["notifications"].bulk_write(retry, ordered=False)
+            self.writes += len(operations)
+        except Exception as e:
+            self.failed += len(operations)
+            logger.error(f"Engagement notification flush failed ({len(operations)} groups): {e}")
+        return len(operations)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+
+engagement_notifications = EngagementNotifier(
+    window=settings.ENGAGEMENT_NOTIFY_WINDOW_SECONDS,
+    flush_interval=settings.ENGAGEMENT_NOTIFY_FLUSH_SECONDS,
+    max_pending=settings.ENGAGEMENT_NOTIFY_MAX_PENDING,
+    names_shown=settings.ENGAGEMENT_NOTIFY_NAMES_SHOWN,
+    ids_tracked=settings.ENGAGEMENT_NOTIFY_IDS_TRACKED,
+)
@@ -0,0 +1,124 @@
+import asyncio
+import re
+import time
+import logging
+from typing import Any, Mapping, Optional
+
+import httpx
+from google.auth import jwt as google_jwt
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleTokenVerifier:
+    """
+    Verifies Google ID tokens without blocking the event loop.
+
+    The signing certificates are fetched with an async client and cached for the
+    Cache-Control max-age Google sends. Shortly before they expire they are refreshed
+    in the background, so logins keep using the cached set instead of waiting on Google.
+    """
+
+    def __init__(
+        self,
+        certs_url: str,
+        audience: Optional[str],
+        default_ttl: int = 3600,
+        refresh_margin: int = 300,
+        min_forced_refresh_interval: int = 60,
+        timeout: float = 5.0,
+    ):
+        self.certs_url = certs_url
+        self.audience = audience
+        self.default_ttl = default_ttl
+        self.refresh_margin = refresh_margin
+        self.min_forced_refresh_interval = min_forced_refresh_interval
+        self.timeout = timeout
+        self._certs: Optional[Mapping[str, str]] = None
+        self._expires_at: float = 0.0
+        self._refresh_at: float = 0.0
+        self._fetched_at: float = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def verify(self, token: str) -> Mapping[str, Any]:
+        """
+        Verify signature, audience, expiry and issuer. Raises ValueError if the token is invalid.
+        """
+        key_id = google_jwt.decode_header(token).get("kid")
+        certs = await self.get_certs()
+        if key_id and key_id not in certs and time.monotonic() - self._fetched_at > self.min_forced_refresh_interval:
+            # Google rotated its keys before our cached set expired
+            certs = await self.get_certs(force_refresh=True)
+
+        id_info = await asyncio.to_thread(
+            google_jwt.decode, token, certs=certs, audience=self.audience
+        )
+        if id_info.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {id_info.get('iss')}")
+        return id_info
+
+    async def get_certs(self, force_refresh: bool = False) -> Mapping[str, str]:
+        now = time.monotonic()
+        if not force_refresh and self._certs is not None and now < self._expires_at:
+            if now >= self._refresh_at:
+                self._schedule_refresh()
+            return self._certs
+
+        async with self._lock:
+            # Another request may have refreshed while we waited for the lock
+            if not force_refresh and self._certs is not None and time.monotonic() < self._expires_at:
+                return self._certs
+            await self._fetch()
+            return self._certs
+
+    async def close(self) -> None:
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            async with self._lock:
+                if time.monotonic() < self._refresh_at:
+                    return
+                await self._fetch()
+        except Exception as e:
+            # Keep serving the cached set until it actually expires
+            logger.warning(f"Background refresh of Google certs failed: {e}")
+
+    async def _fetch(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._client.get(self.certs_url)
+        response.raise_for_status()
+        self._certs = response.json()
+        max_age = self._parse_max_age(response.headers.get("cache-control"))
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + max_age
+        self._refresh_at = self._expires_at - min(self.refresh_margin, max_age / 4)
+
+    def _parse_max_age(self, cache_control: Optional[str]) -> int:
+        if cache_control:
+            match = _MAX_AGE_RE.search(cache_control)
+            if match:
+                return int(match.group(1))
+        return self.default_ttl
+
+
+google_verifier = GoogleTokenVerifier(
+    certs_url=settings.GOOGLE_CERTS_URL,
+    audience=settings.GOOGLE_CLIENT_ID,
+)
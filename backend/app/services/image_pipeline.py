@@ -0,0 +1,191 @@
+"""
+Upload-time image derivatives.
+
+Each uploaded image is decoded once, in a process pool (Pillow is CPU-bound and
+holds the GIL), and re-encoded as:
+
+    <prefix>/<image_id>/original.<ext>   full size, same format, metadata stripped
+    <prefix>/<image_id>/64.webp          fits in 64x64   (avatar bubbles)
+    <prefix>/<image_id>/256.webp         fits in 256x256 (cards, group images)
+    <prefix>/<image_id>/1024.webp        fits in 1024x1024 (feed images)
+
+EXIF orientation is applied to the pixels before any metadata is dropped, so
+nothing (GPS, camera, timestamps) reaches the bucket. Images are never upscaled:
+a variant larger than the source is the source size. Owning documents keep the
+original URL where they always did and the variant URLs alongside it
+(`profile_image_variants`, `image_variants`), keyed by size.
+"""
+import asyncio
+import io
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import settings
+
+VARIANT_SIZES = (64, 256, 1024)
+AVATAR_SIZE = 64
+
+# Formats kept as-is for the original; anything else is stored as PNG
+_ORIGINAL_FORMATS = {"JPEG": ("jpg", "image/jpeg"), "PNG": ("png", "image/png"), "WEBP": ("webp", "image/webp")}
+# Animated originals stay animated, in their own format (APNG is format PNG)
+_ANIMATED_FORMATS = {"GIF": ("gif", "image/gif"), "PNG": ("png", "image/png"), "WEBP": ("webp", "image/webp")}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+class InvalidImage(ValueError):
+    """The upload could not be decoded as an image, or is too large to decode."""
+
+
+@dataclass
+class Rendition:
+    name: str  # "original" or the variant size
+    data: bytes
+    extension: str
+    content_type: str
+
+
+@dataclass
+class StoredImage:
+    filename: Optional[str]
+    url: Optional[str] = None  # the original
+    variants: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def render(data: bytes, sizes: Tuple[int, ...], quality: int, max_pixels: int) -> List[Rendition]:
+    """
+    Decode once and encode the original and every variant. Runs in a worker process.
+    """
+    # Pillow itself only refuses images over twice this; the size check below enforces it exactly
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    renditions = []
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            # Only the header has been read so far
+            if source.size[0] * source.size[1] > max_pixels:
+                raise InvalidImage("Image is too large")
+            source_format = source.format
+            if getattr(source, "is_animated", False) and source_format in _ANIMATED_FORMATS:
+                renditions.append(_animated_original(source, source_format))
+            image = ImageOps.exif_transpose(source)
+            image.load()
+    except Image.DecompressionBombError:
+        raise InvalidImage("Image is too large")
+    except (UnidentifiedImageError, OSError):
+        raise InvalidImage("Not a readable image")
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+
+    if not renditions:
+        extension, content_type = _ORIGINAL_FORMATS.get(source_format, _ORIGINAL_FORMATS["PNG"])
+        original_format = source_format if source_format in _ORIGINAL_FORMATS else "PNG"
+        if original_format == "JPEG" and image.mode == "RGBA":
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        # No exif/icc/xmp arguments: the encoders then write no metadata
+        image.save(buffer, format=original_format, **({"quality": 95} if original_format != "PNG" else {}))
+        renditions.append(Rendition("original", buffer.getvalue(), extension, content_type))
+
+    for size in sizes:
+        variant = image.copy()
+        variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        variant.save(buffer, format="WEBP", quality=quality, method=4)
+        renditions.append(Rendition(str(size), buffer.getvalue(), "webp", "image/webp"))
+    return renditions
+
+
+def _animated_original(source: Image.Image, source_format: str) -> Rendition:
+    """
+    Re-encode every frame in the source format. Animated WebP/APNG drop their
+    EXIF and XMP on save; a GIF would keep its comment unless told otherwise.
+    """
+    extension, content_type = _ANIMATED_FORMATS[source_format]
+    buffer = io.BytesIO()
+    options = {"comment": b""} if source_format == "GIF" else {}
+    source.save(buffer, format=source_format, save_all=True, **options)
+    source.seek(0)
+    return Rendition("original", buffer.getvalue(), extension, content_type)
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn, not fork: the API process runs threads (Motor, upload pool) that fork would copy mid-state
+        _pool = ProcessPoolExecutor(max_workers=settings.IMAGE_PIPELINE_WORKERS, mp_context=get_context("spawn"))
+    return _pool
+
+
+async def store_image(
+    data: bytes,
+    prefix: str,
+    filename: Optional[str] = None,
+    limit: Optional[asyncio.Semaphore] = None,
+) -> StoredImage:
+    """
+    Render and upload the original and variants of one image under
+    `<prefix>/<new id>/`. Uploads hold `limit` (the caller's per-request cap)
+    when given, S3_UPLOAD_PER_REQUEST otherwise. Raises InvalidImage for an
+    undecodable upload and the storage error if any rendition fails to
+    upload, after deleting the renditions that did land.
+    """
+    # Imported here so pool workers, which only render, never build a storage client
+    from app.services.s3 import UploadRequest, s3_service
+
+    loop = asyncio.get_running_loop()
+    renditions = await loop.run_in_executor(
+        _executor(), render, data, VARIANT_SIZES, settings.IMAGE_WEBP_QUALITY, settings.IMAGE_MAX_PIXELS
+    )
+    base = f"{prefix}/{uuid.uuid4()}"
+    results = await s3_service.upload_many([
+        UploadRequest(io.BytesIO(r.data), f"{base}/{r.name}.{r.extension}", r.content_type, filename)
+        for r in renditions
+    ], settings.S3_UPLOAD_PER_REQUEST, limit=limit)
+    failed = next((r for r in results if not r.ok), None)
+    if failed:
+        await asyncio.gather(*(s3_service.delete_object_async(r.object_name) for r in results if r.ok))
+        raise RuntimeError(f"Upload of {failed.object_name} failed: {failed.error}")
+    urls = {r.name: result.url for r, result in zip(renditions, results)}
+    return StoredImage(filename=filename, url=urls.pop("original"), variants=urls)
+
+
+async def store_images(items: List[Tuple[Optional[str], bytes]], prefix: str, concurrency: int) -> List[StoredImage]:
+    """
+    store_image for several (filename, data) uploads. Rendering is bounded by
+    the process pool; the uploads of every image share one `concurrency` cap.
+    Never raises: each result carries its URLs or its error, in order.
+    """
+    limit = asyncio.Semaphore(max(concurrency, 1))
+
+    async def store(filename: Optional[str], data: bytes) -> StoredImage:
+        try:
+            return await store_image(data, prefix, filename, limit)
+        except Exception as e:
+            return StoredImage(filename=filename, error=str(e) or type(e).__name__)
+
+    return await asyncio.gather(*(store(filename, data) for filename, data in items))
+
+
+def variant_url(url: Optional[str], variants: Optional[Dict[str, str]], size: int) -> Optional[str]:
+    """
+    The `size` variant when the image has one, else the original (images uploaded before variants existed).
+    """
+    return (variants or {}).get(str(size)) or url
+
+
+def shutdown_image_pipeline() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -1,19 +1,69 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
 import boto3
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, ClientError
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# boto3 is blocking; uploads run here so they never stall the event loop. The
+# pool size is the worker-wide cap on concurrent PUTs.
+_upload_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _upload_executor
+    if _upload_executor is None:
+        _upload_executor = ThreadPoolExecutor(
+            max_workers=settings.S3_UPLOAD_WORKERS,
+            thread_name_prefix="s3-upload",
+        )
+    return _upload_executor
+
+
+@dataclass
+class UploadRequest:
+    file_obj: Any
+    object_name: str
+    content_type: Optional[str] = None
+    filename: Optional[str] = None  # as the client named it, for error reports
+
+
+@dataclass
+class UploadResult:
+    filename: Optional[str]
+    object_name: str
+    url: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class S3Service:
-    def __init__(self):
+    """
+    Spaces (S3-compatible) storage. Pass `client` and `bucket_name` to use
+    another S3 endpoint, e.g. a moto mock in tests.
+    """
+
+    def __init__(self, client=None, bucket_name: Optional[str] = None):
         self.access_key = settings.SPACES_ACCESS_KEY
         self.secret_key = settings.SPACES_SECRET_KEY
-        self.bucket_name = settings.SPACES_BUCKET_NAME
+        self.bucket_name = bucket_name or settings.SPACES_BUCKET_NAME
         self.region = settings.SPACES_REGION_NAME
         self.endpoint_url = settings.SPACES_ENDPOINT_URL
-        
-        if not all([self.access_key, self.secret_key, self.bucket_name, self.region, self.endpoint_url]):
+
+        if client is not None:
+            self.s3_client = client
+            self.endpoint_url = None
+        elif not all([self.access_key, self.secret_key, self.bucket_name, self.region, self.endpoint_url]):
             logger.warning("DigitalOcean Spaces credentials not fully configured.")
             self.s3_client = None
         else:
@@ -23,7 +73,9 @@ class S3Service:
                     aws_access_key_id=self.access_key,
                     aws_secret_access_key=self.secret_key,
                     region_name=self.region,
-                    endpoint_url=self.endpoint_url
+                    endpoint_url=self.endpoint_url,
+                    # Enough connections for every upload thread (the default is 10)
+                    config=Config(max_pool_connections=settings.S3_UPLOAD_WORKERS),
                 )
             except Exception as e:
                 logger.error(f"Failed to initialize Boto3 client for Spaces: {e}")
@@ -62,12 +114,49 @@ class S3Service:
             logger.error(f"Unexpected error uploading to Spaces: {e}")
             raise e
 
+    async def upload_file_async(self, file_obj, object_name: str, content_type: str = None) -> str:
+        """
+        upload_file on the upload pool, without blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _executor(), functools.partial(self.upload_file, file_obj, object_name, content_type=content_type)
+        )
+
+    async def upload_many(
+        self,
+        uploads: List[UploadRequest],
+        concurrency: int,
+        limit: Optional[asyncio.Semaphore] = None,
+    ) -> List[UploadResult]:
+        """
+        Upload concurrently, at most `concurrency` at a time for this call (the
+        pool caps the worker as a whole). Pass `limit` to share one cap across
+        several calls made for the same request. Never raises: each result
+        carries either its URL or the error, in the order of `uploads`.
+        """
+        limit = limit or asyncio.Semaphore(max(concurrency, 1))
+
+        async def upload(item: UploadRequest) -> UploadResult:
+            result = UploadResult(filename=item.filename, object_name=item.object_name)
+            async with limit:
+                try:
+                    result.url = await self.upload_file_async(item.file_obj, item.object_name, item.content_type)
+                except Exception as e:
+                    result.error = str(e) or type(e).__name__
+            return result
+
+        return await asyncio.gather(*(upload(item) for item in uploads))
+
     def get_file_url(self, object_name: str) -> str:
         """
         Generates the public URL for a given object name.
         """
         if not self.endpoint_url:
-            return ""
+            if self.s3_client is None:
+                return ""
+            # Injected client: path-style URL on its own endpoint
+            return f"{self.s3_client.meta.endpoint_url}/{self.bucket_name}/{object_name}"
             
         # Construct the public URL
         # Format: https://<bucket>.<region>.digitaloceanspaces.com/<key>
@@ -118,6 +207,13 @@ class S3Service:
             logger.error(f"Failed to delete object from S3: {e}")
             return False
     
+    async def delete_object_async(self, object_name: str) -> bool:
+        """
+        delete_object on the upload pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor(), self.delete_object, object_name)
+
     def get_object_metadata(self, object_name: str) -> dict:
         """
         Get metadata (including ContentLength) of an object.
@@ -135,4 +231,11 @@ class S3Service:
             return None
 
 
+def shutdown_uploads() -> None:
+    global _upload_executor
+    if _upload_executor is not None:
+        _upload_executor.shutdown(wait=False, cancel_futures=True)
+        _upload_executor = None
+
+
 s3_service = S3Service()
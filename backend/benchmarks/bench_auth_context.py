@@ -0,0 +1,85 @@
+"""
+Measures the JWT work saved by decoding each request's token once.
+
+Drives an authenticated mutating route through AuthContextMiddleware and the
+real get_current_active_user dependency (principal cache pre-seeded, so no
+MongoDB is needed) and reports decodes per request and the time per decode.
+Before the shared auth context, a mutating request decoded its token twice
+(AuditMiddleware + get_current_user) and a chat WebSocket once more per connect.
+
+Usage (from backend/):
+    python -m benchmarks.bench_auth_context [--requests 2000]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from jose import jwt  # noqa: E402
+
+from app.api import deps  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.auth_context import auth_stats  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.principal_cache import principal_cache  # noqa: E402
+from app.db.mongodb import get_database  # noqa: E402
+from app.middleware.auth_context import AuthContextMiddleware  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+LEGACY_DECODES_PER_WRITE = 2
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AuthContextMiddleware)
+    # Principals come from the seeded cache; no database round trip is made
+    app.dependency_overrides[get_database] = lambda: None
+
+    @app.post("/write")
+    async def write(current_user: User = Depends(deps.get_current_active_user)):
+        return {"ok": True}
+
+    return app
+
+
+def time_decode(token: str, rounds: int = 2000) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    email = "bench@example.com"
+    principal_cache.set(email, User(_id="0" * 24, email=email))
+    token = security.create_access_token(email)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client = TestClient(build_app())
+    client.post("/write", headers=headers)  # warm up
+    auth_stats.update(decodes=0, reused=0)
+
+    for _ in range(args.requests):
+        client.post("/write", headers=headers)
+
+    decodes_per_request = auth_stats["decodes"] / args.requests
+    decode_us = time_decode(token)
+    saved = (LEGACY_DECODES_PER_WRITE - decodes_per_request) * decode_us
+
+    print(f"Requests:             {args.requests}")
+    print(f"Decodes per request:  {decodes_per_request:.2f} (was {LEGACY_DECODES_PER_WRITE})")
+    print(f"Context reuses:       {auth_stats['reused']}")
+    print(f"Cost per decode:      {decode_us:.1f} us")
+    print(f"Saved per write:      {saved:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Change-event bus (app.services.change_events) against a real change stream.
+
+Checks, exiting non-zero if one misbehaves:
+  - insert, update and delete on a scratch collection reach a subscriber in
+    order, with the document id and the top-level fields written;
+  - only_changed() is true for a counter-only update and false otherwise;
+  - a bus restarted under the same consumer name resumes from its saved token
+    and delivers the writes made while it was stopped.
+
+Then times write-to-handler delivery for `--events` inserts.
+
+Needs a MongoDB replica set; a single node will do:
+    mongod --replSet rs0 --dbpath /tmp/rs0 --port 27017
+    mongosh --eval 'rs.initiate()'
+    MONGODB_URL="mongodb://localhost:27017/?replicaSet=rs0" python -m benchmarks.bench_change_events
+
+Writes to the `bench_change_events` collection of the app database and drops
+it, and its consumer's resume token, afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_change_events [--events 200]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017/?replicaSet=rs0")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+from bson import ObjectId  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+from pymongo.errors import PyMongoError  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db import mongodb  # noqa: E402
+from app.services.change_events import TOKENS_COLLECTION, ChangeEvent, ChangeEventBus  # noqa: E402
+
+COLLECTION = "bench_change_events"
+CONSUMER = "bench-change-events"
+TIMEOUT = 10.0
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def started(consumer: str, received: asyncio.Queue) -> ChangeEventBus:
+    """
+    A bus on the scratch collection, once its stream is open.
+    """
+    bus = ChangeEventBus(consumer=consumer, collections=[COLLECTION], max_await_ms=100)
+    bus.subscribe(lambda event: received.put_nowait((time.perf_counter(), event)))
+    bus.start()
+    deadline = time.monotonic() + TIMEOUT
+    while not bus.running:
+        if bus.unavailable:
+            await bus.stop()
+            sys.exit(f"Change streams are unavailable ({bus.unavailable}); point MONGODB_URL at a replica set")
+        if time.monotonic() > deadline:
+            await bus.stop()
+            sys.exit(f"The change stream did not open within {TIMEOUT:g}s; is MongoDB reachable at MONGODB_URL?")
+        await asyncio.sleep(0.05)
+    return bus
+
+
+async def next_event(received: asyncio.Queue) -> ChangeEvent:
+    try:
+        _, event = await asyncio.wait_for(received.get(), TIMEOUT)
+    except asyncio.TimeoutError:
+        raise AssertionError(f"no event within {TIMEOUT:g}s")
+    return event
+
+
+async def check_events(collection, received: asyncio.Queue) -> None:
+    doc_id = ObjectId()
+    await collection.insert_one({"_id": doc_id, "title": "Draft", "views": 0})
+    await collection.update_one({"_id": doc_id}, {"$inc": {"views": 1}})
+    await collection.update_one({"_id": doc_id}, {"$set": {"title": "Final"}, "$unset": {"views": ""}})
+    await collection.delete_one({"_id": doc_id})
+
+    inserted = await next_event(received)
+    assert (inserted.collection, inserted.op, inserted.document_id) == (COLLECTION, "insert", doc_id), inserted
+    assert set(inserted.changed_fields) == {"_id", "title", "views"}, inserted
+
+    counted = await next_event(received)
+    assert counted.op == "update" and counted.changed_fields == ("views",), counted
+    assert counted.only_changed("views", "likes"), "a counter-only update should be only_changed"
+
+    edited = await next_event(received)
+    assert edited.op == "update" and edited.changed_fields == ("title",) and edited.removed_fields == ("views",), edited
+    assert not edited.only_changed("views", "title"), "an update removing a field should not be only_changed"
+
+    deleted = await next_event(received)
+    assert (deleted.op, deleted.document_id) == ("delete", doc_id), deleted
+    print("insert/update/delete delivered in order with their fields; only_changed as expected")
+
+
+async def run(events: int) -> None:
+    client = AsyncIOMotorClient(settings.MONGODB_URL, serverSelectionTimeoutMS=5000)
+    try:
+        hello = await client.admin.command("hello")
+    except PyMongoError as e:
+        sys.exit(f"Cannot reach MongoDB at MONGODB_URL: {e}")
+    if "setName" not in hello:
+        sys.exit("MongoDB is not a replica set; change streams need one (see the module docstring)")
+    mongodb.db.client = client
+    db = await mongodb.get_database()
+    collection = db[COLLECTION]
+    await db.drop_collection(COLLECTION)
+    await db[TOKENS_COLLECTION].delete_one({"_id": CONSUMER})
+
+    received: asyncio.Queue = asyncio.Queue()
+    bus = await started(CONSUMER, received)
+    try:
+        await check_events(collection, received)
+
+        await bus.stop()
+        missed = ObjectId()
+        await collection.insert_one({"_id": missed})
+        bus = await started(CONSUMER, received)
+        event = await next_event(received)
+        assert (event.op, event.document_id) == ("insert", missed), f"restart did not resume: {event}"
+        print("restart resumed from the saved token and delivered the write made while stopped")
+
+        lags = []
+        for _ in range(events):
+            written = time.perf_counter()
+            await collection.insert_one({"views": 0})
+            try:
+                delivered, _ = await asyncio.wait_for(received.get(), TIMEOUT)
+            except asyncio.TimeoutError:
+                raise AssertionError(f"no event within {TIMEOUT:g}s")
+            lags.append((delivered - written) * 1000)
+        print(
+            f"{events} inserts: write-to-handler p50 {statistics.median(lags):6.2f} ms, "
+            f"p99 {percentile(lags, 99):6.2f} ms, max {max(lags):6.2f} ms"
+        )
+    finally:
+        await bus.stop()
+        await db.drop_collection(COLLECTION)
+        await db[TOKENS_COLLECTION].delete_one({"_id": CONSUMER})
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run(args.events))
+    except AssertionError as e:
+        sys.exit(f"FAILED: {e}")
+
+
+if __name__ == "__main__":
+    main()
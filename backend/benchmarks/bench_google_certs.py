@@ -0,0 +1,215 @@
+"""
+GoogleTokenVerifier (app.services.google_auth) against a local stub cert server.
+
+The stub serves Google's v1 certs format ({kid: PEM certificate}) with a
+Cache-Control max-age, counts fetches and answers after `--delay` ms, and the
+tokens are signed with keys generated on the spot. Checks, exiting non-zero
+if one misbehaves:
+  - within max-age, every verification uses the cached certs: one fetch total;
+  - a token signed with a kid the cache doesn't know (Google rotated its keys)
+    forces one refetch and verifies, but not more often than
+    min_forced_refresh_interval, so junk kids can't hammer the cert server;
+  - close to expiry the certs are refreshed in the background: the login that
+    triggers it is answered from the cache without waiting on the fetch.
+
+Then times cold (fetching) against cached verification.
+
+Usage (from backend/):
+    python -m benchmarks.bench_google_certs [--logins 200] [--delay 100]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+from cryptography import x509  # noqa: E402
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from cryptography.x509.oid import NameOID  # noqa: E402
+from google.auth import crypt, jwt as google_jwt  # noqa: E402
+
+from app.services.google_auth import GoogleTokenVerifier  # noqa: E402
+
+AUDIENCE = "bench-client-id.apps.googleusercontent.com"
+
+
+class SigningKey:
+    def __init__(self, kid: str):
+        self.kid = kid
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+        now = datetime.utcnow()
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name).issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - timedelta(days=1)).not_valid_after(now + timedelta(days=1))
+            .sign(key, hashes.SHA256())
+        )
+        self.cert_pem = cert.public_bytes(serialization.Encoding.PEM).decode()
+        key_pem = key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        self.signer = crypt.RSASigner.from_string(key_pem, key_id=kid)
+
+    def token(self, subject: str = "1234567890") -> str:
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com", "aud": AUDIENCE, "sub": subject,
+            "email": "user@example.com", "iat": now, "exp": now + 3600,
+        }
+        return google_jwt.encode(self.signer, payload).decode()
+
+
+class StubCertServer:
+    """
+    Serves `keys` as Google's certs endpoint on a local port, in a thread.
+    """
+
+    def __init__(self, keys: list[SigningKey], max_age: int, delay: float):
+        self.keys = keys
+        self.max_age = max_age
+        self.delay = delay
+        self.fetches = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.fetches += 1
+                time.sleep(stub.delay)
+                body = json.dumps({k.kid: k.cert_pem for k in stub.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={stub.max_age}, must-revalidate, no-transform")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}/oauth2/v1/certs"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+async def check_max_age(server: StubCertServer, key: SigningKey, logins: int) -> tuple[float, list[float]]:
+    verifier = GoogleTokenVerifier(server.url, AUDIENCE)
+    try:
+        token = key.token()
+        start = time.perf_counter()
+        await verifier.verify(token)
+        cold = (time.perf_counter() - start) * 1000
+        cached = []
+        for _ in range(logins):
+            start = time.perf_counter()
+            id_info = await verifier.verify(token)
+            cached.append((time.perf_counter() - start) * 1000)
+        assert id_info["sub"] == "1234567890", id_info
+        assert server.fetches == 1, f"{server.fetches} cert fetches for {logins + 1} logins within max-age"
+    finally:
+        await verifier.close()
+    print(f"max-age caching: {logins + 1} logins, {server.fetches} cert fetch")
+    return cold, cached
+
+
+async def check_unknown_kid(server: StubCertServer, old: SigningKey) -> None:
+    verifier = GoogleTokenVerifier(server.url, AUDIENCE, min_forced_refresh_interval=0)
+    throttled = GoogleTokenVerifier(server.url, AUDIENCE, min_forced_refresh_interval=60)
+    try:
+        await verifier.verify(old.token())
+        await throttled.verify(old.token())
+        fetches = server.fetches
+
+        # Google rotates: the new key is served, the cached set doesn't have it yet
+        new = SigningKey("rotated")
+        server.keys = [old, new]
+        await verifier.verify(new.token())
+        assert server.fetches == fetches + 1, f"{server.fetches - fetches} fetches for one unknown kid"
+
+        fetches = server.fetches
+        for _ in range(5):
+            try:
+                await throttled.verify(SigningKey("unknown").token())
+                raise AssertionError("a token signed with an unserved key verified")
+            except ValueError:
+                pass
+        assert server.fetches == fetches, "unknown kids refetched the certs within min_forced_refresh_interval"
+    finally:
+        server.keys = [old]
+        await verifier.close()
+        await throttled.close()
+    print("unknown kid: one forced refetch picks up a rotated key; repeats within the interval don't refetch")
+
+
+async def check_background_refresh(server: StubCertServer, key: SigningKey) -> None:
+    # max-age 4s: refreshed from 3s (a quarter of max-age before expiry)
+    server.max_age = 4
+    verifier = GoogleTokenVerifier(server.url, AUDIENCE)
+    try:
+        token = key.token()
+        await verifier.verify(token)
+        fetches = server.fetches
+        await asyncio.sleep(3.1)
+
+        start = time.perf_counter()
+        await verifier.verify(token)
+        elapsed = time.perf_counter() - start
+        assert elapsed < server.delay, f"the refreshing login waited {elapsed * 1000:.0f} ms for the fetch"
+
+        deadline = time.monotonic() + 5
+        while server.fetches == fetches and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        assert server.fetches == fetches + 1, "the certs were not refreshed in the background"
+        # The refreshed set is good for another max-age: no further fetch
+        await asyncio.sleep(server.delay + 0.1)
+        await verifier.verify(token)
+        assert server.fetches == fetches + 1, "the refreshed certs were not cached"
+    finally:
+        await verifier.close()
+    print(f"background refresh: refreshed before expiry, the triggering login took {elapsed * 1000:.1f} ms")
+
+
+async def run(logins: int, delay: float) -> None:
+    key = SigningKey("current")
+    server = StubCertServer([key], max_age=3600, delay=delay / 1000)
+    try:
+        cold, cached = await check_max_age(server, key, logins)
+        await check_unknown_kid(server, key)
+        await check_background_refresh(server, key)
+    finally:
+        server.close()
+    print(
+        f"verify, {delay:g} ms cert server: cold {cold:7.2f} ms | cached p50 {statistics.median(cached):6.2f} ms, "
+        f"max {max(cached):6.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=100, help="milliseconds the stub cert server takes to answer")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run(args.logins, args.delay))
+    except AssertionError as e:
+        sys.exit(f"FAILED: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Research-group listing for a user who belongs to many groups: per-group queries
+against the single aggregation in crud_research_group.list_groups.
+
+The per-group plan is what GET /research-groups/ used to do: one find for the
+groups, then a users query and an unread count_documents for every group, so its
+round trips grow with the number of groups. The aggregation embeds member
+details and the caller's unread count (the counter kept on their membership)
+in one round trip.
+
+Groups are seeded without counters, as stored before they were maintained, and
+backfilled the way startup does. Before timing, the two plans must agree, and
+total_unread and mark_read must count a member listed twice in a group once.
+
+Needs a running MongoDB 5.0+ (MONGODB_URL). Writes to the
+`bench_group_listing` database and drops it afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_group_listing [--groups 50] [--members 20] [--messages 200] [--repeat 20]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+from bson import ObjectId  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.crud import crud_research_group  # noqa: E402
+from app.db.indexes import INDEXES, apply_indexes  # noqa: E402
+
+DATABASE = "bench_group_listing"
+
+
+async def seed(db, groups: int, members: int, messages: int) -> str:
+    await db.drop_collection("users")
+    await db.drop_collection("research_groups")
+    await db.drop_collection("chat_messages")
+    await apply_indexes(db, [s for s in INDEXES if s.collection in ("users", "research_groups", "chat_messages")])
+
+    user_ids = [ObjectId() for _ in range(members)]
+    await db.users.insert_many([
+        {"_id": oid, "email": f"user{i}@example.com", "full_name": f"User {i}", "hashed_password": "x"}
+        for i, oid in enumerate(user_ids)
+    ])
+    me = str(user_ids[0])
+
+    start = datetime(2024, 1, 1)
+    read_at = start + timedelta(minutes=messages // 2)
+    group_docs = [{
+        "name": f"Group {g}",
+        "topic": "benchmark",
+        "created_by": me,
+        # Stored as before unread counters existed; group 0 lists the caller twice
+        "members": [
+            {"user_id": str(oid), "role": "member", "joined_at": start, "last_read_at": read_at}
+            for oid in (user_ids + user_ids[:1] if g == 0 else user_ids)
+        ],
+        "created_at": start,
+    } for g in range(groups)]
+    result = await db.research_groups.insert_many(group_docs)
+
+    batch = []
+    for gid in result.inserted_ids:
+        for m in range(messages):
+            batch.append({
+                "group_id": str(gid),
+                "user_id": str(user_ids[m % members]),
+                "user_name": f"User {m % members}",
+                "content": "x" * 80,
+                "timestamp": start + timedelta(minutes=m),
+            })
+            if len(batch) == 5000:
+                await db.chat_messages.insert_many(batch)
+                batch = []
+    if batch:
+        await db.chat_messages.insert_many(batch)
+    # What the first startup with counters does
+    await crud_research_group.reconcile_counters(db, missing_only=True)
+    return me
+
+
+async def per_group(db, user_id: str) -> list[dict]:
+    groups = await db.research_groups.find(crud_research_group.member_query(user_id)).to_list(length=100)
+    for group in groups:
+        ids = [ObjectId(m["user_id"]) for m in group.get("members", [])]
+        users = await db.users.find({"_id": {"$in": ids}}, {"full_name": 1, "email": 1, "avatar_url": 1}).to_list(length=None)
+        crud_research_group.merge_member_details(group, {str(u["_id"]): u for u in users})
+        me = next(m for m in group["members"] if m["user_id"] == user_id)
+        group["unread_count"] = await db.chat_messages.count_documents({
+            "group_id": str(group["_id"]),
+            "user_id": {"$ne": user_id},
+            "timestamp": {"$gt": me.get("last_read_at") or me["joined_at"]},
+        })
+    return groups
+
+
+async def aggregated(db, user_id: str) -> list[dict]:
+    return await crud_research_group.list_groups(db, user_id, limit=100, with_members=True, with_unread=True)
+
+
+async def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main(groups: int, members: int, messages: int, repeat: int) -> None:
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[DATABASE]
+    try:
+        print(f"Seeding {groups} groups x {members} members x {messages} messages...")
+        user_id = await seed(db, groups, members, messages)
+
+        expected = {str(g["_id"]): g["unread_count"] for g in await per_group(db, user_id)}
+        assert {str(g["_id"]): g["unread_count"] for g in await aggregated(db, user_id)} == expected
+        assert await crud_research_group.total_unread(db, user_id) == sum(expected.values())
+
+        results = {
+            "per-group": await timed(lambda: per_group(db, user_id), repeat),
+            "aggregation": await timed(lambda: aggregated(db, user_id), repeat),
+        }
+        round_trips = {"per-group": 1 + 2 * groups, "aggregation": 1}
+
+        print(f"\n{'plan':<12} {'round trips':>12} {'median (ms)':>12}")
+        for plan, ms in results.items():
+            print(f"{plan:<12} {round_trips[plan]:>12} {ms:>12.2f}")
+        print(f"\nspeedup: {results['per-group'] / results['aggregation']:.1f}x")
+
+        # Reading the group that lists the caller twice clears both entries
+        duplicated = await db.research_groups.find_one({"name": "Group 0"})
+        await crud_research_group.mark_read(db, duplicated["_id"], user_id)
+        remaining = sum(count for gid, count in expected.items() if gid != str(duplicated["_id"]))
+        assert await crud_research_group.total_unread(db, user_id) == remaining
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.groups, args.members, args.messages, args.repeat))
@@ -0,0 +1,106 @@
+"""
+Requests per second through the middleware stack, BaseHTTPMiddleware vs pure ASGI.
+
+"before" wraps a minimal app in the previous stack (slowapi's SlowAPIMiddleware and
+a BaseHTTPMiddleware audit middleware), "after" in RateLimitMiddleware and the pure
+ASGI AuditMiddleware. Both include AuthContextMiddleware and enqueue audit entries
+(the sink is not started, so nothing touches MongoDB).
+
+Usage (from backend/):
+    python -m benchmarks.bench_middleware [--requests 3000]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from slowapi import Limiter, _rate_limit_exceeded_handler  # noqa: E402
+from slowapi.errors import RateLimitExceeded  # noqa: E402
+from slowapi.middleware import SlowAPIMiddleware  # noqa: E402
+from slowapi.util import get_remote_address  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.core import security  # noqa: E402
+from app.core.auth_context import get_auth_context  # noqa: E402
+from app.middleware.audit import AuditMiddleware  # noqa: E402
+from app.middleware.auth_context import AuthContextMiddleware  # noqa: E402
+from app.middleware.ratelimit import RateLimitMiddleware  # noqa: E402
+from app.services.audit_sink import AuditSink  # noqa: E402
+import app.middleware.audit as audit_module  # noqa: E402
+
+sink = AuditSink(max_queue_size=10**7, batch_size=200, flush_interval=1.0)
+audit_module.audit_sink = sink
+
+
+class LegacyAuditMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if request.method in ["POST", "PUT", "DELETE", "PATCH"]:
+            auth = get_auth_context(request.scope)
+            if auth.valid and auth.subject:
+                sink.enqueue({
+                    "method": request.method,
+                    "url": str(request.url),
+                    "user_email": auth.subject,
+                    "status_code": response.status_code,
+                })
+        return response
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+    app.state.limiter = Limiter(key_func=get_remote_address)
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.post("/items")
+    async def create_item(item: dict):
+        return item
+
+    if legacy:
+        app.add_middleware(LegacyAuditMiddleware)
+        app.add_middleware(SlowAPIMiddleware)
+    else:
+        app.add_middleware(AuditMiddleware)
+        app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(AuthContextMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, method: str, path: str, requests: int, headers: dict) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        kwargs = {"json": {"title": "x"}} if method == "POST" else {}
+        for _ in range(50):
+            await client.request(method, path, headers=headers, **kwargs)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.request(method, path, headers=headers, **kwargs)
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {security.create_access_token('bench@example.com')}"}
+    for method, path in (("GET", "/health"), ("POST", "/items")):
+        before = asyncio.run(measure(build_app(legacy=True), method, path, args.requests, headers))
+        after = asyncio.run(measure(build_app(legacy=False), method, path, args.requests, headers))
+        print(
+            f"{method:>4} {path:<8} before {before:8.0f} req/s | after {after:8.0f} req/s "
+            f"| {((after / before) - 1) * 100:+.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
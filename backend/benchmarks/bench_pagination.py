@@ -0,0 +1,107 @@
+"""
+Latency of page 1 vs page 1,000: skip/limit against keyset cursors.
+
+Seeds a scratch collection shaped like our listings (created_at + _id, with the
+index app.db.indexes declares for them), then times fetching the first and the
+1,000th page both ways. Skip pages get slower with depth because MongoDB walks
+and discards every skipped index entry; keyset pages start with an index seek.
+
+Needs a running MongoDB (MONGODB_URL). Writes to the `bench_pagination`
+database and drops it afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pagination [--docs 50000] [--size 20] [--page 1000] [--repeat 50]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+from pymongo import DESCENDING  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.pagination import Keyset, find_page  # noqa: E402
+
+DATABASE = "bench_pagination"
+KEYSET = Keyset(("created_at", DESCENDING))
+
+
+async def seed(collection, docs: int) -> None:
+    await collection.drop()
+    await collection.create_index(KEYSET.sort)
+    start = datetime(2020, 1, 1)
+    batch = []
+    for i in range(docs):
+        # A few timestamps repeat so the _id tie-breaker matters
+        batch.append({"title": f"item {i}", "body": "x" * 200, "created_at": start + timedelta(seconds=i // 3)})
+        if len(batch) == 5000:
+            await collection.insert_many(batch)
+            batch = []
+    if batch:
+        await collection.insert_many(batch)
+
+
+async def skip_page(collection, page: int, size: int) -> list[dict]:
+    return await collection.find({}).sort(KEYSET.sort).skip((page - 1) * size).limit(size).to_list(length=size)
+
+
+async def keyset_page(collection, cursor, size: int) -> list[dict]:
+    docs, _ = await find_page(collection, {}, KEYSET, cursor=cursor, limit=size)
+    return docs
+
+
+async def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main(docs: int, size: int, page: int, repeat: int) -> None:
+    if docs < page * size:
+        raise SystemExit(f"--docs must be at least {page * size} to reach page {page}")
+
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    collection = client[DATABASE]["items"]
+    try:
+        print(f"Seeding {docs} documents...")
+        await seed(collection, docs)
+
+        # The cursor a client would hold after reading page - 1 pages
+        previous = await skip_page(collection, page - 1, size)
+        deep_cursor = KEYSET.encode(previous[-1])
+        assert [d["_id"] for d in await keyset_page(collection, deep_cursor, size)] == \
+               [d["_id"] for d in await skip_page(collection, page, size)]
+
+        results = {
+            ("skip", 1): await timed(lambda: skip_page(collection, 1, size), repeat),
+            ("skip", page): await timed(lambda: skip_page(collection, page, size), repeat),
+            ("keyset", 1): await timed(lambda: keyset_page(collection, None, size), repeat),
+            ("keyset", page): await timed(lambda: keyset_page(collection, deep_cursor, size), repeat),
+        }
+
+        print(f"\n{'mode':<8} {'page 1 (ms)':>12} {f'page {page} (ms)':>16} {'ratio':>8}")
+        for mode in ("skip", "keyset"):
+            first, deep = results[(mode, 1)], results[(mode, page)]
+            print(f"{mode:<8} {first:>12.2f} {deep:>16.2f} {deep / first:>7.1f}x")
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=50000)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.docs, args.size, args.page, args.repeat))
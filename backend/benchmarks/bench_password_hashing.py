@@ -0,0 +1,92 @@
+"""
+Login throughput and event-loop responsiveness under concurrent Argon2 verifies.
+
+Compares verifying inline on the event loop (the old behaviour) against the
+dedicated hashing pool in app.core.security. While the logins run, a probe
+task stands in for unrelated requests and records how late it gets scheduled.
+
+Usage (from backend/):
+    python -m benchmarks.bench_password_hashing [--logins 64] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+from app.core import security  # noqa: E402
+
+PROBE_INTERVAL = 0.005
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def probe(latencies: list[float], stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        latencies.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+
+async def run(mode: str, hashed: str, logins: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            if mode == "inline":
+                ok = security.verify_password("correct horse", hashed)
+                await asyncio.sleep(0)
+            else:
+                ok = await security.verify_password_async("correct horse", hashed)
+            assert ok
+
+    latencies: list[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(latencies, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+
+    return {
+        "mode": mode,
+        "logins_per_sec": logins / elapsed,
+        "probe_p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "probe_p99_ms": percentile(latencies, 99),
+        "probe_samples": len(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    hashed = security.get_password_hash("correct horse")
+    print(f"Argon2 params: {security.pwd_context.to_dict()}")
+    print(f"Hash workers: {security.settings.PASSWORD_HASH_WORKERS}")
+
+    for mode in ("inline", "pool"):
+        result = asyncio.run(run(mode, hashed, args.logins, args.concurrency))
+        print(
+            f"{result['mode']:>6}: {result['logins_per_sec']:7.1f} logins/s | "
+            f"unrelated request lag p50 {result['probe_p50_ms']:7.2f} ms, "
+            f"p99 {result['probe_p99_ms']:7.2f} ms ({result['probe_samples']} samples)"
+        )
+
+    security.shutdown_password_hasher()
+
+
+if __name__ == "__main__":
+    main()
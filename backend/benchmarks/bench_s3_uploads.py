@@ -0,0 +1,194 @@
+"""
+Community post image uploads against moto's in-process S3.
+
+Times N uploads sent one after another with the blocking S3Service.upload_file
+(what create_post used to do) against S3Service.upload_many, which runs them
+on the upload pool under the per-request cap. moto answers instantly, so
+`--latency` adds a delay to every PUT to stand in for the round trip to Spaces.
+
+Then checks the failure paths, exiting non-zero if one misbehaves:
+  - upload_many with some PUTs rejected returns every result, in order, each
+    with either its URL or its error;
+  - early-response mode (community._attach_uploads) attaches the images that
+    landed, leaves nothing of a failed image in the bucket and notifies the
+    author of the rest.
+
+Needs moto (pip install "moto[s3]") and Pillow, but no MongoDB: the post and
+notification writes of the attach check are recorded instead of sent.
+
+Usage (from backend/):
+    python -m benchmarks.bench_s3_uploads [--files 20] [--size 256] [--latency 50]
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+# moto refuses to start without credentials; these never leave the process
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+import boto3  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from app.api.v1.endpoints import community  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services import image_pipeline, s3  # noqa: E402
+from app.services.s3 import S3Service, UploadRequest  # noqa: E402
+
+try:
+    from moto import mock_aws
+except ImportError:  # required; reported by main()
+    mock_aws = None
+
+BUCKET = "bench-s3-uploads"
+
+
+class SlowClient:
+    """
+    A boto3 client whose uploads take `latency` seconds and fail for the keys
+    `reject` matches. Everything else goes straight to the wrapped client.
+    """
+
+    def __init__(self, client, latency: float, reject=lambda key: False):
+        self._client = client
+        self.latency = latency
+        self.reject = reject
+
+    def upload_fileobj(self, file_obj, bucket, key, **kwargs):
+        time.sleep(self.latency)
+        if self.reject(key):
+            raise ClientError({"Error": {"Code": "SlowDown", "Message": "Rejected by the benchmark"}}, "PutObject")
+        return self._client.upload_fileobj(file_obj, bucket, key, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def image_bytes(size: int, format: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (size, size), (200, 80, 40)).save(buffer, format=format)
+    return buffer.getvalue()
+
+
+def bucket_keys(client) -> list[str]:
+    return [o["Key"] for o in client.list_objects_v2(Bucket=BUCKET).get("Contents", [])]
+
+
+async def timed_uploads(service: S3Service, data: bytes, files: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    for i in range(files):
+        service.upload_file(io.BytesIO(data), f"sequential/{i}.png", "image/png")
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await service.upload_many(
+        [UploadRequest(io.BytesIO(data), f"concurrent/{i}.png", "image/png") for i in range(files)],
+        settings.S3_UPLOAD_PER_REQUEST,
+    )
+    concurrent = time.perf_counter() - start
+    assert all(r.ok for r in results), [r.error for r in results if not r.ok]
+    return sequential, concurrent
+
+
+async def check_partial_failure(service: S3Service, data: bytes, files: int) -> None:
+    uploads = [
+        UploadRequest(io.BytesIO(data), f"partial/{'bad' if i % 3 == 0 else 'good'}/{i}.png", "image/png", f"{i}.png")
+        for i in range(files)
+    ]
+    results = await service.upload_many(uploads, settings.S3_UPLOAD_PER_REQUEST)
+
+    assert [r.object_name for r in results] == [u.object_name for u in uploads], "results are out of order"
+    for r in results:
+        if "/bad/" in r.object_name:
+            assert r.url is None and "SlowDown" in r.error, f"{r.object_name} should have failed: {r}"
+        else:
+            assert r.ok and r.url.endswith(r.object_name), f"{r.object_name} should have uploaded: {r}"
+    print(f"upload_many partial failure: {sum(not r.ok for r in results)} of {len(results)} failed, order kept")
+
+
+async def check_early_attach(client, size: int) -> None:
+    attached = []
+    notified = []
+
+    async def attach_images(db, post_id, urls, variants):
+        attached.append((post_id, urls, variants))
+        return True
+
+    async def create_notification(db, notification):
+        notified.append(notification)
+
+    community.crud_community.attach_images = attach_images
+    community.crud_notification.create_notification = create_notification
+
+    # The PNG's original is rejected after its variants may have landed; the JPEG goes through
+    images = [("ok.jpg", image_bytes(size, "JPEG")), ("rejected.png", image_bytes(size, "PNG"))]
+    await community._attach_uploads(None, "post-1", images, "author-1")
+
+    assert len(attached) == 1, "images were not attached"
+    post_id, urls, variants = attached[0]
+    assert post_id == "post-1" and len(urls) == 1 and urls[0].endswith("/original.jpg"), f"attached {urls}"
+    assert set(variants[0]) == {str(s) for s in image_pipeline.VARIANT_SIZES}, f"variants {variants}"
+
+    keys = bucket_keys(client)
+    stored = urls[0].split(f"/{BUCKET}/", 1)[1].rsplit("/", 1)[0]
+    leftovers = [k for k in keys if k.startswith("community_uploads/") and not k.startswith(stored)]
+    assert not leftovers, f"renditions of the failed image left in the bucket: {leftovers}"
+
+    assert len(notified) == 1 and notified[0].user_id == "author-1", "author was not notified"
+    assert "1 of 2" in notified[0].message, notified[0].message
+    print(f"early-response attach: 1 image attached, failed image cleaned up, author notified: {notified[0].message!r}")
+
+
+async def run(client, args) -> None:
+    data = image_bytes(args.size, "PNG")
+
+    s3.s3_service = S3Service(client=SlowClient(client, args.latency / 1000), bucket_name=BUCKET)
+    sequential, concurrent = await timed_uploads(s3.s3_service, data, args.files)
+    print(
+        f"{args.files} uploads, {args.latency:g} ms per PUT: sequential {sequential * 1000:8.1f} ms | "
+        f"upload_many (per-request cap {settings.S3_UPLOAD_PER_REQUEST}) {concurrent * 1000:8.1f} ms "
+        f"({sequential / concurrent:.1f}x)"
+    )
+
+    s3.s3_service = S3Service(
+        client=SlowClient(client, args.latency / 1000, reject=lambda key: "/bad/" in key), bucket_name=BUCKET
+    )
+    await check_partial_failure(s3.s3_service, data, args.files)
+
+    s3.s3_service = S3Service(
+        client=SlowClient(client, args.latency / 1000, reject=lambda key: key.endswith("/original.png")),
+        bucket_name=BUCKET,
+    )
+    await check_early_attach(client, args.size)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--size", type=int, default=256, help="edge of the square test images, in pixels")
+    parser.add_argument("--latency", type=float, default=50, help="milliseconds added to every PUT")
+    args = parser.parse_args()
+
+    if mock_aws is None:
+        sys.exit('moto is not installed: pip install "moto[s3]"')
+
+    try:
+        with mock_aws():
+            client = boto3.client("s3", region_name="us-east-1")
+            client.create_bucket(Bucket=BUCKET)
+            asyncio.run(run(client, args))
+    except AssertionError as e:
+        sys.exit(f"FAILED: {e}")
+    finally:
+        image_pipeline.shutdown_image_pipeline()
+        s3.shutdown_uploads()
+
+
+if __name__ == "__main__":
+    main()
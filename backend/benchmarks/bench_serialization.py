@@ -0,0 +1,144 @@
+"""
+Serialization cost of a 100-item list response, per strategy.
+
+Each strategy turns the same trusted Mongo documents into JSON bytes:
+
+  models+response_model  handler builds Model(**doc) per item; FastAPI validates
+                         against response_model and dumps JSON (the old path)
+  jsonable_encoder       the same models through jsonable_encoder + json.dumps,
+                         what FastAPI does when the dump_json fast path is off
+  construct+orjson       Model.model_construct (no validation) + model_dump + orjson
+  TypedResponse          one TypeAdapter pass over the page + dump_json
+                         (app.api.responses, the path list endpoints use)
+
+No database needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization [--items 100] [--repeat 2000]
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import time
+import warnings
+from datetime import datetime, timedelta
+from typing import List
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+from bson import ObjectId  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app.api.pagination import page_response  # noqa: E402
+from app.api.responses import TypedResponse  # noqa: E402
+from app.models.publication import Publication, PublicationPagination  # noqa: E402
+from app.models.research_group import ChatMessage  # noqa: E402
+
+try:
+    import orjson
+except ImportError:  # optional; the strategy is skipped without it
+    orjson = None
+
+
+def publication_docs(n: int) -> list[dict]:
+    start = datetime(2024, 1, 1)
+    return [{
+        "_id": ObjectId(),
+        "title": f"Publication {i}",
+        "authors": "A. Author, B. Author, C. Author",
+        "journal": "Journal of Deep Health",
+        "date": start + timedelta(days=i),
+        "doi": f"10.1000/jdh.{i}",
+        "url": f"https://doi.org/10.1000/jdh.{i}",
+        "tags": ["imaging", "ml"],
+        "is_featured": i % 3 == 0,
+    } for i in range(n)]
+
+
+def message_docs(n: int) -> list[dict]:
+    start = datetime(2024, 1, 1)
+    return [{
+        "_id": ObjectId(),
+        "group_id": "65f000000000000000000001",
+        "user_id": "65f000000000000000000002",
+        "user_name": "Researcher",
+        "user_avatar": None,
+        "audio_url": None,
+        "content": "Results from the latest run are in the shared folder. " * 2,
+        "timestamp": start + timedelta(seconds=i),
+    } for i in range(n)]
+
+
+def strategies(model, response_type, build_content, docs):
+    field = create_model_field("Response", response_type, mode="serialization")
+    typed = TypedResponse(response_type)
+
+    async def fastapi_path():
+        return await serialize_response(field=field, response_content=build_content([model(**d) for d in docs]), dump_json=True)
+
+    def jsonable():
+        return json.dumps(jsonable_encoder(build_content([model(**d) for d in docs]))).encode()
+
+    def construct_orjson():
+        items = [model.model_construct(**d).model_dump(by_alias=True) for d in docs]
+        return orjson.dumps(build_content(items), default=str)
+
+    def typed_response():
+        return typed(build_content(docs)).body
+
+    yield "models+response_model", fastapi_path
+    yield "jsonable_encoder", jsonable
+    if orjson is not None:
+        yield "construct+orjson", construct_orjson
+    yield "TypedResponse", typed_response
+
+
+def timed(fns: dict, repeat: int, rounds: int = 5) -> dict[str, float]:
+    """
+    Per-call time of each strategy in microseconds. Strategies run interleaved in
+    rounds and the best round counts, which keeps noise from other processes out.
+    """
+    loop = asyncio.new_event_loop()
+    runners = {
+        label: (lambda fn=fn: loop.run_until_complete(fn())) if inspect.iscoroutinefunction(fn) else fn
+        for label, fn in fns.items()
+    }
+    best = {label: float("inf") for label in fns}
+    for _ in range(rounds):
+        for label, run in runners.items():
+            start = time.perf_counter()
+            for _ in range(repeat // rounds):
+                run()
+            best[label] = min(best[label], (time.perf_counter() - start) * 1e6 / (repeat // rounds))
+    loop.close()
+    return best
+
+
+def main(items: int, repeat: int) -> None:
+    # model_construct skips the ObjectId -> str conversion; pydantic warns on dump
+    warnings.filterwarnings("ignore", message="Pydantic serializer warnings")
+    cases = [
+        ("publications page", Publication, PublicationPagination,
+         lambda items_: page_response(items_, len(items_), 1, len(items_)), publication_docs(items)),
+        ("chat messages", ChatMessage, List[ChatMessage], lambda items_: items_, message_docs(items)),
+    ]
+    for name, model, response_type, build_content, docs in cases:
+        print(f"\n{name} ({items} items)")
+        print(f"{'strategy':<24} {'per call (us)':>14} {'vs old':>8}")
+        results = timed(dict(strategies(model, response_type, build_content, docs)), repeat)
+        baseline = results["models+response_model"]
+        for label, us in results.items():
+            print(f"{label:<24} {us:>14.1f} {baseline / us:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.items, args.repeat)
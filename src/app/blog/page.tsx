@@ -7,17 +7,17 @@ import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import { faCalendarAlt, faClock, faUser, faArrowRight, faSearch, faEnvelope } from '@fortawesome/free-solid-svg-icons';
 import Link from 'next/link';
 import { useState, useEffect } from 'react';
-import { api, BlogPost } from '@/lib/api';
+import { api, BlogPostSummary } from '@/lib/api';
 
 // Static categories for now
 const categories = ["All", "AI Research", "Genomics", "Healthcare", "Ethics", "Technology"];
 
 export default function BlogPage() {
-    const [posts, setPosts] = useState<BlogPost[]>([]);
+    const [posts, setPosts] = useState<BlogPostSummary[]>([]);
     const [loading, setLoading] = useState(true);
     const [activeCategory, setActiveCategory] = useState("All");
     const [searchQuery, setSearchQuery] = useState("");
-    const [featuredPost, setFeaturedPost] = useState<BlogPost | null>(null);
+    const [featuredPost, setFeaturedPost] = useState<BlogPostSummary | null>(null);
 
     const fetchPosts = async () => {
         setLoading(true);
@@ -57,9 +57,10 @@ export default function BlogPage() {
     }, [activeCategory, searchQuery]);
 
     // Helper to estimate read time
-    const getReadTime = (content: string) => {
+    const getReadTime = (post: BlogPostSummary) => {
         const wordsPerMinute = 200;
-        const words = content.trim().split(/\s+/).length;
+        // The listing endpoint sends word_count instead of the full content
+        const words = post.word_count ?? (post.content ?? '').trim().split(/\s+/).length;
         const time = Math.ceil(words / wordsPerMinute);
         return `${time} min read`;
     };
@@ -108,7 +109,7 @@ export default function BlogPage() {
                                         </div>
                                         <div>
                                             <p className="text-sm font-bold text-gray-900 dark:text-white">{featuredPost.author_name || "Unknown Author"}</p>
-                                            <p className="text-xs text-gray-500 dark:text-gray-400">{getReadTime(featuredPost.content)}</p>
+                                            <p className="text-xs text-gray-500 dark:text-gray-400">{getReadTime(featuredPost)}</p>
                                         </div>
                                     </div>
                                     <Link href={`/blog/${featuredPost.slug}`}>
@@ -213,7 +214,7 @@ export default function BlogPage() {
                                         <div className="flex items-center gap-3 text-xs text-gray-500 dark:text-gray-400 mb-3">
                                             <span className="flex items-center gap-1"><FontAwesomeIcon icon={faCalendarAlt} /> {formatDate(post.created_at)}</span>
                                             <span className="w-1 h-1 rounded-full bg-gray-300 dark:bg-gray-600" />
-                                            <span className="flex items-center gap-1"><FontAwesomeIcon icon={faClock} /> {getReadTime(post.content)}</span>
+                                            <span className="flex items-center gap-1"><FontAwesomeIcon icon={faClock} /> {getReadTime(post)}</span>
                                         </div>
                                         <h3 className="text-xl font-bold mb-3 group-hover:text-blue-600 dark:group-hover:text-blue-400 transition-colors line-clamp-2">
                                             {post.title}
@@ -3,50 +3,67 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
 import { useAuth } from '@/context/AuthContext';
 import { useRouter } from 'next/navigation';
-import { api, CommunityPost, Comment } from '@/lib/api';
+import { api, CommunityPost, Comment, CommentThread, ReactionState } from '@/lib/api';
 import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import { faThumbsUp, faThumbsDown, faComment, faPaperPlane, faUserCircle, faGlobeAmericas, faFire, faClock, faUser, faInfoCircle, faHashtag, faBolt, faImage, faTimes } from '@fortawesome/free-solid-svg-icons';
 import { motion, AnimatePresence } from 'framer-motion';
 import ActiveUsersWidget from '@/components/ActiveUsersWidget';
+import { imageVariant } from '@/lib/utils';
+
+// Add a new comment to the server-built threads: replies go last under their parent, comments first
+const insertComment = (threads: CommentThread[], comment: Comment): CommentThread[] => {
+    const node: CommentThread = { ...comment, replies: [] };
+    if (!comment.parent_id) return [node, ...threads];
+    const attach = (nodes: CommentThread[]): CommentThread[] => nodes.map(n =>
+        n.id === comment.parent_id
+            ? { ...n, replies: [...n.replies, node] }
+            : { ...n, replies: attach(n.replies) }
+    );
+    return attach(threads);
+};
 
-// Recursive Comment Tree Builder
-interface CommentNode extends Comment {
-    children: CommentNode[];
-}
-
-const buildCommentTree = (comments: Comment[]): CommentNode[] => {
-    const commentMap = new Map<string, CommentNode>();
-    const roots: CommentNode[] = [];
-
-    // Initialize map (Deduplicates by ID automatically)
-    comments.forEach(c => {
-        // If duplicate IDs exist, last one wins, which is fine.
-        // We clone to ensure we don't mutate original state if reused elsewhere (though typically fresh from API)
-        commentMap.set(c.id, { ...c, children: [] });
-    });
-
-    // Build tree using the UNIQUE values from the map
-    Array.from(commentMap.values()).forEach(node => {
-        if (node.parent_id && commentMap.has(node.parent_id)) {
-            commentMap.get(node.parent_id)!.children.push(node);
-        } else {
-            roots.push(node);
+// Fold a page of a thread's replies into it: under their parent when loaded, else under the thread's top comment
+const appendReplies = (threads: CommentThread[], rootId: string, replies: Comment[], cursor: string | null): CommentThread[] =>
+    threads.map(root => {
+        if (root.id !== rootId) return root;
+        const ids = new Set<string>();
+        const collect = (nodes: CommentThread[]) => nodes.forEach(n => { ids.add(n.id); collect(n.replies); });
+        collect([root]);
+        let thread: CommentThread = { ...root, replies_cursor: cursor };
+        for (const reply of replies) {
+            if (ids.has(reply.id)) continue; // e.g. posted from this page already
+            ids.add(reply.id);
+            thread = insertComment([thread], { ...reply, parent_id: ids.has(reply.parent_id ?? '') ? reply.parent_id : rootId })[0];
         }
+        return thread;
     });
 
-    // Sort: Newest roots first, Oldest replies first
-    roots.sort((a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime());
-
-    // Sort children recursively
-    const sortChildren = (nodes: CommentNode[]) => {
-        nodes.sort((a, b) => new Date(a.created_at).getTime() - new Date(b.created_at).getTime());
-        nodes.forEach(n => sortChildren(n.children));
-    };
-    sortChildren(roots);
-
-    return roots;
+type Reaction = 'like' | 'dislike';
+
+const isLikedBy = (p: CommunityPost, userId: string) => p.liked ?? p.likes?.includes(userId) ?? false;
+const isDislikedBy = (p: CommunityPost, userId: string) => p.disliked ?? p.dislikes?.includes(userId) ?? false;
+
+// Local version of the server's toggle, for optimistic updates
+const toggleReaction = (p: CommunityPost, userId: string, kind: Reaction): CommunityPost => {
+    const liked = isLikedBy(p, userId);
+    const disliked = isDislikedBy(p, userId);
+    return applyReaction(p, {
+        _id: p._id,
+        liked: kind === 'like' && !liked,
+        disliked: kind === 'dislike' && !disliked,
+        likes_count: p.likes_count + (kind === 'like' ? (liked ? -1 : 1) : (liked ? -1 : 0)),
+        dislikes_count: p.dislikes_count + (kind === 'dislike' ? (disliked ? -1 : 1) : (disliked ? -1 : 0)),
+    });
 };
 
+const applyReaction = (p: CommunityPost, state: ReactionState): CommunityPost => ({
+    ...p,
+    liked: state.liked,
+    disliked: state.disliked,
+    likes_count: state.likes_count,
+    dislikes_count: state.dislikes_count,
+});
+
 export default function CommunityPage() {
     const { user: currentUser } = useAuth();
     const router = useRouter();
@@ -63,7 +80,7 @@ export default function CommunityPage() {
     const fileInputRef = useRef<HTMLInputElement>(null);
 
     // Filters
-    const [sortBy, setSortBy] = useState<'latest' | 'popular'>('latest');
+    const [sortBy, setSortBy] = useState<'latest' | 'hot' | 'popular'>('latest');
     const [filterBy, setFilterBy] = useState<'all' | 'mine'>('all');
 
     // Comments & Interaction
@@ -75,10 +92,15 @@ export default function CommunityPage() {
     const [selectedPost, setSelectedPost] = useState<CommunityPost | null>(null);
     const [replyingTo, setReplyingTo] = useState<string | null>(null);
     const [isLoadingDetails, setIsLoadingDetails] = useState(false);
+    const [comments, setComments] = useState<CommentThread[]>([]);
+    const [commentsCursor, setCommentsCursor] = useState<string | null>(null);
+    const [isLoadingComments, setIsLoadingComments] = useState(false);
 
     // Fetch details when modal opens
     useEffect(() => {
         const fetchDetails = async () => {
+            setComments([]);
+            setCommentsCursor(null);
             if (!selectedPostId) {
                 setSelectedPost(null);
                 return;
@@ -90,8 +112,13 @@ export default function CommunityPage() {
 
             setIsLoadingDetails(true);
             try {
-                const fullPost = await api.getCommunityPost(selectedPostId);
+                const [fullPost, commentPage] = await Promise.all([
+                    api.getCommunityPost(selectedPostId),
+                    api.getPostComments(selectedPostId),
+                ]);
                 setSelectedPost(fullPost);
+                setComments(commentPage.items);
+                setCommentsCursor(commentPage.next_cursor ?? null);
             } catch (error) {
                 console.error("Failed to fetch post details", error);
             } finally {
@@ -102,6 +129,30 @@ export default function CommunityPage() {
         fetchDetails();
     }, [selectedPostId]); // don't depend on posts to avoid loops, just ID change
 
+    const loadMoreComments = async () => {
+        if (!selectedPostId || !commentsCursor) return;
+        setIsLoadingComments(true);
+        try {
+            const commentPage = await api.getPostComments(selectedPostId, commentsCursor);
+            setComments(prev => [...prev, ...commentPage.items]);
+            setCommentsCursor(commentPage.next_cursor ?? null);
+        } catch (error) {
+            console.error("Failed to load comments", error);
+        } finally {
+            setIsLoadingComments(false);
+        }
+    };
+
+    const loadMoreReplies = async (rootId: string, cursor: string) => {
+        if (!selectedPostId) return;
+        try {
+            const replyPage = await api.getCommentReplies(selectedPostId, rootId, cursor);
+            setComments(prev => appendReplies(prev, rootId, replyPage.items, replyPage.next_cursor ?? null));
+        } catch (error) {
+            console.error("Failed to load replies", error);
+        }
+    };
+
     // Cleanup object URLs to avoid memory leaks
     useEffect(() => {
         return () => {
@@ -211,6 +262,9 @@ export default function CommunityPage() {
             // Extract raw File objects
             const filesToUpload = selectedFiles.map(f => f.file);
             const newPost = await api.createCommunityPost(newPostContent, filesToUpload);
+            if (newPost.failed_uploads.length > 0) {
+                alert(`Some images could not be added:\n${newPost.failed_uploads.map(f => `${f.filename ?? 'image'}: ${f.error}`).join('\n')}`);
+            }
 
             setPosts([newPost, ...posts]);
             setNewPostContent('');
@@ -222,60 +276,28 @@ export default function CommunityPage() {
         }
     };
 
-    const handleLike = async (postId: string) => {
-        // Optimistic update
-        setPosts(prev => prev.map(p => {
-            if (p._id === postId) {
-                const isLiked = p.likes.includes(currentUser!.id);
-                const newLikes = isLiked
-                    ? p.likes.filter(id => id !== currentUser!.id)
-                    : [...p.likes, currentUser!.id];
-
-                // Also remove from dislikes if present
-                const newDislikes = p.dislikes.filter(id => id !== currentUser!.id);
-
-                return { ...p, likes: newLikes, dislikes: newDislikes };
-            }
-            return p;
-        }));
-
-        try {
-            const updatedPost = await api.likePost(postId);
-            // Sync with server response to be sure
-            setPosts(prev => prev.map(p => p._id === postId ? updatedPost : p));
-        } catch (error) {
-            console.error('Failed to like post', error);
-            // Revert changes could go here
-            fetchPosts(page, true);
-        }
+    const updatePost = (postId: string, update: (p: CommunityPost) => CommunityPost) => {
+        setPosts(prev => prev.map(p => p._id === postId ? update(p) : p));
+        setSelectedPost(prev => prev && prev._id === postId ? update(prev) : prev);
     };
 
-    const handleDislike = async (postId: string) => {
+    const handleReaction = async (postId: string, kind: Reaction) => {
         // Optimistic update
-        setPosts(prev => prev.map(p => {
-            if (p._id === postId) {
-                const isDisliked = p.dislikes.includes(currentUser!.id);
-                const newDislikes = isDisliked
-                    ? p.dislikes.filter(id => id !== currentUser!.id)
-                    : [...p.dislikes, currentUser!.id];
-
-                // Also remove from likes if present
-                const newLikes = p.likes.filter(id => id !== currentUser!.id);
-
-                return { ...p, likes: newLikes, dislikes: newDislikes };
-            }
-            return p;
-        }));
+        updatePost(postId, p => toggleReaction(p, currentUser!.id, kind));
 
         try {
-            const updatedPost = await api.dislikePost(postId);
-            setPosts(prev => prev.map(p => p._id === postId ? updatedPost : p));
+            const state = kind === 'like' ? await api.likePost(postId) : await api.dislikePost(postId);
+            // Sync with server response to be sure
+            updatePost(postId, p => applyReaction(p, state));
         } catch (error) {
-            console.error('Failed to dislike post', error);
+            console.error(`Failed to ${kind} post`, error);
             fetchPosts(page, true);
         }
     };
 
+    const handleLike = (postId: string) => handleReaction(postId, 'like');
+    const handleDislike = (postId: string) => handleReaction(postId, 'dislike');
+
     const handleComment = async (postId: string, e: React.FormEvent, parentId?: string) => {
         e.preventDefault();
         // If parentId is provided, we use a specific key in commentInputs or generic 'reply'
@@ -288,12 +310,13 @@ export default function CommunityPage() {
         if (!content?.trim()) return;
 
         try {
-            const updatedPost = await api.commentPost(postId, content, parentId);
-            setPosts(prev => prev.map(p => p._id === postId ? updatedPost : p));
+            const comment = await api.commentPost(postId, content, parentId);
+            setPosts(prev => prev.map(p => p._id === postId ? { ...p, comments_count: p.comments_count + 1 } : p));
 
-            // Also update selectedPost if it's the one we're editing
+            // Also update selectedPost and its threads if it's the one we're editing
             if (selectedPost && selectedPost._id === postId) {
-                setSelectedPost(updatedPost);
+                setSelectedPost({ ...selectedPost, comments_count: selectedPost.comments_count + 1 });
+                setComments(prev => insertComment(prev, comment));
             }
 
             setCommentInputs(prev => ({ ...prev, [inputKey]: '' }));
@@ -304,7 +327,7 @@ export default function CommunityPage() {
     };
 
     // Recursive Comment Component
-    const CommentNodeItem = ({ node, postId, depth = 0 }: { node: CommentNode, postId: string, depth?: number }) => {
+    const CommentNodeItem = ({ node, postId, depth = 0 }: { node: CommentThread, postId: string, depth?: number }) => {
         const isReplying = replyingTo === node.id;
         const replyInputKey = `${postId}_${node.id}`;
 
@@ -371,13 +394,21 @@ export default function CommunityPage() {
                     )}
 
                     {/* Nested Replies */}
-                    {node.children.length > 0 && (
+                    {node.replies.length > 0 && (
                         <div className="mt-0 border-l-2 border-gray-200 dark:border-gray-800 pl-3">
-                            {node.children.sort((a, b) => new Date(a.created_at).getTime() - new Date(b.created_at).getTime()).map(child => (
+                            {node.replies.map(child => (
                                 <CommentNodeItem key={child.id} node={child} postId={postId} depth={depth + 1} />
                             ))}
                         </div>
                     )}
+                    {node.replies_cursor && (
+                        <button
+                            onClick={() => loadMoreReplies(node.id, node.replies_cursor!)}
+                            className="mt-2 ml-3 text-xs font-semibold text-blue-600 hover:text-blue-700 transition-colors"
+                        >
+                            View more replies
+                        </button>
+                    )}
                 </div>
             </div>
         );
@@ -497,6 +528,16 @@ export default function CommunityPage() {
                             <FontAwesomeIcon icon={faClock} />
                             Latest
                         </button>
+                        <button
+                            onClick={() => { setSortBy('hot'); setFilterBy('all'); }}
+                            className={`px-4 py-1.5 rounded-md text-sm font-medium transition-all flex items-center gap-2 ${sortBy === 'hot' && filterBy === 'all'
+                                ? 'bg-white dark:bg-gray-700 text-gray-900 dark:text-white shadow-sm'
+                                : 'text-gray-500 dark:text-gray-400 hover:text-gray-900 dark:hover:text-gray-200'
+                                }`}
+                        >
+                            <FontAwesomeIcon icon={faBolt} />
+                            Hot
+                        </button>
                         <button
                             onClick={() => { setSortBy('popular'); setFilterBy('all'); }}
                             className={`px-4 py-1.5 rounded-md text-sm font-medium transition-all flex items-center gap-2 ${sortBy === 'popular' && filterBy === 'all'
@@ -526,8 +567,8 @@ export default function CommunityPage() {
                             {posts.map((post, index) => {
                                 // Attach ref to last element for infinite scroll
                                 const isLast = index === posts.length - 1;
-                                const isLiked = post.likes.includes(currentUser!.id);
-                                const isDisliked = post.dislikes.includes(currentUser!.id);
+                                const isLiked = isLikedBy(post, currentUser!.id);
+                                const isDisliked = isDislikedBy(post, currentUser!.id);
 
                                 return (
                                     <motion.div
@@ -569,7 +610,7 @@ export default function CommunityPage() {
                                                     <div className={`mt-3 grid gap-2 ${post.images.length === 1 ? 'grid-cols-1' : 'grid-cols-2'}`}>
                                                         {post.images.slice(0, 4).map((img, idx) => (
                                                             <div key={idx} className={`relative rounded-lg overflow-hidden border border-gray-200 dark:border-gray-700 aspect-video ${idx === 2 && post.images!.length > 3 ? 'opacity-50' : ''}`}>
-                                                                <img src={img} alt="Post image" className="w-full h-full object-cover cursor-pointer hover:scale-105 transition-transform" onClick={() => setSelectedPostId(post._id)} />
+                                                                <img src={imageVariant(img, post.image_variants?.[idx], 1024)} alt="Post image" className="w-full h-full object-cover cursor-pointer hover:scale-105 transition-transform" onClick={() => setSelectedPostId(post._id)} />
                                                                 {idx === 2 && post.images!.length > 4 && (
                                                                     <div className="absolute inset-0 flex items-center justify-center text-white font-bold text-xl pointer-events-none">
                                                                         +{post.images!.length - 4}
@@ -587,15 +628,15 @@ export default function CommunityPage() {
                                             <div className="flex items-center gap-4">
                                                 <div className="flex items-center gap-1">
                                                     <div className="flex -space-x-1">
-                                                        {post.likes.length > 0 && (
+                                                        {post.likes_count > 0 && (
                                                             <div className="bg-blue-500 w-4 h-4 rounded-full flex items-center justify-center ring-2 ring-white dark:ring-gray-900">
                                                                 <FontAwesomeIcon icon={faThumbsUp} className="text-[8px] text-white" />
                                                             </div>
                                                         )}
                                                     </div>
-                                                    {(post.likes.length > 0 || post.dislikes.length > 0) ? (
+                                                    {(post.likes_count > 0 || post.dislikes_count > 0) ? (
                                                         <span className="hover:underline cursor-pointer" onClick={() => setSelectedPostId(post._id)}>
-                                                            {post.likes.length} likes
+                                                            {post.likes_count} likes
                                                         </span>
                                                     ) : (
                                                         <span>Be the first to like</span>
@@ -746,7 +787,7 @@ export default function CommunityPage() {
                                             <div className="bg-blue-500 w-5 h-5 rounded-full flex items-center justify-center ring-2 ring-white dark:ring-gray-900">
                                                 <FontAwesomeIcon icon={faThumbsUp} className="text-[10px] text-white" />
                                             </div>
-                                            <span>{selectedPost.likes.length}</span>
+                                            <span>{selectedPost.likes_count}</span>
                                         </div>
                                         <span>{selectedPost.comments_count} comments</span>
                                     </div>
@@ -755,7 +796,7 @@ export default function CommunityPage() {
                                     <div className="grid grid-cols-3 gap-2 py-2 border-y border-gray-100 dark:border-gray-800/50 mb-4">
                                         <button
                                             onClick={() => handleLike(selectedPost._id)}
-                                            className={`py-2 rounded-lg flex items-center justify-center gap-2 text-sm font-medium transition-colors ${selectedPost.likes.includes(currentUser!.id)
+                                            className={`py-2 rounded-lg flex items-center justify-center gap-2 text-sm font-medium transition-colors ${isLikedBy(selectedPost, currentUser!.id)
                                                 ? 'text-blue-600 bg-blue-50 dark:bg-blue-900/20'
                                                 : 'text-gray-600 dark:text-gray-400 hover:bg-gray-100 dark:hover:bg-gray-800'
                                                 }`}
@@ -765,7 +806,7 @@ export default function CommunityPage() {
                                         </button>
                                         <button
                                             onClick={() => handleDislike(selectedPost._id)}
-                                            className={`py-2 rounded-lg flex items-center justify-center gap-2 text-sm font-medium transition-colors ${selectedPost.dislikes.includes(currentUser!.id)
+                                            className={`py-2 rounded-lg flex items-center justify-center gap-2 text-sm font-medium transition-colors ${isDislikedBy(selectedPost, currentUser!.id)
                                                 ? 'text-red-600 bg-red-50 dark:bg-red-900/20'
                                                 : 'text-gray-600 dark:text-gray-400 hover:bg-gray-100 dark:hover:bg-gray-800'
                                                 }`}
@@ -788,15 +829,24 @@ export default function CommunityPage() {
                                                 <div className="animate-spin rounded-full h-8 w-8 border-t-2 border-b-2 border-blue-500"></div>
                                             </div>
                                         ) : (
-                                            selectedPost.comments && selectedPost.comments.length > 0 ? (
+                                            comments.length > 0 ? (
                                                 <div className="space-y-4">
-                                                    {buildCommentTree(selectedPost.comments).map(rootNode => (
+                                                    {comments.map(rootNode => (
                                                         <CommentNodeItem
                                                             key={rootNode.id}
                                                             node={rootNode}
                                                             postId={selectedPost._id}
                                                         />
                                                     ))}
+                                                    {commentsCursor && (
+                                                        <button
+                                                            onClick={loadMoreComments}
+                                                            disabled={isLoadingComments}
+                                                            className="text-sm font-semibold text-blue-600 hover:text-blue-700 disabled:opacity-50 transition-colors"
+                                                        >
+                                                            {isLoadingComments ? 'Loading...' : 'View more comments'}
+                                                        </button>
+                                                    )}
                                                 </div>
                                             ) : (
                                                 <p className="text-gray-500 text-sm italic">No comments yet. Be the first to start the conversation!</p>
@@ -37,6 +37,7 @@ import { ToastProvider } from '@/components/Toast';
 import ImpersonationOverlay from '@/components/ImpersonationOverlay';
 import { useHeartbeat } from '@/hooks/useHeartbeat';
 import { api, Notification } from '@/lib/api';
+import { imageVariant } from '@/lib/utils';
 
 export default function DashboardLayout({ children }: { children: React.ReactNode }) {
     const { user, isLoading, logout } = useAuth();
@@ -184,7 +185,7 @@ export default function DashboardLayout({ children }: { children: React.ReactNod
                         <Link href="/dashboard/profile" className="flex items-center space-x-3 mb-4 hover:bg-gray-50 dark:hover:bg-gray-800 p-2 rounded-lg transition-colors group">
                             <div className="w-8 h-8 rounded-full bg-gradient-to-tr from-blue-500 to-cyan-500 flex items-center justify-center text-white font-bold text-xs ring-2 ring-transparent group-hover:ring-blue-100 dark:group-hover:ring-blue-900 transition-all overflow-hidden">
                                 {user.profile_image ? (
-                                    <img src={user.profile_image} alt={user.full_name} className="w-full h-full object-cover" />
+                                    <img src={imageVariant(user.profile_image, user.profile_image_variants, 64)} alt={user.full_name} className="w-full h-full object-cover" />
                                 ) : (
                                     user.full_name?.charAt(0) || user.email.charAt(0).toUpperCase()
                                 )}
@@ -12,6 +12,7 @@ import { faSpinner, faArrowLeft, faCog, faCamera } from '@fortawesome/free-solid
 import axios from 'axios';
 import Link from 'next/link';
 import { useAuth } from '@/context/AuthContext';
+import { imageVariant } from '@/lib/utils';
 
 export default function GroupDetailPage() {
     const params = useParams();
@@ -178,7 +179,7 @@ export default function GroupDetailPage() {
                         <div className="relative">
                             <div className="w-12 h-12 rounded-xl bg-gray-100 dark:bg-gray-800 flex items-center justify-center overflow-hidden border border-gray-200 dark:border-gray-700">
                                 {group.image_url ? (
-                                    <img src={group.image_url} alt={group.name} className="w-full h-full object-cover" />
+                                    <img src={imageVariant(group.image_url, group.image_variants, 256)} alt={group.name} className="w-full h-full object-cover" />
                                 ) : (
                                     <span className="text-xl font-bold text-gray-400">{group.name.charAt(0)}</span>
                                 )}
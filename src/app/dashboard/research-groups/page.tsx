@@ -1,7 +1,7 @@
 'use client';
 
 import { useState, useEffect } from 'react';
-import { api, ResearchGroup } from '@/lib/api';
+import { api, ResearchGroupSummary } from '@/lib/api';
 import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import { faPlus, faUsers, faArrowRight, faFlask } from '@fortawesome/free-solid-svg-icons';
 import { motion } from 'framer-motion';
@@ -9,7 +9,7 @@ import Link from 'next/link';
 import CreateGroupModal from '@/components/research-groups/CreateGroupModal';
 
 export default function ResearchGroupsPage() {
-    const [groups, setGroups] = useState<ResearchGroup[]>([]);
+    const [groups, setGroups] = useState<ResearchGroupSummary[]>([]);
     const [loading, setLoading] = useState(true);
     const [isCreateModalOpen, setIsCreateModalOpen] = useState(false);
 
@@ -104,9 +104,16 @@ export default function ResearchGroupsPage() {
                                             <div className="w-12 h-12 rounded-xl bg-gradient-to-br from-blue-500 to-cyan-500 flex items-center justify-center text-white font-bold text-xl">
                                                 {group.name.charAt(0)}
                                             </div>
-                                            <span className="px-3 py-1 bg-blue-50 dark:bg-blue-900/20 text-blue-600 dark:text-blue-400 text-xs font-semibold rounded-full">
-                                                {group.members.length} Members
-                                            </span>
+                                            <div className="flex items-center gap-2">
+                                                {!!group.unread_count && (
+                                                    <span className="px-2 py-1 bg-red-500 text-white text-xs font-semibold rounded-full">
+                                                        {group.unread_count} new
+                                                    </span>
+                                                )}
+                                                <span className="px-3 py-1 bg-blue-50 dark:bg-blue-900/20 text-blue-600 dark:text-blue-400 text-xs font-semibold rounded-full">
+                                                    {group.member_count ?? group.members?.length ?? 0} Members
+                                                </span>
+                                            </div>
                                         </div>
 
                                         <h3 className="text-xl font-bold text-gray-900 dark:text-white mb-2 line-clamp-1">
@@ -118,7 +125,9 @@ export default function ResearchGroupsPage() {
                                         </p>
 
                                         <p className="text-gray-500 dark:text-gray-400 text-sm line-clamp-2 mb-6 h-10">
-                                            {group.description || 'No description provided.'}
+                                            {group.last_message
+                                                ? `${group.last_message.user_name}: ${group.last_message.has_audio && !group.last_message.content ? 'Voice message' : group.last_message.content}`
+                                                : group.description || 'No description provided.'}
                                         </p>
 
                                         <div className="flex items-center text-blue-600 dark:text-blue-400 font-medium text-sm group-hover:translate-x-1 transition-transform">
@@ -9,6 +9,7 @@ import { faSearch, faUserShield, faUserGraduate, faUserTag, faUser, faEdit, faCh
 import { motion } from 'framer-motion';
 import Modal from '@/components/Modal';
 import { useToast } from '@/components/Toast';
+import { imageVariant } from '@/lib/utils';
 
 export default function UsersPage() {
     const { user: currentUser, login, impersonate } = useAuth();
@@ -261,7 +262,7 @@ export default function UsersPage() {
                                         <div className="flex items-center gap-3">
                                             <div className="w-10 h-10 rounded-full bg-gradient-to-tr from-gray-200 to-gray-300 dark:from-gray-700 dark:to-gray-800 flex items-center justify-center text-gray-600 dark:text-gray-300 font-bold overflow-hidden">
                                                 {user.profile_image ? (
-                                                    <img src={user.profile_image} alt={user.full_name} className="w-full h-full object-cover" />
+                                                    <img src={imageVariant(user.profile_image, user.profile_image_variants, 64)} alt={user.full_name} className="w-full h-full object-cover" />
                                                 ) : (
                                                     user.full_name?.charAt(0) || user.email.charAt(0).toUpperCase()
                                                 )}
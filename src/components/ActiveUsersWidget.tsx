@@ -1,7 +1,8 @@
 'use client';
 
 import { useState, useEffect } from 'react';
-import { api } from '@/lib/api';
+import { api, ImageVariants } from '@/lib/api';
+import { imageVariant } from '@/lib/utils';
 import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import { faCircle } from '@fortawesome/free-solid-svg-icons';
 
@@ -12,6 +13,7 @@ interface LiveUser {
     role: string;
     last_active: string;
     profile_image?: string;
+    profile_image_variants?: ImageVariants;
     status: 'online' | 'offline';
 }
 
@@ -54,7 +56,7 @@ export default function ActiveUsersWidget() {
                                 <div className="relative">
                                     <div className="w-8 h-8 rounded-full bg-blue-100 dark:bg-blue-900/30 flex items-center justify-center text-blue-600 dark:text-blue-400 font-bold text-xs uppercase overflow-hidden">
                                         {user.profile_image ? (
-                                            <img src={user.profile_image} alt={user.name} className="w-full h-full object-cover" />
+                                            <img src={imageVariant(user.profile_image, user.profile_image_variants, 64)} alt={user.name} className="w-full h-full object-cover" />
                                         ) : (
                                             user.name.charAt(0)
                                         )}
@@ -126,17 +126,19 @@ export const api = {
         formData.append('content', content);
         files.forEach(file => formData.append('files', file));
 
-        return request<CommunityPost>('/community/', {
+        return request<CommunityPostCreated>('/community/', {
             method: 'POST',
             body: formData
         });
     },
-    likePost: (id: string) => request<CommunityPost>(`/community/${id}/like`, { method: 'POST' }),
-    dislikePost: (id: string) => request<CommunityPost>(`/community/${id}/dislike`, { method: 'POST' }),
-    commentPost: (id: string, content: string, parent_id?: string) => request<CommunityPost>(`/community/${id}/comment`, { method: 'POST', body: JSON.stringify({ content, parent_id }) }),
+    likePost: (id: string) => request<ReactionState>(`/community/${id}/like`, { method: 'POST' }),
+    dislikePost: (id: string) => request<ReactionState>(`/community/${id}/dislike`, { method: 'POST' }),
+    commentPost: (id: string, content: string, parent_id?: string) => request<Comment>(`/community/${id}/comment`, { method: 'POST', body: JSON.stringify({ content, parent_id }) }),
+    getPostComments: (id: string, cursor?: string, size = 20) => request<CommentPage>(`/community/${id}/comments?size=${size}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`),
+    getCommentReplies: (id: string, commentId: string, cursor: string, size = 20) => request<ReplyPage>(`/community/${id}/comments/${commentId}/replies?size=${size}&cursor=${encodeURIComponent(cursor)}`),
     // Research Groups
     researchGroups: {
-        list: () => request<ResearchGroup[]>('/research-groups/'),
+        list: () => request<ResearchGroupSummary[]>('/research-groups/'),
         get: (id: string) => request<ResearchGroup>(`/research-groups/${id}`),
         create: (data: Partial<ResearchGroup>) => request<ResearchGroup>('/research-groups/', { method: 'POST', body: JSON.stringify(data) }),
         update: (id: string, data: Partial<ResearchGroup>) => request<ResearchGroup>(`/research-groups/${id}`, { method: 'PUT', body: JSON.stringify(data) }),
@@ -155,7 +157,7 @@ export const api = {
         if (category) params.append('category', category);
         if (tag) params.append('tag', tag);
         if (search) params.append('search', search);
-        return request<BlogPost[]>(`/blog/?${params.toString()}`);
+        return request<BlogPostSummary[]>(`/blog/?${params.toString()}`);
     },
     getMyBlogPosts: (page = 1, size = 10) => {
         const params = new URLSearchParams({ page: page.toString(), size: size.toString() });
@@ -202,6 +204,9 @@ export const api = {
     deleteTeamMember: (id: string) => request<boolean>(`/team/${id}`, { method: 'DELETE' }),
 };
 
+// Variant URLs of an uploaded image keyed by max dimension ("64", "256", "1024")
+export type ImageVariants = Record<string, string>;
+
 export interface SocialLinks {
     google_scholar?: string;
     linkedin?: string;
@@ -237,11 +242,29 @@ export interface ResearchGroup {
     topic: string;
     description?: string;
     image_url?: string;
+    image_variants?: ImageVariants;
     created_by: string;
     created_at: string;
     members: GroupMember[];
+    last_message?: LastMessage | null;
 }
 
+export interface LastMessage {
+    timestamp: string;
+    id?: string;
+    user_id: string;
+    user_name: string;
+    content: string;
+    has_audio: boolean;
+}
+
+// Listing view: members are only sent when requested via ?fields=
+export type ResearchGroupSummary = Omit<ResearchGroup, 'members'> & {
+    members?: GroupMember[];
+    member_count?: number;
+    unread_count?: number;
+};
+
 export interface Invitation {
     _id: string;
     group_id: string;
@@ -272,26 +295,60 @@ export interface Comment {
     parent_id?: string;
 }
 
+export interface CommentThread extends Comment {
+    replies: CommentThread[]; // oldest first
+    replies_count?: number; // top-level comments: replies in the whole thread
+    replies_cursor?: string | null; // top-level comments: set when more replies than nested
+}
+
+export interface ReplyPage {
+    items: Comment[]; // oldest first, flat; nest by parent_id
+    next_cursor?: string | null;
+}
+
+export interface CommentPage {
+    items: CommentThread[]; // top-level comments, newest first
+    next_cursor?: string | null; // pass back as `cursor` to fetch the next page
+}
+
 export interface CommunityPost {
     _id: string;
     content: string;
     images?: string[];
+    image_variants?: ImageVariants[]; // parallel to images; {} for images uploaded before variants
     author_id: string;
     author_name: string;
     author_email: string;
     created_at: string;
-    likes: string[];
-    dislikes: string[];
-    comments?: Comment[];
+    likes?: string[]; // single post only; feed items carry liked/disliked instead
+    dislikes?: string[];
+    likes_count: number;
+    dislikes_count: number;
+    liked?: boolean; // the caller's reaction
+    disliked?: boolean;
     comments_count: number;
 }
 
+export interface CommunityPostCreated extends CommunityPost {
+    failed_uploads: { filename?: string; error: string }[]; // rejected or failed images; the post has the rest
+    pending_uploads: number; // images still uploading when created with wait_for_uploads=false
+}
+
+export interface ReactionState {
+    _id: string;
+    likes_count: number;
+    dislikes_count: number;
+    liked: boolean; // the caller's state after the toggle
+    disliked: boolean;
+}
+
 export interface CommunityPostPagination {
     items: CommunityPost[];
     total: number;
     page: number;
     size: number;
     pages: number;
+    next_cursor?: string | null; // pass back as `cursor` to fetch the next page
 }
 
 export interface JobPagination {
@@ -300,6 +357,7 @@ export interface JobPagination {
     page: number;
     size: number;
     pages: number;
+    next_cursor?: string | null; // pass back as `cursor` to fetch the next page
 }
 
 export interface PublicationPagination {
@@ -308,6 +366,7 @@ export interface PublicationPagination {
     page: number;
     size: number;
     pages: number;
+    next_cursor?: string | null; // pass back as `cursor` to fetch the next page
 }
 export interface NewsPagination {
     items: News[];
@@ -315,6 +374,7 @@ export interface NewsPagination {
     page: number;
     size: number;
     pages: number;
+    next_cursor?: string | null; // pass back as `cursor` to fetch the next page
 }
 
 export interface News {
@@ -363,6 +423,7 @@ export interface User {
     email: string;
     full_name?: string;
     profile_image?: string;
+    profile_image_variants?: ImageVariants; // WebP renditions of profile_image
     role: 'admin' | 'researcher' | 'member' | 'user';
     is_active: boolean;
     access_weight?: number;
@@ -389,6 +450,11 @@ export interface Notification {
     created_at: string;
     action_label?: string;
     action_url?: string;
+    // Coalesced like/comment notifications: one per post and time window
+    kind?: 'like' | 'comment';
+    post_id?: string;
+    actor_count?: number;
+    actors?: { id: string; name: string }[]; // latest actors, oldest first
 }
 
 export interface AdminNotificationSend {
@@ -421,6 +487,12 @@ export interface BlogPost {
     author_avatar?: string;
 }
 
+// Listing view: content is replaced by its word count unless requested via ?fields=
+export type BlogPostSummary = Omit<BlogPost, 'content'> & {
+    content?: string;
+    word_count?: number;
+};
+
 export interface ResearchArea {
     _id: string;
     title: string;
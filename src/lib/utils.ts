@@ -4,3 +4,8 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
 }
+
+// The `size` rendition of an uploaded image, or the original when it has none
+export function imageVariant(url: string | undefined, variants: Record<string, string> | undefined, size: 64 | 256 | 1024) {
+  return variants?.[String(size)] || url
+}